@@ -2,6 +2,9 @@ import json
 import os
 import re
 from dotenv import load_dotenv
+from belief_state import BeliefState, extract_clues
+from catalog_schema import MOVIE_SUMMARY_FIELDS, display_value, movie_record
+from clue_matcher import get_clue_matchers
 from movie_data_manager import MovieDataManager
 from mcp_client import MCPClient, MCPMovieToolHandler
 from real_mcp_integration import RealMCPMovieSearch
@@ -11,16 +14,36 @@ from llm_client import get_llm_client
 # Load environment variables
 load_dotenv()
 
+DEFAULT_NEXT_QUESTION = "혹시 기억나는 다른 단서가 있으신가요? (출연 배우, 줄거리, 인상 깊었던 장면 등)"
+# 다음 질문으로 좁혀 볼 패싯 (패싯 이름, 질문에 쓰는 이름, 값 표시 형식)
+FOLLOW_UP_FACETS = [
+    ("genre", "장르", "{}"),
+    ("decade", "개봉 연대", "{}년대"),
+    ("director", "감독", "{}"),
+]
+# 이 비율 이상의 후보가 답 하나로 걸러지는 항목을 우선 질문
+FOLLOW_UP_MIN_SPREAD = 0.5
+# '~ 같은 영화' 요청에서 입력 조각을 기준 영화 제목으로 인정하는 최소 제목 유사도
+SIMILAR_TITLE_MIN_SIMILARITY = 0.6
+# 입력에서 제목 후보로 볼 라틴 문자 구간 ('Inception 같은 영화' -> 'Inception')
+LATIN_TITLE_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9 :'&.,-]*")
+
+
 class AgentSupervisor:
     def __init__(self):
         self.movie_manager = MovieDataManager()
         self.conversation_history = [] # 멀티턴 대화를 위한 대화 기록
         self.last_suggested_movies = [] # 마지막으로 제안된 영화 목록 (top 5)
         self.llm_client = get_llm_client()  # 멀티 LLM 폴백 클라이언트
+        self.clue_matchers = get_clue_matchers()  # 한국어 단서 오토마톤 (프로세스당 한 번 구축)
         
         # 실제 MCP 시스템 초기화 (가짜 MCP 대체)
         self.real_mcp = RealMCPMovieSearch(self.movie_manager)
         print(f"🔗 실제 MCP 시스템 초기화 완료: {self.real_mcp.session_id}")
+        # 대화가 좁혀 온 후보 영화 집합 (MCP 세션과 공유, 턴마다 이 안에서만 검색)
+        self.candidates = self.real_mcp.candidates
+        # 대화 전체의 단서로 갱신하는 영화별 확률 (잘못 기억한 단서가 있어도 후보를 잘라내지 않음)
+        self.belief = BeliefState()
         
         # 기존 가짜 MCP (호환성 유지용)
         self.mcp_client = MCPClient()
@@ -173,47 +196,11 @@ class AgentSupervisor:
     
     def _translate_korean_to_english_keywords(self, user_input):
         """한국어 입력을 영어 키워드로 변환"""
-        # 한국어-영어 키워드 매핑 (발표 시연용 확장)
-        keyword_mapping = {
-            "감옥": ["prison", "jail", "shawshank"],
-            "탈출": ["escape", "break", "breakout"],
-            "액션": ["action"],
-            "드라마": ["drama"],
-            "코미디": ["comedy"],
-            "로맨스": ["romance", "romantic"],
-            "스릴러": ["thriller"],
-            "공포": ["horror"],
-            "SF": ["sci-fi", "science fiction"],
-            "우주": ["space", "galaxy"],
-            "전쟁": ["war", "battle"],
-            "범죄": ["crime", "criminal"],
-            "가족": ["family"],
-            "모험": ["adventure"],
-            "마피아": ["mafia", "godfather"],
-            "좀비": ["zombie"],
-            "슈퍼히어로": ["superhero", "batman", "superman"],
-            "크리스토퍼 놀란": ["Christopher Nolan", "Nolan"],
-            "톰 행크스": ["Tom Hanks", "Hanks"],
-            "레오나르도 디카프리오": ["Leonardo DiCaprio", "DiCaprio"],
-            "브래드 피트": ["Brad Pitt"],
-            "모건 프리먼": ["Morgan Freeman"],
-            "알 파치노": ["Al Pacino"],
-            "로버트 드니로": ["Robert De Niro"],
-            "조커": ["joker"],
-            "배트맨": ["batman", "dark knight"],
-            "반지의 제왕": ["lord of the rings", "fellowship"],
-            "해리포터": ["harry potter", "potter"],
-            "타이타닉": ["titanic"],
-            "아바타": ["avatar"]
-        }
-        
-        keywords = []
+        # 한국어 단서 -> 영어 키워드 (dataset/korean_clues.json, 입력을 한 번만 훑어 모든 단서를 찾음)
+        keywords = [keyword for english_list in self.clue_matchers["keywords"].lookup(user_input)
+                    for keyword in english_list]
         user_lower = user_input.lower()
         
-        for korean, english_list in keyword_mapping.items():
-            if korean in user_lower:
-                keywords.extend(english_list)
-        
         # 매핑되지 않은 경우 기본 키워드 추가
         if not keywords:
             if "영화" in user_lower:
@@ -236,28 +223,107 @@ class AgentSupervisor:
         
         return keywords if keywords else [user_input]  # 최소한 원본이라도 반환
 
+    def _local_description_candidates(self, english_keywords, user_input, exclude_titles=(), limit=5):
+        """로컬 TF-IDF 벡터 검색으로 모호한 묘사에 대한 후보 생성 (LLM/웹 호출 없음)"""
+        description = ' '.join(english_keywords + [user_input])
+        results = self.movie_manager.search_by_description(description, top_n=limit + len(exclude_titles))
+        candidates = []
+        for _, movie in results.iterrows():
+            if movie["Series_Title"] in exclude_titles:
+                continue
+            candidate = movie_record(movie, MOVIE_SUMMARY_FIELDS)
+            candidate["Similarity"] = float(movie["Similarity"])
+            candidates.append(candidate)
+        return candidates[:limit]
+
+    def _similar_source_title(self, user_input, english_keywords):
+        """
+        '~ 같은 영화', '비슷한 영화' 요청이면 기준 영화 제목, 아니면 None
+        입력의 영어 구간이나 변환된 키워드 ('타이타닉' -> 'titanic') 가 제목과 맞는 영화
+        """
+        if not self.clue_matchers["similar_indicators"].first(user_input):
+            return None
+        for text in LATIN_TITLE_PATTERN.findall(user_input) + list(english_keywords):
+            titles = self.movie_manager.find_titles(text.strip(), limit=1,
+                                                    min_similarity=SIMILAR_TITLE_MIN_SIMILARITY)
+            if not titles.empty:
+                return titles["Series_Title"].iloc[0]
+        return None
+
+    async def _similar_candidates(self, source_title, exclude_titles=(), limit=5):
+        """MCP similar_movies 도구로 기준 영화의 이웃 (미리 계산된 그래프, 키워드 검색 없음)"""
+        mcp_result = await self.real_mcp.call_tool("similar_movies", {"movie_title": source_title,
+                                                                      "limit": limit + len(exclude_titles)})
+        self.real_mcp.log_mcp_interaction("tool_call", {
+            "tool": "similar_movies",
+            "params": {"movie_title": source_title},
+            "result_success": "result" in mcp_result
+        })
+        try:
+            data = json.loads(mcp_result["result"]["content"][0]["text"])
+        except (json.JSONDecodeError, KeyError, IndexError):
+            return []
+        return [movie for movie in data.get("movies", []) if movie["Series_Title"] not in exclude_titles][:limit]
+
+    def _belief_candidates(self, catalog, limit=5):
+        """지금까지의 단서로 확률이 가장 높은 영화 (반영된 단서가 없으면 빈 목록)"""
+        if not self.belief.turns:
+            return []
+        rows, probabilities = self.belief.top(limit)
+        candidates = []
+        for (_, movie), probability in zip(catalog.df.iloc[rows].iterrows(), probabilities.tolist()):
+            candidate = movie_record(movie, MOVIE_SUMMARY_FIELDS)
+            candidate["Probability"] = probability
+            candidates.append(candidate)
+        return candidates
+
+    @staticmethod
+    def _candidates_note(candidates):
+        """검색 결과의 후보 집합 상태 -> 응답에 붙일 한 줄 (좁히지 않았으면 빈 문자열)"""
+        if not candidates or not candidates.get("narrowed"):
+            return ""
+        if candidates.get("widened"):
+            return (f"🎯 이전 단서와 맞지 않아 후보를 {candidates['widened']}단계 되돌린 뒤 "
+                    f"{candidates['count']}편으로 다시 좁혔습니다.\n")
+        return f"🎯 지금까지의 단서로 좁힌 후보: {candidates['count']}편 ({candidates['turns']}단계)\n"
+
+    def _next_question(self, facets):
+        """
+        검색 결과 패싯 (매칭 영화 전체의 분포) 으로 다음 질문 생성
+        답을 들으면 후보가 절반 이하로 줄어드는 항목 중 앞쪽 (장르 -> 연대 -> 감독) 을 묻고,
+        그런 항목이 없으면 가장 고르게 나뉜 항목을 묻는다
+        """
+        if not facets or facets.get("total", 0) < 2:
+            return DEFAULT_NEXT_QUESTION
+        total = facets["total"]
+        candidates = []
+        for name, label, value_format in FOLLOW_UP_FACETS:
+            counts = facets.get(name) or {}
+            if len(counts) < 2:
+                continue
+            # 가장 흔한 값의 비율이 낮을수록 답을 들었을 때 후보가 많이 줄어듦
+            spread = 1.0 - max(counts.values()) / total
+            candidates.append((spread, label, [value_format.format(value) for value in list(counts)[:3]]))
+        if not candidates:
+            return DEFAULT_NEXT_QUESTION
+        halving = [candidate for candidate in candidates if candidate[0] >= FOLLOW_UP_MIN_SPREAD]
+        _, label, options = halving[0] if halving else max(candidates, key=lambda candidate: candidate[0])
+        return f"후보가 {total}편입니다. {label}은(는) 기억나시나요? (예: {', '.join(options)})"
+
     def _evaluate_mcp_quality(self, user_input, mcp_results):
         """MCP 결과의 품질을 평가하여 Tavily 검색 필요성 판단"""
         if not mcp_results:
             return True  # 결과가 없으면 웹 검색
         
-        # 특정 키워드가 있으면 웹 검색이 필요할 가능성이 높음
-        modern_indicators = [
-            "2020", "2021", "2022", "2023", "2024", "2025",
-            "최근", "넷플릭스", "디즈니", "마블", "DC", "아마존",
-            "좀비", "바이러스", "팬데믹", "코로나", "메타버스",
-            "AI", "인공지능", "NFT", "가상현실", "VR"
-        ]
-        
-        user_lower = user_input.lower()
-        for indicator in modern_indicators:
-            if indicator in user_lower:
-                print(f"🔍 '{indicator}' 키워드 감지 - 웹 검색 필요")
-                return True
+        # 특정 키워드 (최근 연도, 스트리밍, 최신 소재) 가 있으면 웹 검색이 필요할 가능성이 높음
+        indicator = self.clue_matchers["modern_indicators"].first(user_input)
+        if indicator:
+            print(f"🔍 '{indicator}' 키워드 감지 - 웹 검색 필요")
+            return True
         
         # MCP 결과의 연도 확인
         try:
-            latest_year = max([int(movie.get('Released_Year', 0)) for movie in mcp_results])
+            latest_year = max([int(movie.get('Released_Year') or 0) for movie in mcp_results])
             if "2024" in user_input and latest_year < 2020:
                 print(f"🔍 최신 영화 요청이지만 MCP 최신 결과가 {latest_year}년 - 웹 검색 필요")
                 return True
@@ -274,7 +340,8 @@ class AgentSupervisor:
         # MCP 결과를 요약
         mcp_summary = []
         for movie in mcp_results[:3]:  # 처음 3개만
-            mcp_summary.append(f"- {movie['Series_Title']} ({movie['Released_Year']}, 평점: {movie['IMDB_Rating']})")
+            mcp_summary.append(f"- {movie['Series_Title']} ({display_value(movie['Released_Year'])}, "
+                               f"평점: {display_value(movie['IMDB_Rating'])})")
         mcp_text = "\n".join(mcp_summary)
         
         system_prompt = f"""
@@ -314,13 +381,20 @@ MCP 시스템이 다음 영화들을 추천했습니다:
         
         mcp_movies = []
         mcp_response = ""
+        mcp_facets = None
+        candidates_note = ""
         
         # 실제 MCP를 통한 영화 검색 실행
         # 한국어 키워드를 영어로 변환
         english_keywords = self._translate_korean_to_english_keywords(user_input)
+        # 이번 턴 단서 (장르/인물/연대/줄거리, 부정 포함) 로 영화별 확률 갱신
+        catalog = self.movie_manager.catalog
+        self.belief.update(catalog, extract_clues(user_input, self.clue_matchers))
         search_params = {
             "keywords": english_keywords,
-            "max_results": 5
+            "max_results": 5,
+            "include_facets": True,
+            "narrow_candidates": True
         }
         
         # 실제 MCP 도구 호출
@@ -337,6 +411,8 @@ MCP 시스템이 다음 영화들을 추천했습니다:
                 content_text = mcp_result["result"]["content"][0]["text"]
                 mcp_data = json.loads(content_text)
                 
+                mcp_facets = mcp_data.get("facets")
+                candidates_note = self._candidates_note(mcp_data.get("candidates"))
                 if mcp_data.get("success"):
                     mcp_movies = mcp_data["movies"]
                     self.last_suggested_movies = mcp_movies
@@ -345,7 +421,8 @@ MCP 시스템이 다음 영화들을 추천했습니다:
                         mcp_response = "🔧 **실제 MCP 시스템 검색 결과:**\n"
                         mcp_response += f"📊 검색된 영화: {mcp_data['count']}개\n"
                         for i, movie in enumerate(mcp_movies[:3], 1):
-                            mcp_response += f"{i}. {movie['Series_Title']} ({movie['Released_Year']}) ⭐{movie['IMDB_Rating']}\n"
+                            mcp_response += (f"{i}. {movie['Series_Title']} ({display_value(movie['Released_Year'])}) "
+                                             f"⭐{display_value(movie['IMDB_Rating'])}\n")
                     else:
                         mcp_response = "🔧 **실제 MCP 시스템:** 검색 조건에 맞는 영화를 찾지 못했습니다."
                 else:
@@ -358,6 +435,48 @@ MCP 시스템이 다음 영화들을 추천했습니다:
         else:
             mcp_response = "🔧 **실제 MCP 시스템 오류:** 예상치 못한 응답 형식"
         
+        # 2-1. '~ 같은 영화' 요청이면 기준 영화의 이웃을 앞에 둠 (키워드 재검색 대신 이웃 그래프)
+        similar_response = ""
+        source_title = self._similar_source_title(user_input, english_keywords)
+        if source_title:
+            similar_movies = await self._similar_candidates(source_title, exclude_titles=[source_title])
+            if similar_movies:
+                shown = {movie['Series_Title'] for movie in similar_movies}
+                mcp_movies = similar_movies + [movie for movie in mcp_movies if movie['Series_Title'] not in shown]
+                self.last_suggested_movies = mcp_movies
+                similar_response = f"🎞️ **'{source_title}' 와 비슷한 영화:**\n"
+                for i, movie in enumerate(similar_movies[:3], 1):
+                    similar_response += (f"{i}. {movie['Series_Title']} ({display_value(movie['Released_Year'])}) "
+                                         f"유사도 {movie['Similarity']:.2f}\n")
+
+        # 2-2. 지금까지의 단서로 가장 그럴듯한 영화 (MCP 결과가 부족하면 후보로도 보강)
+        belief_response = ""
+        belief_movies = self._belief_candidates(catalog)
+        if belief_movies:
+            belief_response = "🧠 **지금까지의 단서로 가장 그럴듯한 영화:**\n"
+            for i, movie in enumerate(belief_movies, 1):
+                belief_response += (f"{i}. {movie['Series_Title']} ({display_value(movie['Released_Year'])}) "
+                                    f"{movie['Probability']:.0%}\n")
+            if len(mcp_movies) < 3:
+                shown = {movie['Series_Title'] for movie in mcp_movies}
+                mcp_movies = mcp_movies + [movie for movie in belief_movies if movie['Series_Title'] not in shown]
+                self.last_suggested_movies = mcp_movies
+
+        # 2-3. 그래도 부족하면 로컬 벡터 검색으로 후보 보강 (네트워크 왕복 없음)
+        local_response = ""
+        if len(mcp_movies) < 3:
+            local_movies = self._local_description_candidates(
+                english_keywords, user_input,
+                exclude_titles=[movie['Series_Title'] for movie in mcp_movies]
+            )
+            if local_movies:
+                mcp_movies = mcp_movies + local_movies
+                self.last_suggested_movies = mcp_movies
+                local_response = "🧭 **로컬 벡터 검색 후보 (줄거리 유사도):**\n"
+                for i, movie in enumerate(local_movies[:3], 1):
+                    local_response += (f"{i}. {movie['Series_Title']} ({display_value(movie['Released_Year'])}) "
+                                       f"유사도 {movie['Similarity']:.2f}\n")
+
         # 3. MCP 결과 품질 확인 후 Tavily 웹 검색 수행
         tavily_response = ""
         
@@ -391,14 +510,15 @@ MCP 시스템이 다음 영화들을 추천했습니다:
 
 ---
 
-{mcp_response}
-
+{similar_response}
+{candidates_note}{mcp_response}
+{belief_response}{local_response}
 ---
 
 💡 **추가 분석:**
 {gpt_feedback}
 
-🤔 **다음 질문:** 혹시 기억나는 다른 단서가 있으신가요? (출연 배우, 줄거리, 인상 깊었던 장면 등)"""
+🤔 **다음 질문:** {self._next_question(mcp_facets)}"""
 
         # Tavily 결과가 있으면 추가
         if tavily_response:
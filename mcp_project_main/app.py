@@ -2,6 +2,7 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 from agent_supervisor import AgentSupervisor
+from catalog_schema import display_value
 
 # Load environment variables
 load_dotenv()
@@ -69,29 +70,32 @@ with st.sidebar:
     if st.button("🔍 데이터셋 검색"):
         if search_term:
             try:
-                # MovieDataManager 인스턴스 생성
-                from movie_data_manager import MovieDataManager
-                movie_manager = MovieDataManager()
+                # 세션 에이전트의 MovieDataManager 재사용 (프로세스 공용 카탈로그, 파일 재로드 없음)
+                movie_manager = st.session_state.supervisor.movie_manager
                 
                 # 검색 실행
                 if search_type == "제목으로 검색":
-                    results = movie_manager.search_movies(keywords=[search_term])
+                    results = movie_manager.search_movies(keywords=[search_term], facets=True)
                 elif search_type == "감독으로 검색":
-                    results = movie_manager.search_movies(director=search_term)
+                    results = movie_manager.search_movies(director=search_term, facets=True)
                 elif search_type == "배우로 검색":
-                    results = movie_manager.search_movies(actor=search_term)
+                    results = movie_manager.search_movies(actor=search_term, facets=True)
                 elif search_type == "장르로 검색":
-                    results = movie_manager.search_movies(genre=search_term)
+                    results = movie_manager.search_movies(genre=search_term, facets=True)
                 else:  # 키워드로 검색
-                    results = movie_manager.search_movies(keywords=[search_term])
+                    results = movie_manager.search_movies(keywords=[search_term], facets=True)
                 
                 # 결과 표시
                 if not results.empty:
-                    st.success(f"✅ {len(results)}개 영화 발견!")
+                    facets = results.attrs['facets']
+                    st.success(f"✅ {facets['total']}개 영화 발견!")
+                    # 매칭 영화 전체의 장르/연대 분포
+                    st.caption("장르: " + ", ".join(f"{g} {n}" for g, n in list(facets['genre'].items())[:5]))
+                    st.caption("연대: " + ", ".join(f"{d}년대 {n}" for d, n in list(facets['decade'].items())[:5]))
                     
                     for idx, movie in results.head(5).iterrows():
                         st.markdown(f"""
-                        **{movie['Series_Title']}** ({movie['Released_Year']})
+                        **{movie['Series_Title']}** ({display_value(movie['Released_Year'])})
                         - 평점: ⭐{movie['IMDB_Rating']}
                         - 감독: {movie['Director']}
                         - 장르: {movie['Genre']}
@@ -170,7 +174,7 @@ if prompt := st.chat_input("🎬 영화 제목이 기억나지 않아도 괜찮
                             st.markdown(f"**{title[:15]}{'...' if len(title) > 15 else ''}**")
                             rating = movie.get('IMDB_Rating', 'N/A')
                             st.markdown(f"⭐ {rating}")
-                            year = movie.get('Released_Year', 'N/A')
+                            year = display_value(movie.get('Released_Year'))
                             st.markdown(f"📅 {year}")
                             
                     # 상세 정보는 확장 가능한 섹션으로
@@ -178,7 +182,7 @@ if prompt := st.chat_input("🎬 영화 제목이 기억나지 않아도 괜찮
                     
                     for i, movie in enumerate(suggested_movies, 1):
                         title = movie.get('Series_Title', 'Unknown')
-                        year = movie.get('Released_Year', 'N/A')
+                        year = display_value(movie.get('Released_Year'))
                         rating = movie.get('IMDB_Rating', 'N/A')
                         with st.expander(f"🎬 {i}. {title} ({year}) ⭐ {rating}"):
                             col1, col2 = st.columns([1, 2])
@@ -232,7 +236,7 @@ if prompt := st.chat_input("🎬 영화 제목이 기억나지 않아도 괜찮
                                     st.markdown(f"**{title[:15]}{'...' if len(title) > 15 else ''}**")
                                     rating = movie.get('IMDB_Rating', 'N/A')
                                     st.markdown(f"⭐ {rating}")
-                                    year = movie.get('Released_Year', 'N/A')
+                                    year = display_value(movie.get('Released_Year'))
                                     st.markdown(f"📅 {year}")
                     except Exception as e:
                         st.error(f"기본 영화 로드 오류: {e}")
@@ -0,0 +1,238 @@
+"""
+대화 세션의 영화별 확률 (믿음 상태)
+카탈로그 전체 영화에 대한 로그 확률 벡터 하나를 두고, 턴마다 뽑은 단서 (장르, 인물, 연대, 줄거리 단어, 부정)
+를 그 단서에 맞는 영화들의 로그 가능도비로 더한 뒤 다시 정규화한다
+후보 집합 (session_candidates) 처럼 잘라내지 않으므로 잘못 기억한 단서 하나로 정답이 사라지지 않고,
+갱신은 색인 조회 + 벡터 연산 몇 번이라 턴당 비용이 카탈로그 크기에 선형이다
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from clue_matcher import get_clue_matchers
+from search_index import normalize_key, parse_decade
+
+# 단서 종류별 로그 가능도비 (맞는 영화에 더하고, 부정된 단서면 뺌 / 줄거리는 코사인 유사도에 곱함)
+CLUE_WEIGHTS = {'genre': 1.5, 'decade': 2.0, 'person': 3.0, 'plot': 6.0}
+# 사전 확률: log(1 + 투표 수) 에 곱하는 가중치 (유명한 영화일수록 조금 더 그럴듯함)
+PRIOR_WEIGHT = 0.1
+# 부정 표현이 단서에서 이 글자 수 안에 있으면 부정된 단서 ('공포 영화는 아니고', 'not a horror')
+NEGATION_WINDOW = 8
+# 단서와 부정 표현 사이에 있으면 다른 절로 보는 문자
+CLAUSE_BREAK = re.compile(r"[.,!?;\n]")
+# '90년대', '1990s', '90s' (연대 표기) 또는 '1994' (연도) -> 연대
+DECADE_CLUE_PATTERN = re.compile(r"(?<!\d)(\d{2}|\d{4})\s*(?:년대|s\b)|(?<!\d)((?:19|20)\d{2})(?!\d)")
+# 사전에 없는 영어 단어 (casefold 한 입력 기준, 줄거리 단어로 씀)
+LATIN_WORD_PATTERN = re.compile(r"[a-z][a-z0-9'&-]+")
+LATIN_CHAR = re.compile(r"[a-z0-9]")
+DEFAULT_TOP_K = 5
+
+
+def _drop_nested(spans: List[tuple]) -> List[tuple]:
+    """다른 단서 구간 안에 들어가는 구간 제거 ('크리스토퍼 놀란' 안의 '놀란'), 시작 위치 순"""
+    kept = []
+    covered = -1  # 지금까지 남긴 구간의 가장 먼 끝 위치
+    for span in sorted(spans, key=lambda span: (span[0], span[0] - span[1])):
+        if span[1] <= covered:
+            continue
+        kept.append(span)
+        covered = span[1]
+    return kept
+
+
+def _word_bounded(text: str, start: int, end: int) -> bool:
+    """영어 패턴이 단어 중간에서 매칭되지 않았는지 ('war' 는 'award' 안에서 매칭하지 않음)"""
+    return not (start > 0 and LATIN_CHAR.match(text, start - 1)) and not LATIN_CHAR.match(text, end)
+
+
+def _is_negated(text: str, start: int, end: int, negations: List[tuple], starts: List[int]) -> bool:
+    """
+    단서 [start, end) 가 부정되었는지
+    한국어 부정 ('아니', '말고') 은 단서 뒤, 영어 부정 ('not', 'without') 은 단서 앞 NEGATION_WINDOW 글자 안에서 찾고,
+    사이에 절 구분 문자나 다른 단서가 있으면 그쪽의 부정으로 본다
+    """
+    for marker_start, marker_end, direction in negations:
+        gap_start, gap_end = (end, marker_start) if direction == 'after' else (marker_end, start)
+        if not 0 <= gap_end - gap_start <= NEGATION_WINDOW:
+            continue
+        if CLAUSE_BREAK.search(text, gap_start, gap_end):
+            continue
+        if any(gap_start <= other < gap_end for other in starts):
+            continue
+        return True
+    return False
+
+
+def extract_clues(text, matchers=None) -> List[Tuple[str, object, bool]]:
+    """
+    사용자 입력 -> (종류, 값, 부정 여부) 단서 목록 (입력 순서, 중복 없음)
+    종류: 'genre' (영문 장르), 'person' (영문 이름), 'decade' (1990), 'plot' (영어 단어들)
+    한국어 단서는 dataset/korean_clues.json 의 genres / people / keywords 그룹, 부정 표현은 negations 그룹
+    """
+    matchers = matchers or get_clue_matchers()
+    text = str(text).casefold()
+
+    def matches(group):
+        matcher = matchers.get(group)
+        if matcher is None:
+            return []
+        found = []
+        for end, index in matcher.finditer(text):
+            pattern = matcher.patterns[index]
+            start = end - len(pattern.casefold())
+            if not pattern.isascii() or _word_bounded(text, start, end):
+                found.append((start, end, pattern, matcher.values[index]))
+        return found
+
+    spans = []
+    for kind, group in (('genre', 'genres'), ('person', 'people')):
+        spans += [(start, end, kind, value) for start, end, _, value in matches(group)]
+    # 장르/인물로 잡힌 단어는 줄거리 단어로 다시 쓰지 않음 ('액션', '크리스토퍼 놀란')
+    typed = {pattern.casefold() for group in ('genres', 'people') if group in matchers
+             for pattern in matchers[group].patterns}
+    spans += [(start, end, 'plot', ' '.join(value)) for start, end, pattern, value in matches('keywords')
+              if pattern.casefold() not in typed]
+    for match in DECADE_CLUE_PATTERN.finditer(text):
+        decade = parse_decade(match.group(1) or match.group(2))
+        if decade is not None:
+            spans.append((match.start(), match.end(), 'decade', decade))
+    spans = _drop_nested(spans)
+    negations = [(start, end, direction) for start, end, _, direction in matches('negations')]
+    # 부정 판단에서 사이에 끼면 막는 단서 (사전/연대 단서만, 'not a scary horror' 의 'scary' 는 막지 않음)
+    starts = [span[0] for span in spans]
+    # 사전에 없는 영어 단어는 그대로 줄거리 단어 (단서나 부정 표현과 겹치면 제외)
+    taken = [(start, end) for start, end, _, _ in spans] + [(start, end) for start, end, _ in negations]
+    for match in LATIN_WORD_PATTERN.finditer(text):
+        if not any(start < match.end() and match.start() < end for start, end in taken):
+            spans.append((match.start(), match.end(), 'plot', match.group()))
+    spans.sort(key=lambda span: span[0])
+
+    clues = []
+    for start, end, kind, value in spans:
+        clue = (kind, value, _is_negated(text, start, end, negations, starts))
+        if clue not in clues:
+            clues.append(clue)
+    return clues
+
+
+def prior_log_belief(catalog) -> np.ndarray:
+    """사전 로그 확률 (투표 수 기반, 정규화됨, float32)"""
+    votes = catalog.df['No_of_Votes'] if 'No_of_Votes' in catalog.df.columns else None
+    if votes is None:
+        log_belief = np.zeros(len(catalog.df), dtype=np.float32)
+    else:
+        votes = np.nan_to_num(np.asarray(votes, dtype=np.float64)).clip(min=0)
+        log_belief = (PRIOR_WEIGHT * np.log1p(votes)).astype(np.float32)
+    return normalize_log(log_belief)
+
+
+def normalize_log(log_belief: np.ndarray) -> np.ndarray:
+    """합이 1 이 되도록 로그 확률을 제자리에서 정규화 (log-sum-exp)"""
+    if len(log_belief):
+        peak = log_belief.max()
+        log_belief -= peak + np.log(np.exp(log_belief - peak).sum(dtype=np.float64))
+    return log_belief
+
+
+class BeliefState:
+    """
+    세션 하나의 영화별 로그 확률 (카탈로그 행 순서의 float32 배열)
+    행 번호는 카탈로그 버전에 묶이므로 카탈로그 내용 해시가 바뀌면 사전 확률부터 다시 시작한다
+    """
+
+    def __init__(self, clue_weights: Dict[str, float] = None):
+        self.clue_weights = dict(clue_weights or CLUE_WEIGHTS)
+        self.log_belief: Optional[np.ndarray] = None
+        self.content_hash = None
+        self.clues: List[Tuple[str, object, bool]] = []  # 지금까지 반영한 단서 (입력 순서)
+        self.turns = 0  # 단서를 하나 이상 반영한 갱신 수
+
+    def __len__(self):
+        return 0 if self.log_belief is None else len(self.log_belief)
+
+    def reset(self) -> None:
+        """사전 확률로 되돌림 (새 영화를 찾기 시작할 때)"""
+        self.log_belief = None
+        self.clues = []
+        self.turns = 0
+
+    def _bind(self, catalog) -> None:
+        if self.log_belief is None or catalog.content_hash != self.content_hash:
+            self.content_hash = catalog.content_hash
+            self.log_belief = prior_log_belief(catalog)
+            self.clues = []
+            self.turns = 0
+
+    def _rows(self, catalog, kind, value) -> np.ndarray:
+        """범주형 단서에 맞는 행 번호"""
+        if kind == 'genre':
+            return catalog.genre_bitmaps.postings.get(normalize_key(value))
+        if kind == 'decade':
+            return catalog.decade_bitmaps.postings.get(value)
+        return catalog.person_index.match_rows(value)
+
+    def update(self, catalog, clues) -> int:
+        """
+        단서들을 한 번에 반영 (단서마다 맞는 행에 가중치를 더하거나 빼고, 마지막에 한 번만 정규화)
+        줄거리 단서는 긍정/부정별로 한 쿼리로 묶어 전체 영화의 TF-IDF 코사인 유사도에 비례해 더함
+        반환: 반영된 (맞는 영화가 있던) 단서 수
+        """
+        self._bind(catalog)
+        log_belief = self.log_belief
+        applied = 0
+        plot_text = {False: [], True: []}
+        for kind, value, negated in clues:
+            if kind == 'plot':
+                plot_text[negated].append(str(value))
+                continue
+            rows = self._rows(catalog, kind, value)
+            if not len(rows):
+                continue
+            log_belief[rows] += -self.clue_weights[kind] if negated else self.clue_weights[kind]
+            applied += 1
+            self.clues.append((kind, value, negated))
+        for negated, texts in plot_text.items():
+            if not texts:
+                continue
+            scores = catalog.tfidf.scores(' '.join(texts))
+            if not scores.any():
+                continue
+            scores *= -self.clue_weights['plot'] if negated else self.clue_weights['plot']
+            log_belief += scores
+            applied += len(texts)
+            self.clues += [('plot', text, negated) for text in texts]
+        if applied:
+            normalize_log(log_belief)
+            self.turns += 1
+        return applied
+
+    def top(self, k: int = DEFAULT_TOP_K) -> Tuple[np.ndarray, np.ndarray]:
+        """확률 상위 k 개 (행 번호, 확률) - argpartition 으로 k 개만 고른 뒤 그 안에서만 정렬 (동점은 행 순서)"""
+        if self.log_belief is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        log_belief = self.log_belief
+        k = min(k, len(log_belief))
+        if k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-log_belief, k - 1)[:k]
+        top = top[np.lexsort((top, -log_belief[top]))]
+        return top.astype(np.int32), np.exp(log_belief[top])
+
+    def probabilities(self) -> np.ndarray:
+        """전체 영화의 확률 (합 1)"""
+        return np.exp(self.log_belief) if self.log_belief is not None else np.empty(0, dtype=np.float32)
+
+    def summary(self) -> Dict:
+        if self.log_belief is None:
+            return {"turns": 0, "clues": [], "top_probability": None, "effective_candidates": None}
+        probabilities = self.probabilities().astype(np.float64)
+        # exp(엔트로피): 확률이 고르게 퍼진 영화 수로 환산한 불확실성
+        entropy = -float(np.sum(probabilities * self.log_belief))
+        return {
+            "turns": self.turns,
+            "clues": [{"kind": kind, "value": value, "negated": negated} for kind, value, negated in self.clues],
+            "top_probability": float(probabilities.max()),
+            "effective_candidates": round(float(np.exp(entropy)), 1),
+        }
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+성능 측정 스크립트 (테스트와 분리: 시간은 기계마다 달라 테스트에서는 결정적인 값만 검사)
+사용법: python benchmarks.py [이름 ...]   (이름 없이 실행하면 전부)
+  reload      카탈로그 크기별 한 행 수정 후 증분 재로드 (교체까지) + 색인별 병합 시간 vs 전체 색인 구축 시간
+  batch       질의 확장 100개 쿼리: 개별 호출 vs search_movies_many
+  cache       같은 검색 반복: 결과 캐시 미사용 vs 히트
+  cursor      500행 다음 페이지: 커서 vs 크게 검색 후 자르기
+  candidates  흔한 키워드 매칭: 카탈로그 전체 vs 세션 후보 집합 안
+  facets      패싯 유무에 따른 검색 시간
+  substring   부분 문자열 색인 조회 vs 전체 스캔
+  similar     이웃 그래프 조회
+  titles      10만 제목 오타 검색 (트라이그램)
+  bm25        10만 문서 BM25 점수 계산
+  tfidf       5만 문서 TF-IDF 벡터 검색
+  clues       단서 사전 크기 (30 / 5000) 별 2만 자 입력 매칭
+  belief      10만 편 확률 갱신 + 상위 5개
+  ann         카탈로그 묘사 검색: nprobe 별 TF-IDF 대비 recall@10 / 지연 + 30만 합성 벡터 IVF 후보 단계
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+from catalog_registry import DEFAULT_CSV_PATH, INDEX_NAMES, SEARCH_FIELDS, Catalog
+
+RELOAD_SIZES = (1_000, 10_000, 50_000)
+
+
+def best_of(run, repeat=5):
+    """repeat 번 실행 중 가장 빠른 한 번의 시간 (초)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _manager(**kwargs):
+    from movie_data_manager import MovieDataManager
+    return MovieDataManager(**{'use_cache': False, **kwargs})
+
+
+def _tiled_csv(directory, num_rows):
+    """번들 카탈로그를 num_rows 행까지 반복 (제목에 번호를 붙여 행마다 내용이 다르게)"""
+    raw = pd.read_csv(DEFAULT_CSV_PATH, dtype=str)
+    tiled = pd.concat([raw] * -(-num_rows // len(raw)), ignore_index=True).iloc[:num_rows]
+    tiled['Series_Title'] = tiled['Series_Title'] + [f' #{i}' if i >= len(raw) else '' for i in range(num_rows)]
+    path = os.path.join(directory, f'catalog_{num_rows}.csv')
+    tiled.to_csv(path, index=False)
+    return path, tiled
+
+
+def benchmark_reload(sizes=RELOAD_SIZES):
+    print("📊 한 행 수정 후 증분 재로드 (교체까지 ms, 이후 색인별 병합 ms) vs 전체 색인 구축")
+    for num_rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path, raw = _tiled_csv(directory, num_rows)
+            catalog = Catalog(path).build_indexes([name for name in INDEX_NAMES if name != 'neighbor_graph'])
+            raw.loc[num_rows // 2, 'Overview'] = 'A retired hacker returns for one last job.'
+            raw.to_csv(path, index=False)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            updated = catalog.reloaded()
+            stats = updated.load_stats
+            updated.warm_from(catalog)  # 갱신 스레드가 교체 직후 하는 일
+            merges = sorted(stats['index_merge_ms'].items(), key=lambda item: -item[1])
+            print(f"  {num_rows:>7,}행: 재로드 {stats['reload']['reload_ms']}ms (바뀐 레코드 파싱 {stats['load_ms']}ms), "
+                  f"병합 {sum(stats['index_merge_ms'].values()):.0f}ms + 재구축 "
+                  f"{sum(stats['index_build_ms'].values()):.0f}ms, "
+                  f"전체 구축 {sum(catalog.load_stats['index_build_ms'].values()):.0f}ms")
+            print("           " + ", ".join(f"{name} {ms}" for name, ms in merges))
+
+
+def benchmark_batch():
+    from test_batch_search import EXPANSION_QUERIES
+    manager = _manager()
+    individual = best_of(lambda: [manager.search_movies(**query) for query in EXPANSION_QUERIES])
+    batched = best_of(lambda: manager.search_movies_many(EXPANSION_QUERIES))
+    print(f"📊 {len(EXPANSION_QUERIES)}개 쿼리: 개별 {individual * 1000:.1f}ms, 배치 {batched * 1000:.1f}ms "
+          f"({individual / batched:.1f}배)")
+
+
+def benchmark_cache():
+    from movie_data_manager import MovieDataManager
+    query = {'actor': 'Tom Hanks', 'genre': 'Drama'}
+    uncached, cached = _manager(), MovieDataManager()
+    cached.search_movies(**query)
+    miss = best_of(lambda: [uncached.search_movies(**query) for _ in range(200)]) / 200
+    hit = best_of(lambda: [cached.search_movies(**query) for _ in range(200)]) / 200
+    print(f"📊 같은 검색 반복: 캐시 미사용 {miss * 1e6:.0f}us, 캐시 히트 {hit * 1e6:.0f}us")
+
+
+def benchmark_cursor():
+    manager = _manager()
+    query = {'genre': 'Drama'}
+    token = manager.search_movies(top_n=500, **query).attrs['next_cursor']
+    cursor = best_of(lambda: [manager.search_movies(cursor=token) for _ in range(50)]) / 50
+    sliced = best_of(lambda: [manager.search_movies(top_n=1000, **query).iloc[500:1000] for _ in range(50)]) / 50
+    print(f"📊 500행 다음 페이지: 커서 {cursor * 1000:.2f}ms, 크게 검색 후 자르기 {sliced * 1000:.2f}ms")
+
+
+def benchmark_candidates():
+    from session_candidates import CandidateSet
+    manager = _manager()
+    candidates = CandidateSet()
+    candidates.narrow(manager, {'director': 'Nolan'})
+    full = best_of(lambda: manager.match_ids(keywords=['the', 'a']), repeat=50)
+    narrowed = best_of(lambda: manager.match_ids(keywords=['the', 'a'], within=candidates.ids), repeat=50)
+    print(f"📊 흔한 키워드 매칭: 전체 {full * 1000:.2f}ms, 후보 {len(candidates)}편 안 {narrowed * 1000:.2f}ms")
+
+
+def benchmark_facets():
+    manager = _manager()
+    query = {'genre': 'Drama'}
+    plain = best_of(lambda: [manager.search_movies(**query) for _ in range(100)]) / 100
+    faceted = best_of(lambda: [manager.search_movies(facets=True, **query) for _ in range(100)]) / 100
+    whole = best_of(lambda: manager.catalog.facets.counts(np.arange(len(manager))))
+    print(f"📊 드라마 검색 {plain * 1000:.2f}ms, 패싯 포함 {faceted * 1000:.2f}ms, "
+          f"전체 {len(manager)}편 패싯 {whole * 1000:.2f}ms")
+
+
+def benchmark_substring():
+    manager = _manager()
+    index = manager.catalog.substring_index
+    rng = random.Random(11)
+    values = [str(v) for field in SEARCH_FIELDS for v in manager.df[field].dropna()]
+    keywords = []
+    for _ in range(500):
+        value = rng.choice(values)
+        start = rng.randrange(len(value))
+        keywords.append(value[start:start + rng.randint(1, 8)])
+    fields = [manager.df[field].astype(object) for field in SEARCH_FIELDS]
+
+    def scan(keyword):
+        pattern = keyword.casefold()
+        return [values.map(lambda v: not pd.isna(v) and pattern in str(v).casefold()) for values in fields]
+
+    lookup = best_of(lambda: [index.match_keyword(keyword) for keyword in keywords]) / len(keywords)
+    scanned = best_of(lambda: [scan(keyword) for keyword in keywords[:20]], repeat=1) / 20
+    print(f"📊 부분 문자열 조회 평균 {lookup * 1000:.3f}ms (전체 스캔 {scanned * 1000:.1f}ms), {index.summary()}")
+
+
+def benchmark_similar():
+    manager = _manager()
+    graph = manager.catalog.neighbor_graph
+    rows = np.random.default_rng(0).integers(0, graph.num_docs, 2000)
+    elapsed = best_of(lambda: [graph.neighbors_of(int(row), 10) for row in rows]) / len(rows)
+    print(f"📊 이웃 조회 평균 {elapsed * 1e6:.1f}µs (그래프 {manager.catalog.load_stats['neighbor_graph_source']} {manager.catalog.load_stats['index_build_ms']['neighbor_graph']}ms)")
+
+
+def benchmark_titles():
+    from fuzzy_title import TitleTrigramIndex
+    titles = _manager().df['Series_Title'].to_numpy()
+    large = pd.Series([f"{title} {i}" for i in range(100) for title in titles])
+    index = TitleTrigramIndex(large)
+    elapsed = best_of(lambda: index.search('Shawshenk Redemtion', limit=5), repeat=20)
+    print(f"📊 {len(large):,}개 제목 오타 검색: {elapsed * 1000:.2f}ms")
+
+
+def benchmark_bm25():
+    from text_ranking import BM25Index
+    base = _manager().df
+    large = pd.DataFrame({field: np.tile(base[field].to_numpy(), 100) for field in ('Series_Title', 'Overview')})
+    index = BM25Index(large)
+    elapsed = best_of(lambda: index.score(['young', 'man', 'war']), repeat=20)
+    print(f"📊 {len(large):,}개 문서 BM25 점수 계산: {elapsed * 1000:.2f}ms")
+
+
+def benchmark_tfidf():
+    from vector_search import TfidfIndex
+    base = _manager().df
+    large = pd.DataFrame({field: np.tile(base[field].to_numpy(), 50)
+                          for field in ['Overview', 'Genre', 'Director', 'Star1', 'Star2', 'Star3', 'Star4']})
+    index = TfidfIndex(large)
+    elapsed = best_of(lambda: index.search('two men in prison become friends over many years', k=5), repeat=20)
+    print(f"📊 {len(large):,}개 문서 벡터 검색: {elapsed * 1000:.2f}ms")
+
+
+def benchmark_clues():
+    from clue_matcher import ClueMatcher
+    rng = random.Random(11)
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 40)] + list('ab ')
+
+    def random_text(length):
+        return ''.join(rng.choice(syllables) for _ in range(length))
+
+    text = random_text(20000)
+    timings = []
+    for size in (30, 5000):
+        matcher = ClueMatcher({random_text(rng.randint(3, 8)): i for i in range(size)})
+        timings.append(best_of(lambda: matcher.find(text)))
+    print(f"📊 20000자 입력: 단서 30개 {timings[0] * 1000:.1f}ms, 단서 5000개 {timings[1] * 1000:.1f}ms")
+
+
+def benchmark_belief():
+    from belief_state import BeliefState, extract_clues
+    from search_index import BitmapIndex, PersonIndex, release_decades
+    from vector_search import TfidfIndex
+    df = pd.concat([_manager().df] * 100, ignore_index=True)
+    catalog = types.SimpleNamespace(
+        df=df, content_hash='tiled',
+        genre_bitmaps=BitmapIndex(df['Genre_List'].explode(), len(df)),
+        decade_bitmaps=BitmapIndex(release_decades(df['Released_Year']), len(df)),
+        person_index=PersonIndex(df), tfidf=TfidfIndex(df))
+    belief = BeliefState()
+    turns = [extract_clues(text) for text in (
+        "크리스토퍼 놀란 감독 영화인데 공포는 아니고 90년대였던 것 같아",
+        "감옥에서 탈출하는 드라마, 모건 프리먼",
+        "not a comedy, dream heist with DiCaprio")]
+    timings = []
+    for _ in range(10):
+        for clues in turns:
+            start = time.perf_counter()
+            belief.update(catalog, clues)
+            belief.top(5)
+            timings.append(time.perf_counter() - start)
+    print(f"📊 {len(df):,}편 확률 갱신 + 상위 5개: 중앙값 {float(np.median(timings)) * 1000:.2f}ms")
+
+
+def benchmark_ann():
+    from plot_ann import ANN_RECALL_TARGET, IvfIndex, PlotAnnIndex, benchmark, description_queries, synthetic_vectors
+    catalog = Catalog(DEFAULT_CSV_PATH)
+    overviews = catalog.df['Overview'].to_numpy(dtype=object)
+    plot_index = PlotAnnIndex.build(catalog.tfidf, queries=description_queries(overviews))
+    print(f"📊 {len(catalog.df):,}편 묘사 검색 (정확한 TF-IDF 대비, 맞춘 nprobe={plot_index.ivf.nprobe}, "
+          f"목표 {ANN_RECALL_TARGET}):")
+    for row in benchmark(plot_index, description_queries(overviews, seed=1)):
+        print(f"  nprobe={row['nprobe']:>5}  recall@10={row['recall@10']:.3f}  {row['ms']:.2f}ms/쿼리")
+    vectors = synthetic_vectors(300000)
+    index = IvfIndex.build(vectors)
+    queries = vectors[np.random.default_rng(3).choice(len(vectors), 50, replace=False)]
+    approximate = best_of(lambda: [index.search(query, k=10) for query in queries], repeat=3) / len(queries)
+    exact = best_of(lambda: [index.exact_search(query, k=10) for query in queries[:10]], repeat=1) / 10
+    print(f"📊 {len(vectors):,}개 벡터: IVF {approximate * 1000:.2f}ms / 정확 검색 {exact * 1000:.2f}ms "
+          f"(목록 {index.nlist}개)")
+
+
+BENCHMARKS = {
+    'reload': benchmark_reload,
+    'batch': benchmark_batch,
+    'cache': benchmark_cache,
+    'cursor': benchmark_cursor,
+    'candidates': benchmark_candidates,
+    'facets': benchmark_facets,
+    'substring': benchmark_substring,
+    'similar': benchmark_similar,
+    'titles': benchmark_titles,
+    'bm25': benchmark_bm25,
+    'tfidf': benchmark_tfidf,
+    'clues': benchmark_clues,
+    'belief': benchmark_belief,
+    'ann': benchmark_ann,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        sys.exit(f"알 수 없는 벤치마크: {', '.join(unknown)} (가능: {', '.join(BENCHMARKS)})")
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,141 @@
+"""
+카탈로그 행 단위 비교 (재로드 시 바뀐 행만 파싱하고 색인에 반영하기 위해)
+CSV 바이트를 레코드 (따옴표 밖 줄바꿈 단위) 로 나눠 레코드 바이트의 해시로 이전/새 카탈로그 행을 짝짓는다
+(같은 내용의 행이 여러 개면 나온 순서대로). 이전 버전의 해시는 그대로 다시 쓰고,
+새로 파싱/정규화하는 것은 이전 카탈로그에 같은 내용이 없는 레코드뿐이다
+"""
+
+import hashlib
+import io
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from catalog_schema import CATEGORY_COLUMNS, INTEGER_COLUMNS, TEXT_COLUMNS
+
+# 다른 컬럼에서 파생된 컬럼 (비교/파싱에서 제외)
+DERIVED_COLUMNS = ['Genre_List']
+
+_NEWLINE, _CARRIAGE_RETURN, _QUOTE = ord('\n'), ord('\r'), ord('"')
+
+
+class RowDiff:
+    """
+    id_map[이전 행 번호] = 새 행 번호 (삭제되거나 내용이 바뀐 행은 -1)
+    added_ids = 이전 카탈로그에 같은 내용이 없는 새 행 번호 (추가되거나 내용이 바뀐 행, 정렬됨)
+    """
+
+    def __init__(self, id_map: np.ndarray, added_ids: np.ndarray, num_rows: int):
+        self.id_map = id_map
+        self.added_ids = added_ids
+        self.num_rows = num_rows
+
+    @property
+    def removed_ids(self) -> np.ndarray:
+        return np.flatnonzero(self.id_map < 0)
+
+    @property
+    def changed_rows(self) -> int:
+        return len(self.added_ids) + len(self.removed_ids)
+
+    def summary(self) -> Dict:
+        return {
+            "rows": self.num_rows,
+            "added": int(len(self.added_ids)),
+            "removed": int(len(self.removed_ids)),
+            "unchanged": int(self.num_rows - len(self.added_ids)),
+        }
+
+
+class CsvRecords:
+    """
+    CSV 파일 바이트 하나를 레코드로 나눈 것 (헤더 + 데이터 레코드별 [시작, 끝) 위치와 해시)
+    따옴표 안의 줄바꿈은 레코드 경계가 아니고, 빈 줄은 pandas.read_csv 처럼 건너뛴다
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(buffer == _NEWLINE)
+        quotes = np.flatnonzero(buffer == _QUOTE)
+        # 앞에 나온 따옴표 수가 짝수인 줄바꿈만 경계 ("" 이스케이프는 두 개라 짝이 유지됨)
+        boundaries = newlines[np.searchsorted(quotes, newlines) % 2 == 0]
+        starts = np.concatenate([[0], boundaries + 1])
+        ends = np.concatenate([boundaries, [len(data)]])
+        # \r\n 줄 끝의 \r 은 레코드 내용에서 제외
+        ends = ends - ((ends > starts) & (buffer[np.maximum(ends - 1, 0)] == _CARRIAGE_RETURN))
+        present = ends > starts
+        starts, ends = starts[present], ends[present]
+        self.header = data[starts[0]:ends[0]] if len(starts) else b''
+        self.starts, self.ends = starts[1:], ends[1:]
+        self.hashes = pd.util.hash_array(np.array(self.records(), dtype=object))
+
+    @classmethod
+    def read(cls, path) -> 'CsvRecords':
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return len(self.starts)
+
+    def records(self, ids: Optional[np.ndarray] = None) -> list:
+        """레코드 바이트 목록 (ids 가 있으면 그 레코드만)"""
+        starts, ends = (self.starts, self.ends) if ids is None else (self.starts[ids], self.ends[ids])
+        return [self.data[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def parse(self, ids: np.ndarray) -> pd.DataFrame:
+        """
+        레코드 일부만 파싱한 원본 데이터프레임 (행 순서 = ids 순서)
+        정수/범주/텍스트 컬럼은 문자열로 읽어 (전체 파싱의 컬럼 단위 타입 추론과 달리) 몇 행만으로 타입이 바뀌지 않게 함
+        """
+        text = b'\n'.join([self.header] + self.records(ids)) + b'\n'
+        as_strings = {name: str for name in (*INTEGER_COLUMNS, *CATEGORY_COLUMNS, *TEXT_COLUMNS)}
+        return pd.read_csv(io.BytesIO(text), dtype=as_strings)
+
+
+def match_hashes(old_hashes: np.ndarray, new_hashes: np.ndarray) -> RowDiff:
+    """이전/새 행 해시의 대응: (해시, 같은 해시 안에서의 순번) 으로 짝짓기"""
+    old_index, new_index = pd.Index(old_hashes), pd.Index(new_hashes)
+    if old_index.is_unique and new_index.is_unique:
+        # 중복 행이 없으면 (대부분) 해시만으로 짝짓기
+        old_of_new = old_index.get_indexer(new_index)
+    else:
+        old_keys = pd.MultiIndex.from_arrays([old_hashes, pd.Series(old_hashes).groupby(old_hashes).cumcount()])
+        new_keys = pd.MultiIndex.from_arrays([new_hashes, pd.Series(new_hashes).groupby(new_hashes).cumcount()])
+        old_of_new = old_keys.get_indexer(new_keys)
+
+    id_map = np.full(len(old_hashes), -1, dtype=np.int64)
+    matched = old_of_new >= 0
+    id_map[old_of_new[matched]] = np.flatnonzero(matched)
+    return RowDiff(id_map, np.flatnonzero(~matched), len(new_hashes))
+
+
+def apply_diff(old_df: pd.DataFrame, diff: RowDiff, added_df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    이전 행 (행 번호만 이동) + 새로 파싱/정규화한 행 (diff.added_ids 순서) -> 새 CSV 행 순서의 데이터프레임
+    컬럼 타입은 이전 카탈로그를 따르고, 범주형은 남은 값만으로 범주 목록을 다시 만든다 (전체 파싱 결과와 같음)
+    컬럼 구성이 다르거나 새 값을 이전 타입으로 바꿀 수 없으면 None (전체 재구축 필요)
+    """
+    if list(added_df.columns) != list(old_df.columns):
+        return None
+    source = np.empty(diff.num_rows, dtype=np.int64)
+    kept = np.flatnonzero(diff.id_map >= 0)
+    source[diff.id_map[kept]] = kept
+    source[diff.added_ids] = len(old_df) + np.arange(len(diff.added_ids))
+    columns = {}
+    try:
+        for name in old_df.columns:
+            old, new = old_df[name], added_df[name]
+            if isinstance(old.dtype, pd.CategoricalDtype):
+                new = new.astype(pd.CategoricalDtype(new.cat.categories.astype(old.cat.categories.dtype)))
+                combined = union_categoricals([old.array, new.array], sort_categories=True)
+                columns[name] = combined.take(source).remove_unused_categories()
+            else:
+                combined = pd.concat([old, new.astype(old.dtype)], ignore_index=True)
+                columns[name] = combined.take(source).reset_index(drop=True)
+    except (TypeError, ValueError):
+        return None
+    return pd.DataFrame(columns, copy=False)
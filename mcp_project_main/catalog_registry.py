@@ -0,0 +1,365 @@
+"""
+프로세스 공용 영화 카탈로그 레지스트리
+CSV(스냅샷) 로드와 색인 구축은 경로당 한 번만 하고,
+MovieDataManager / MCP 서버 / Streamlit 세션은 같은 읽기 전용 카탈로그를 공유한다
+CSV 변경 확인과 재로드는 백그라운드 갱신 스레드가 하고 새 버전을 원자적으로 교체한다 (요청은 재로드를 기다리지 않음)
+"""
+
+import copy
+import os
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from catalog_diff import CsvRecords, apply_diff, match_hashes
+from catalog_schema import normalize_catalog
+from catalog_snapshot import add_genre_list, load_catalog, read_record_hashes
+from facets import FacetIndex
+from fuzzy_title import TitleTrigramIndex
+from neighbor_graph import NeighborGraph, default_graph_dir
+from plot_ann import ANN_RECALL_TARGET, PlotAnnIndex, default_index_dir, description_queries
+from query_planner import CatalogStatistics, QueryPlanner
+from search_index import BitmapIndex, PersonIndex, RatingOrder, release_decades
+from substring_index import SubstringIndex
+from text_ranking import BM25Index
+from vector_search import TfidfIndex
+
+DEFAULT_CSV_PATH = 'dataset/imdb_top_1000.csv'
+
+# 키워드 검색 대상 필드
+SEARCH_FIELDS = ['Series_Title', 'Overview', 'Genre', 'Director', 'Star1', 'Star2', 'Star3', 'Star4']
+
+# CSV 변경 확인 주기 (초, 음수면 재로드 안 함)
+RELOAD_CHECK_SECONDS = float(os.environ.get('MOVIE_CATALOG_RELOAD_SECONDS', '2'))
+# 갱신 스레드의 최소 확인 간격 (주기를 0 으로 설정해도 바쁜 대기가 되지 않게)
+MIN_CHECK_SECONDS = 0.05
+# 바뀐 행이 이 비율을 넘으면 증분 갱신 대신 전체 재구축
+FULL_REBUILD_FRACTION = 0.5
+
+
+class _LazyIndex:
+    """
+    처음 사용할 때 한 번만 구축하는 카탈로그 색인 속성 (색인마다 잠금, 동시 요청은 대기 후 같은 객체)
+    증분 재로드된 버전은 이전 버전의 색인에 바뀐 행을 합치는 병합 작업이 대기 중이면 구축 대신 병합
+    구축한 색인은 인스턴스 __dict__ 에 저장되어 이후 조회는 일반 속성과 같은 비용
+    """
+
+    def __init__(self, build):
+        self.build = build
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, catalog, owner=None):
+        if catalog is None:
+            return self
+        with catalog._index_locks.setdefault(self.name, threading.Lock()):
+            if self.name not in catalog.__dict__:
+                start = time.perf_counter()
+                merge = catalog._pending_merges.pop(self.name, None)
+                catalog.__dict__[self.name] = merge() if merge else self.build(catalog)
+                timings = catalog.load_stats['index_merge_ms' if merge else 'index_build_ms']
+                timings[self.name] = round((time.perf_counter() - start) * 1000, 2)
+        return catalog.__dict__[self.name]
+
+
+class Catalog:
+    """
+    불변 데이터프레임 + 검색 색인 묶음
+    생성 시에는 데이터만 로드하고, 각 색인은 그 색인을 쓰는 검색이 처음 올 때 구축 (load_stats['index_build_ms'])
+    생성 후에는 읽기만 하므로 여러 스레드/세션이 잠금 없이 공유 가능 (df 를 직접 수정하지 말 것)
+    CSV 가 바뀌면 reloaded() 가 바뀐 레코드만 파싱해 새 버전을 만들고 (색인 병합은 처음 쓸 때),
+    이전 버전은 그대로 남아 진행 중인 검색은 이전 버전으로 끝난다
+    """
+
+    # 키워드 검색용 부분 문자열 색인 (필드 값들의 접미사 배열)
+    substring_index = _LazyIndex(lambda catalog: SubstringIndex(catalog.df, SEARCH_FIELDS))
+    # 장르/관람등급/연대별 비트맵 (범주형 필터는 비트맵 AND 한 번으로 처리)
+    genre_bitmaps = _LazyIndex(lambda catalog: BitmapIndex(catalog.df['Genre_List'].explode(), len(catalog.df)))
+    certificate_bitmaps = _LazyIndex(lambda catalog: BitmapIndex(catalog.df['Certificate'], len(catalog.df)))
+    decade_bitmaps = _LazyIndex(
+        lambda catalog: BitmapIndex(release_decades(catalog.df['Released_Year']), len(catalog.df)))
+    # 감독/주연 배우 -> (영화, 역할) 인물 색인
+    person_index = _LazyIndex(lambda catalog: PersonIndex(catalog.df))
+    # 평점 내림차순 순열 (검색마다 정렬하지 않고 상위 k개만 선택)
+    rating_order = _LazyIndex(lambda catalog: RatingOrder(catalog.df['IMDB_Rating']))
+    # 색인 통계 기반 쿼리 플래너 (선택적이고 싼 조건부터 평가)
+    stats = _LazyIndex(lambda catalog: CatalogStatistics(len(catalog.df), {
+        'genre': catalog.genre_bitmaps,
+        'certificate': catalog.certificate_bitmaps,
+        'decade': catalog.decade_bitmaps,
+    }, catalog.rating_order))
+    planner = _LazyIndex(lambda catalog: QueryPlanner(catalog.stats, catalog.rating_order))
+    # 행별 장르/연대/감독/관람등급/평점 구간 번호 (검색 결과 패싯 개수)
+    facets = _LazyIndex(lambda catalog: FacetIndex(catalog.df))
+    # 제목/줄거리 BM25 (rank_by='relevance')
+    bm25 = _LazyIndex(lambda catalog: BM25Index(catalog.df))
+    # 오타 허용 제목 검색용 트라이그램 색인
+    title_index = _LazyIndex(lambda catalog: TitleTrigramIndex(catalog.df['Series_Title']))
+    # 줄거리/장르/출연진 TF-IDF 행렬 (모호한 묘사에 대한 로컬 벡터 검색)
+    tfidf = _LazyIndex(lambda catalog: TfidfIndex(catalog.df))
+    # 영화별 상위 k 개 비슷한 영화 (첫 similar_movies 에서 저장본을 읽거나 구축, 이후 조회는 O(k))
+    neighbor_graph = _LazyIndex(lambda catalog: catalog._load_neighbor_graph())
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH):
+        self.csv_path = csv_path
+        self.version = 1
+        # 로드 전에 파일 상태를 기록 (로드 중에 바뀌면 다음 확인에서 다시 반영)
+        self.source_signature = source_signature(csv_path)
+        # 바이너리 스냅샷이 최신이면 메모리 매핑으로, 아니면 CSV 파싱 후 스냅샷 재생성 (Genre_List 포함)
+        self.df, self.load_stats = load_catalog(csv_path)
+        # CSV 내용 해시 (검색 결과 캐시 무효화 기준)
+        self.content_hash = self.load_stats['content_hash']
+        # CSV 레코드별 해시 (재로드 시 바뀐 레코드 찾기, 스냅샷에 함께 저장됨 / 없으면 재로드는 전체 재구축)
+        self.record_hashes = read_record_hashes(csv_path, self.content_hash, len(self.df),
+                                                self.load_stats['snapshot_dir'])
+        # 색인은 처음 쓸 때 구축 (콜드 스타트 = 데이터 로드)
+        self._index_locks = {}
+        self._pending_merges = {}
+        self.load_stats['index_build_ms'] = {}
+        self.load_stats['index_merge_ms'] = {}
+        self.load_stats['cold_start_ms'] = self.load_stats['load_ms']
+        # 줄거리 벡터 ANN 색인도 큰 카탈로그의 묘사 검색에서 처음 필요할 때 읽거나 구축 (plot_index 속성)
+        self._plot_index = None
+        self._plot_index_lock = threading.Lock()
+
+    def built_indexes(self) -> List[str]:
+        """지금까지 구축된 색인 이름"""
+        return [name for name in INDEX_NAMES if name in self.__dict__]
+
+    def pending_merges(self) -> List[str]:
+        """증분 재로드 후 아직 병합하지 않은 색인 이름"""
+        return [name for name in INDEX_NAMES if name in self._pending_merges]
+
+    def build_indexes(self, names=None) -> 'Catalog':
+        """색인을 지금 구축/병합 (기본은 전부, 워밍업/벤치마크용, 줄거리 ANN 색인 제외)"""
+        for name in INDEX_NAMES if names is None else names:
+            getattr(self, name)
+        return self
+
+    def _load_neighbor_graph(self) -> NeighborGraph:
+        """저장된 그래프가 같은 내용 해시면 메모리 매핑으로 읽고, 아니면 구축 후 저장 (저장 실패 시 메모리에서만 사용)"""
+        directory = default_graph_dir(self.csv_path)
+        try:
+            graph = NeighborGraph.load(directory, self.content_hash)
+            self.load_stats['neighbor_graph_source'] = 'saved'
+        except ValueError:
+            graph = NeighborGraph(self.df, tie_rank=self.rating_order.rank)
+            self.load_stats['neighbor_graph_source'] = 'built'
+            try:
+                graph.save(directory, self.content_hash)
+            except OSError as e:
+                print(f"⚠️ 이웃 그래프 저장 실패: {e}")
+        return graph
+
+    @property
+    def plot_index(self) -> PlotAnnIndex:
+        """
+        묘사 검색용 줄거리 벡터 IVF 색인 (카탈로그 버전마다 한 번)
+        저장된 색인이 같은 내용 해시면 메모리 매핑으로 읽고, 아니면 구축 후 저장 (저장 실패 시 메모리에서만 사용)
+        구축할 때 줄거리 표본 묘사 쿼리로 정확한 TF-IDF 검색 대비 recall 을 측정해 기본 nprobe 를 맞춤
+        """
+        index = self._plot_index
+        if index is None:
+            with self._plot_index_lock:
+                if self._plot_index is None:
+                    start = time.perf_counter()
+                    directory = default_index_dir(self.csv_path)
+                    try:
+                        self._plot_index = PlotAnnIndex.load(self.tfidf, directory, self.content_hash)
+                        self.load_stats['plot_index_source'] = 'saved'
+                    except ValueError:
+                        queries = description_queries(self.df['Overview'].to_numpy(dtype=object))
+                        self._plot_index = PlotAnnIndex.build(self.tfidf, queries=queries)
+                        self.load_stats['plot_index_source'] = 'built'
+                        try:
+                            self._plot_index.save(directory, self.content_hash)
+                        except OSError as e:
+                            print(f"⚠️ ANN 색인 저장 실패: {e}")
+                    self.load_stats['plot_index_ms'] = round((time.perf_counter() - start) * 1000, 2)
+                    self.load_stats['plot_index_recall'] = self._plot_index.recall
+                    if not self._plot_index.meets_target:
+                        print(f"⚠️ ANN 색인 recall@10 {self._plot_index.recall} < {ANN_RECALL_TARGET}: "
+                              f"묘사 검색은 정확한 TF-IDF 검색을 계속 사용")
+                index = self._plot_index
+        return index
+
+    def warm_from(self, previous: 'Catalog') -> 'Catalog':
+        """
+        이전 버전에서 쓰던 색인을 지금 병합/구축 (갱신 스레드가 교체 직후 호출)
+        이웃 그래프는 전체 재구축이라 오래 걸려 (5만 편 1분 이상) 처음 similar_movies 에서 구축
+        """
+        return self.build_indexes([name for name in previous.built_indexes() + previous.pending_merges()
+                                   if name != 'neighbor_graph'])
+
+    def reloaded(self) -> 'Catalog':
+        """
+        CSV 가 바뀌었으면 (크기/수정 시각 -> 내용 해시 순으로 확인) 새 버전, 그대로면 self
+        새 버전은 바뀐 레코드만 파싱/정규화하고 색인은 처음 쓸 때 병합하며,
+        바뀐 행이 많거나 컬럼 구성이 달라졌거나 레코드 해시가 없으면 전체를 다시 로드
+        """
+        signature = source_signature(self.csv_path)
+        if signature == self.source_signature:
+            return self
+        records = CsvRecords.read(self.csv_path)
+        if records.sha256 == self.content_hash:
+            self.source_signature = signature  # 내용은 같고 수정 시각만 바뀜 (touch)
+            return self
+        start = time.perf_counter()
+        diff = None
+        if self.record_hashes is not None:
+            # 이전 버전의 해시는 그대로 쓰고, 새 파일은 레코드 바이트만 해시 (파싱 없음)
+            diff = match_hashes(np.asarray(self.record_hashes), records.hashes)
+        catalog = None
+        if diff is not None and diff.changed_rows <= FULL_REBUILD_FRACTION * max(diff.num_rows, 1):
+            catalog = self._updated(records, diff)
+        if catalog is None:
+            catalog = Catalog(self.csv_path)
+            catalog.load_stats['reload'] = {'mode': 'full', **(diff.summary() if diff else {})}
+        else:
+            catalog.source_signature = signature
+            catalog.load_stats['reload'] = {'mode': 'incremental', **diff.summary()}
+        catalog.version = self.version + 1
+        catalog.load_stats['reload']['reload_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return catalog
+
+    def _updated(self, records: CsvRecords, diff) -> 'Catalog':
+        """
+        바뀐/추가된 레코드 (diff.added_ids) 만 파싱/정규화하고 나머지 행은 이전 데이터프레임에서 옮긴 새 버전
+        (컬럼 구성이 다르거나 새 값이 이전 타입과 맞지 않으면 None)
+        이전 버전에서 구축된 (또는 병합 대기 중인) 색인은 병합 작업만 걸어 두고, 처음 쓸 때
+        이전 색인 + 바뀐 행으로 만든 작은 색인을 합친다 (load_stats['index_merge_ms'])
+        평점 순열/통계/플래너/패싯/이웃 그래프와 한 번도 쓰지 않은 색인은 새 데이터로 처음 쓸 때 구축
+        """
+        start = time.perf_counter()
+        parsed = add_genre_list(normalize_catalog(records.parse(diff.added_ids)))
+        if len(parsed) != len(diff.added_ids):
+            return None
+        df = apply_diff(self.df, diff, parsed)
+        if df is None:
+            return None
+        # 병합에 쓰는 바뀐 행은 새 데이터프레임에서 (타입이 이전 버전과 같음)
+        added = df.iloc[diff.added_ids].reset_index(drop=True)
+        merges = {
+            'substring_index': lambda: self.substring_index.updated(diff, added),
+            'genre_bitmaps': lambda: self.genre_bitmaps.updated(diff, added['Genre_List'].explode()),
+            'certificate_bitmaps': lambda: self.certificate_bitmaps.updated(diff, added['Certificate']),
+            'decade_bitmaps': lambda: self.decade_bitmaps.updated(diff, release_decades(added['Released_Year'])),
+            'person_index': lambda: self.person_index.updated(diff, added),
+            'bm25': lambda: self.bm25.updated(diff, added),
+            'title_index': lambda: self.title_index.updated(diff, added['Series_Title']),
+            'tfidf': lambda: self.tfidf.updated(diff, added),
+        }
+
+        catalog = copy.copy(self)
+        for name in INDEX_NAMES:
+            catalog.__dict__.pop(name, None)
+        catalog.df = df
+        catalog.content_hash = records.sha256
+        catalog.record_hashes = records.hashes
+        catalog.load_stats = {
+            'csv_path': self.csv_path, 'snapshot_dir': self.load_stats['snapshot_dir'], 'source': 'delta',
+            'content_hash': records.sha256, 'rows': len(df),
+            'load_ms': round((time.perf_counter() - start) * 1000, 2),
+            'index_build_ms': {}, 'index_merge_ms': {},
+        }
+        catalog._index_locks = {}
+        catalog._pending_merges = {name: merge for name, merge in merges.items()
+                                   if name in self.__dict__ or name in self._pending_merges}
+        catalog._plot_index = None  # ANN 색인은 새 내용 해시로 다시 읽거나 구축
+        catalog._plot_index_lock = threading.Lock()
+        return catalog
+
+
+def source_signature(csv_path):
+    """(파일 크기, 수정 시각) - 바뀌었을 때만 내용 해시를 계산"""
+    stat = os.stat(csv_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+# 지연 구축 색인 이름 (선언 순서)
+INDEX_NAMES = [name for name, value in vars(Catalog).items() if isinstance(value, _LazyIndex)]
+
+_catalogs: Dict[str, Catalog] = {}
+_lock = threading.Lock()
+# 재로드는 한 번에 하나 (갱신 스레드와 refresh_catalogs 직접 호출 사이)
+_refresh_lock = threading.Lock()
+_refresher = None
+
+
+def get_catalog(csv_path=DEFAULT_CSV_PATH) -> Catalog:
+    """
+    경로별 공용 카탈로그 (처음 요청한 쪽만 로드, 동시 요청은 대기 후 같은 객체를 받음)
+    CSV 변경은 백그라운드 갱신 스레드가 RELOAD_CHECK_SECONDS 마다 확인해 교체하므로 재로드를 기다리지 않음
+    """
+    key = os.path.realpath(csv_path)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        with _lock:
+            catalog = _catalogs.get(key)
+            if catalog is None:
+                catalog = _catalogs[key] = Catalog(csv_path)
+            if RELOAD_CHECK_SECONDS >= 0:
+                _start_refresher()
+    return catalog
+
+
+def _start_refresher() -> None:
+    global _refresher
+    if _refresher is None:
+        _refresher = threading.Thread(target=_refresh_loop, name='catalog-refresher', daemon=True)
+        _refresher.start()
+
+
+def _refresh_loop() -> None:
+    while True:
+        time.sleep(max(RELOAD_CHECK_SECONDS, MIN_CHECK_SECONDS))
+        if RELOAD_CHECK_SECONDS < 0:
+            continue
+        try:
+            refresh_catalogs()
+        except Exception as e:  # 갱신 스레드는 계속 동작 (다음 주기에 다시 시도)
+            print(f"⚠️ 카탈로그 갱신 실패: {e}")
+
+
+def refresh_catalogs() -> None:
+    """
+    등록된 카탈로그마다 CSV 변경을 확인해 새 버전으로 교체 (갱신 스레드가 주기적으로 호출, 테스트는 직접 호출)
+    교체 후 이전 버전에서 쓰던 색인을 새 버전에서 미리 병합/구축해 두므로 교체 직후의 요청도 대부분 기다리지 않음
+    """
+    with _refresh_lock:
+        for key, catalog in loaded_catalogs().items():
+            _refresh(key, catalog)
+
+
+def _refresh(key: str, catalog: Catalog) -> None:
+    try:
+        updated = catalog.reloaded()
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        # 저장 중인 파일 등 읽을 수 없는 상태면 이전 버전으로 계속 동작 (같은 오류는 한 번만 출력)
+        if getattr(catalog, 'reload_error', None) != str(e):
+            print(f"⚠️ 카탈로그 재로드 실패, 이전 버전 사용: {e}")
+        catalog.reload_error = str(e)
+        return
+    if updated is catalog:
+        return
+    with _lock:
+        if _catalogs.get(key) is not catalog:
+            return  # 그사이 레지스트리에서 빠짐 (clear_catalogs)
+        _catalogs[key] = updated
+    stats = updated.load_stats['reload']
+    print(f"🔄 카탈로그 재로드 v{updated.version} ({stats['mode']}, {stats['reload_ms']}ms): {stats}")
+    updated.warm_from(catalog)
+
+
+def loaded_catalogs() -> Dict[str, Catalog]:
+    return dict(_catalogs)
+
+
+def clear_catalogs() -> None:
+    """레지스트리 비우기 (테스트용, 기존 핸들은 이전 카탈로그를 계속 참조)"""
+    with _lock:
+        _catalogs.clear()
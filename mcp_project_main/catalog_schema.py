@@ -0,0 +1,112 @@
+"""
+카탈로그 컬럼 타입 정규화
+CSV 에 문자열로 들어 있는 숫자 ("142 min", "28,341,469", 잘못된 연도) 를 로드 시 한 번만
+결측 마스크가 있는 정수 배열 (Int16/Int32/Int64) 로, 반복이 많은 문자열은 범주형 (사전 인코딩) 으로 변환
+"""
+
+import math
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+# 컬럼 -> nullable 정수 타입 (값 + 결측 마스크)
+INTEGER_COLUMNS = {
+    'Released_Year': 'Int16',
+    'Runtime': 'Int16',      # 분 단위
+    'Meta_score': 'Int16',
+    'No_of_Votes': 'Int32',
+    'Gross': 'Int64',        # 달러
+}
+
+# 사전 인코딩할 문자열 컬럼 (고유값이 행 수보다 훨씬 적음)
+CATEGORY_COLUMNS = ['Certificate', 'Genre', 'Director', 'Star1', 'Star2', 'Star3', 'Star4']
+
+# 자유 텍스트 컬럼 (덤프에서 가져온 카탈로그처럼 전부 비어 있어도 문자열 타입 유지)
+TEXT_COLUMNS = ['Poster_Link', 'Series_Title', 'Overview']
+
+# 검색 결과 요약 (에이전트/MCP 응답) 에 포함하는 필드
+MOVIE_SUMMARY_FIELDS = ['Series_Title', 'Released_Year', 'IMDB_Rating', 'Genre', 'Director', 'Star1', 'Star2', 'Overview']
+
+FIRST_INTEGER = r'(\d+)'
+
+
+def as_text(values: pd.Series) -> pd.Series:
+    """
+    문자열 컬럼 (결측은 결측 그대로)
+    pandas 2 의 astype('str') 은 NaN/None 을 'nan'/'None' 문자열로 바꾸므로 결측 위치를 다시 가림
+    """
+    return values.astype('str').where(values.notna())
+
+
+def parse_integers(values: pd.Series, dtype: str) -> pd.Series:
+    """문자열/실수 컬럼 -> nullable 정수 컬럼 (쉼표/단위 제거, 파싱 불가 값은 결측)"""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        numbers = values.astype('Float64').round()
+    else:
+        digits = as_text(values).str.replace(',', '', regex=False).str.extract(FIRST_INTEGER, expand=False)
+        numbers = pd.to_numeric(digits, errors='coerce')
+    return numbers.astype(dtype)
+
+
+def normalize_catalog(df: pd.DataFrame) -> pd.DataFrame:
+    """정규화된 새 데이터프레임 반환 (원본 컬럼 이름 유지, 없는 컬럼은 건너뜀)"""
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if name in INTEGER_COLUMNS:
+            column = parse_integers(column, INTEGER_COLUMNS[name])
+        elif name in CATEGORY_COLUMNS:
+            column = as_text(column).astype('category')
+        elif name in TEXT_COLUMNS:
+            column = as_text(column)
+            if name == 'Overview':
+                column = column.fillna('')
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """문자열 객체까지 포함한 실제 메모리 사용량"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def json_value(value):
+    """numpy 스칼라/결측값을 JSON 직렬화 가능한 파이썬 값으로 (결측은 None)"""
+    if isinstance(value, (list, tuple)):
+        return [json_value(v) for v in value]
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def movie_record(movie, fields: Iterable[str] = None) -> Dict:
+    """데이터프레임 행 -> JSON 직렬화 가능한 dict"""
+    fields = movie.index if fields is None else fields
+    return {field: json_value(movie[field]) for field in fields}
+
+
+def movie_records(df: pd.DataFrame) -> list:
+    """데이터프레임 -> JSON 직렬화 가능한 dict 리스트"""
+    return [movie_record(movie) for _, movie in df.iterrows()]
+
+
+def display_value(value, default='N/A'):
+    """화면 출력용 값 (결측은 default)"""
+    value = json_value(value)
+    return default if value is None else value
+
+
+def format_runtime(minutes, default='N/A') -> str:
+    value = json_value(minutes)
+    return default if value is None else f"{value} min"
+
+
+def format_count(value, default='N/A') -> str:
+    """정수 천 단위 구분 (표 수, 수익)"""
+    value = json_value(value)
+    return default if value is None else f"{value:,}"
@@ -0,0 +1,253 @@
+"""
+영화 카탈로그 바이너리 스냅샷
+CSV 를 한 번 파싱/정규화해 컬럼별 .npy (숫자, 정수+결측 마스크, 범주 코드) / UTF-8 문자열 테이블로 저장하고,
+이후 로드는 CSV 해시가 같을 때 메모리 매핑으로 읽는다 (CSV 가 바뀌면 자동 재생성)
+CSV 레코드별 해시도 함께 저장해, 재로드 시 바뀐 레코드만 찾아 파싱하는 데 쓴다 (catalog_diff.CsvRecords)
+
+빌드: python catalog_snapshot.py [csv 경로]
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from catalog_diff import CsvRecords
+from catalog_schema import memory_bytes, normalize_catalog
+
+SNAPSHOT_VERSION = 3
+MANIFEST_NAME = 'manifest.json'
+# 문자열 테이블의 값 구분자 (ASCII Unit Separator)
+FIELD_SEPARATOR = '\x1f'
+
+
+def default_snapshot_dir(csv_path) -> str:
+    """dataset/imdb_top_1000.csv -> dataset/.snapshot/imdb_top_1000"""
+    directory, filename = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, '.snapshot', os.path.splitext(filename)[0])
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def add_genre_list(df: pd.DataFrame) -> pd.DataFrame:
+    """'Genre' 컬럼을 쉼표로 분리하여 리스트로 저장"""
+    genres = pd.Series(df['Genre'].to_numpy(dtype=object), index=df.index)
+    df['Genre_List'] = genres.apply(lambda x: [g.strip() for g in x.split(',')])
+    return df
+
+
+def _write_string_table(directory, groups) -> None:
+    """문자열 그룹들 (문자열 컬럼 값, 범주형 사전) -> 구분자(US, 0x1f)로 이은 하나의 UTF-8 바이트 blob"""
+    strings = [value for group in groups for value in group]
+    text = FIELD_SEPARATOR.join(strings)
+    if text.count(FIELD_SEPARATOR) != max(len(strings) - 1, 0):
+        raise ValueError("문자열 값에 스냅샷 구분자가 포함되어 있습니다")
+    np.save(os.path.join(directory, 'strings.blob.npy'), np.frombuffer(text.encode('utf-8'), dtype=np.uint8))
+
+
+def _read_string_table(directory, counts) -> list:
+    """blob 을 한 번만 디코딩/분할하고 그룹별 object 배열로 잘라냄 (행 단위 파이썬 루프 없음)"""
+    if not sum(counts):
+        return [np.empty(0, dtype=object) for _ in counts]
+    blob = np.load(os.path.join(directory, 'strings.blob.npy'), mmap_mode='r')
+    values = np.array(blob.tobytes().decode('utf-8').split(FIELD_SEPARATOR), dtype=object)
+    return np.split(values, np.cumsum(counts)[:-1])
+
+
+def build_snapshot(csv_path, snapshot_dir: Optional[str] = None) -> Dict:
+    """
+    CSV 를 파싱/정규화해 스냅샷 생성 (임시 디렉토리에 쓴 뒤 교체하므로 중간 상태가 읽히지 않음)
+    컬럼 종류: numeric (.npy), integer (값 .npy + 결측 마스크), category (코드 .npy + 사전), string (문자열 테이블 + 결측 마스크)
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    stat = os.stat(csv_path)
+    # 파싱과 해시를 같은 바이트로 (읽는 중에 파일이 바뀌어도 스냅샷 내용과 해시가 어긋나지 않음)
+    records = CsvRecords.read(csv_path)
+    raw = pd.read_csv(io.BytesIO(records.data))
+    df = normalize_catalog(raw)
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'csv_sha256': records.sha256,
+        'csv_size': stat.st_size,
+        'csv_mtime_ns': stat.st_mtime_ns,
+        'num_rows': len(df),
+        'raw_bytes': memory_bytes(raw),
+        'normalized_bytes': memory_bytes(df),
+        'columns': [],
+    }
+
+    parent = os.path.dirname(snapshot_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.building-', dir=parent)
+    try:
+        string_groups = []
+        for i, name in enumerate(df.columns):
+            column = df[name]
+            entry = {'name': name, 'dtype': str(column.dtype)}
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                categories = column.cat.categories
+                np.save(os.path.join(staging, f'{i}.npy'), column.cat.codes.to_numpy())
+                string_groups.append([str(c) for c in categories])
+                entry.update(kind='category', count=len(categories), dtype=str(categories.dtype))
+            elif isinstance(column.array, pd.arrays.IntegerArray):
+                np.save(os.path.join(staging, f'{i}.npy'), column.to_numpy(dtype=column.dtype.numpy_dtype, na_value=0))
+                np.save(os.path.join(staging, f'{i}.mask.npy'), column.isna().to_numpy())
+                entry['kind'] = 'integer'
+            elif pd.api.types.is_numeric_dtype(column.dtype):
+                np.save(os.path.join(staging, f'{i}.npy'), column.to_numpy())
+                entry['kind'] = 'numeric'
+            else:
+                nulls = column.isna().to_numpy()
+                np.save(os.path.join(staging, f'{i}.mask.npy'), nulls)
+                string_groups.append(['' if null else str(v) for v, null in zip(column.to_numpy(dtype=object), nulls)])
+                entry.update(kind='string', count=len(column))
+            manifest['columns'].append(entry)
+        _write_string_table(staging, string_groups)
+        # 레코드 수가 행 수와 다르면 (레코드 경계를 pandas 와 다르게 나눈 경우) 해시를 저장하지 않음
+        if len(records) == len(df):
+            np.save(os.path.join(staging, 'record_hashes.npy'), records.hashes)
+        with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        if os.path.isdir(snapshot_dir):
+            shutil.rmtree(snapshot_dir)
+        os.replace(staging, snapshot_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(snapshot_dir) -> Optional[Dict]:
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(manifest: Optional[Dict], csv_path) -> bool:
+    """스냅샷이 현재 CSV 와 같은 내용인지 (크기/수정시각이 같으면 해시 계산 생략)"""
+    if not manifest or manifest.get('version') != SNAPSHOT_VERSION:
+        return False
+    stat = os.stat(csv_path)
+    if stat.st_size != manifest['csv_size']:
+        return False
+    if stat.st_mtime_ns == manifest['csv_mtime_ns']:
+        return True
+    return file_sha256(csv_path) == manifest['csv_sha256']
+
+
+def load_snapshot(snapshot_dir, manifest: Dict) -> pd.DataFrame:
+    """숫자/정수 값 배열과 범주 코드는 읽기 전용 메모리 매핑 배열을 그대로 사용"""
+    def mapped(i, suffix='npy'):
+        return np.asarray(np.load(os.path.join(snapshot_dir, f'{i}.{suffix}'), mmap_mode='r'))
+
+    strings = iter(_read_string_table(snapshot_dir, [c['count'] for c in manifest['columns'] if 'count' in c]))
+    columns = {}
+    for i, column in enumerate(manifest['columns']):
+        kind = column['kind']
+        if kind == 'numeric':
+            values = mapped(i)
+        elif kind == 'integer':
+            values = pd.arrays.IntegerArray(mapped(i), mapped(i, 'mask.npy'))
+        elif kind == 'category':
+            categories = pd.Index(next(strings), dtype=column['dtype'])
+            values = pd.Categorical.from_codes(mapped(i), categories=categories)
+        else:
+            values = next(strings)
+            values[mapped(i, 'mask.npy')] = None
+            values = pd.array(values, dtype=column['dtype'])
+        columns[column['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_record_hashes(csv_path, content_hash: str, num_rows: int,
+                       snapshot_dir: Optional[str] = None) -> Optional[np.ndarray]:
+    """
+    content_hash 내용인 CSV 의 레코드별 해시 (스냅샷에 있으면 메모리 매핑, 없으면 CSV 를 읽어 계산)
+    CSV 가 그사이 바뀌었거나 레코드 수가 행 수와 다르면 None (재로드는 전체 재구축)
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    manifest = read_manifest(snapshot_dir)
+    if manifest and manifest.get('version') == SNAPSHOT_VERSION and manifest['csv_sha256'] == content_hash:
+        try:
+            hashes = np.load(os.path.join(snapshot_dir, 'record_hashes.npy'), mmap_mode='r')
+            return hashes if len(hashes) == num_rows else None
+        except (OSError, ValueError):
+            pass
+    try:
+        records = CsvRecords.read(csv_path)
+    except OSError:
+        return None
+    if records.sha256 != content_hash or len(records) != num_rows:
+        return None
+    return records.hashes
+
+
+def load_catalog(csv_path, snapshot_dir: Optional[str] = None, build: bool = True) -> Tuple[pd.DataFrame, Dict]:
+    """
+    (정규화된 데이터프레임, 로드 통계) 반환
+    스냅샷이 최신이면 스냅샷에서, 아니면 CSV 에서 읽고 (build=True 이면) 스냅샷을 다시 만든다
+    """
+    start = time.perf_counter()
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    manifest = read_manifest(snapshot_dir)
+    load_stats = {'csv_path': csv_path, 'snapshot_dir': snapshot_dir}
+
+    df = None
+    if is_fresh(manifest, csv_path):
+        try:
+            df = load_snapshot(snapshot_dir, manifest)
+            load_stats['source'] = 'snapshot'
+            load_stats['content_hash'] = manifest['csv_sha256']
+            load_stats['raw_bytes'] = manifest['raw_bytes']
+            load_stats['normalized_bytes'] = manifest['normalized_bytes']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ 스냅샷 로드 실패, CSV 사용: {e}")
+    if df is None:
+        # 숫자형 문자열 -> nullable 정수, 반복 문자열 -> 범주형 (정규화 전후 메모리 함께 기록)
+        raw = pd.read_csv(csv_path)
+        df = normalize_catalog(raw)
+        load_stats['source'] = 'csv'
+        load_stats['content_hash'] = file_sha256(csv_path)
+        load_stats['raw_bytes'] = memory_bytes(raw)
+        load_stats['normalized_bytes'] = memory_bytes(df)
+        if build:
+            try:
+                build_snapshot(csv_path, snapshot_dir)
+                load_stats['snapshot_built'] = True
+            except (OSError, ValueError) as e:
+                # 읽기 전용 배포 환경 등에서는 스냅샷 없이 CSV 로 계속 동작
+                print(f"⚠️ 스냅샷 생성 실패: {e}")
+                load_stats['snapshot_built'] = False
+
+    add_genre_list(df)
+    load_stats['rows'] = len(df)
+    load_stats['load_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return df, load_stats
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'dataset/imdb_top_1000.csv'
+    started = time.perf_counter()
+    built = build_snapshot(path)
+    print(f"✅ 스냅샷 생성: {default_snapshot_dir(path)} ({built['num_rows']}행, "
+          f"{(time.perf_counter() - started) * 1000:.1f}ms)")
+    _, snapshot_stats = load_catalog(path)
+    _, csv_stats = load_catalog(path, snapshot_dir=os.path.join(tempfile.gettempdir(), 'no-snapshot'), build=False)
+    print(f"📊 콜드 스타트: CSV {csv_stats['load_ms']}ms / 스냅샷 {snapshot_stats['load_ms']}ms")
+    print(f"📦 메모리: 원본 {snapshot_stats['raw_bytes'] / 1024:.0f}KB -> 정규화 {snapshot_stats['normalized_bytes'] / 1024:.0f}KB")
@@ -0,0 +1,124 @@
+"""
+한국어 단서 다중 패턴 매칭 (Aho-Corasick 오토마톤)
+'감옥', '크리스토퍼 놀란', '넷플릭스' 같은 단서 사전을 시작 시 한 번 오토마톤으로 만들고,
+사용자 입력은 한 번만 훑어 모든 단서를 찾는다 (사전 크기와 무관하게 입력 길이에 비례)
+단서 사전은 dataset/korean_clues.json 에서 읽으므로 코드 수정 없이 늘릴 수 있다
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+DEFAULT_CLUES_PATH = 'dataset/korean_clues.json'
+
+
+class ClueMatcher:
+    """
+    패턴 -> 값 사전의 Aho-Corasick 오토마톤
+    상태마다 (다음 글자 -> 상태) 전이, 실패 링크, 그 상태에서 끝나는 패턴을 두고
+    출력 링크 (실패 링크를 따라가며 처음 만나는 패턴이 있는 상태) 로 겹친 패턴도 모두 찾는다
+    패턴과 입력은 casefold 해서 비교 (대소문자 무시)
+    """
+
+    def __init__(self, entries: Mapping[str, Any]):
+        self.patterns: List[str] = []
+        self.values: List[Any] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._pattern_at: List[Optional[int]] = [None]  # 상태에서 끝나는 패턴 번호
+        for pattern, value in entries.items():
+            key = str(pattern).casefold()
+            if not key:
+                continue
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._pattern_at.append(None)
+                state = next_state
+            if self._pattern_at[state] is None:  # 같은 패턴이 여러 번이면 처음 것
+                self._pattern_at[state] = len(self.patterns)
+                self.patterns.append(str(pattern))
+                self.values.append(value)
+        self._build_links()
+
+    def _build_links(self):
+        """너비 우선으로 실패 링크와 출력 링크 계산"""
+        self._fail = [0] * len(self._goto)
+        self._output = [0] * len(self._goto)  # 0 이면 출력 링크 없음
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] = fail if self._pattern_at[fail] is not None else self._output[fail]
+                queue.append(next_state)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def finditer(self, text) -> Iterator[Tuple[int, int]]:
+        """(끝 위치, 패턴 번호) 를 입력 순서대로 (casefold 한 입력 기준, 끝 위치는 마지막 글자 다음)"""
+        goto, fail, output, pattern_at = self._goto, self._fail, self._output, self._pattern_at
+        state = 0
+        for position, char in enumerate(str(text).casefold(), 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            match = state if pattern_at[state] is not None else output[state]
+            while match:
+                yield position, pattern_at[match]
+                match = output[match]
+
+    def find(self, text) -> List[str]:
+        """입력에 나온 패턴 (사전 순서, 중복 없음)"""
+        return [self.patterns[i] for i in self._found(text)]
+
+    def lookup(self, text) -> List[Any]:
+        """입력에 나온 패턴의 값 (사전 순서, 중복 없음)"""
+        return [self.values[i] for i in self._found(text)]
+
+    def first(self, text) -> Optional[str]:
+        """입력에서 가장 먼저 끝나는 패턴 (없으면 None) - 찾으면 바로 멈춤"""
+        for _, index in self.finditer(text):
+            return self.patterns[index]
+        return None
+
+    def _found(self, text) -> List[int]:
+        return sorted({index for _, index in self.finditer(text)})
+
+
+def load_clue_matchers(path=DEFAULT_CLUES_PATH) -> Dict[str, ClueMatcher]:
+    """
+    단서 파일 -> 그룹별 매처
+    그룹 값이 dict 이면 (단서 -> 값), 리스트이면 단서 자체가 값
+    """
+    with open(path, encoding='utf-8') as f:
+        groups = json.load(f)
+    return {
+        name: ClueMatcher(entries if isinstance(entries, dict) else {entry: entry for entry in entries})
+        for name, entries in groups.items()
+    }
+
+
+_matchers: Dict[str, Dict[str, ClueMatcher]] = {}
+_lock = threading.Lock()
+
+
+def get_clue_matchers(path=DEFAULT_CLUES_PATH) -> Dict[str, ClueMatcher]:
+    """경로별 공용 매처 (프로세스당 한 번만 오토마톤 구축)"""
+    key = os.path.realpath(path)
+    matchers = _matchers.get(key)
+    if matchers is None:
+        with _lock:
+            matchers = _matchers.get(key)
+            if matchers is None:
+                matchers = _matchers[key] = load_clue_matchers(path)
+    return matchers
@@ -0,0 +1,94 @@
+"""
+검색 결과 패싯 (장르, 연대, 감독, 관람등급, 평점 구간별 영화 수)
+행마다 범주 번호를 미리 계산해 두고, 매칭 행 전체에 대한 개수는 np.bincount 한 번으로 센다
+에이전트가 다음 질문 (장르? 연대? 배우?) 을 고르거나 UI 에 분포를 보여줄 때 사용
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from search_index import release_decades
+
+FACET_FIELDS = ('genre', 'decade', 'director', 'certificate', 'rating')
+# 패싯마다 개수 상위 몇 개까지 반환할지
+DEFAULT_FACET_LIMIT = 10
+# 평점 구간 폭 (8.0 -> [8.0, 8.5))
+RATING_BUCKET_WIDTH = 0.5
+
+
+def rating_buckets(ratings) -> np.ndarray:
+    """평점 -> 구간 하한 (8.3 -> 8.0)"""
+    ratings = np.asarray(ratings, dtype=np.float64)
+    return np.round(np.floor(ratings / RATING_BUCKET_WIDTH + 1e-9) * RATING_BUCKET_WIDTH, 1)
+
+
+def empty_facets() -> Dict:
+    """매칭 행이 없을 때의 패싯"""
+    return {'total': 0, **{name: {} for name in FACET_FIELDS}}
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def top_counts(labels: np.ndarray, counts: np.ndarray, limit: int = DEFAULT_FACET_LIMIT,
+               label_rank: Optional[np.ndarray] = None) -> Dict:
+    """(값 -> 개수) 를 개수 내림차순 (동점은 값 순서) 으로 최대 limit 개, 개수 0 인 값은 제외"""
+    present = np.flatnonzero(counts)
+    if label_rank is None:
+        label_rank = np.argsort(np.argsort(np.asarray(labels, dtype=object), kind='stable'), kind='stable')
+    order = present[np.lexsort((label_rank[present], -counts[present]))][:limit]
+    return {_python_value(labels[i]): int(counts[i]) for i in order}
+
+
+class FacetIndex:
+    """
+    단일 값 컬럼 (연대, 감독, 관람등급, 평점 구간) 은 행별 범주 번호 배열 (없는 값은 -1),
+    장르처럼 한 행에 여러 값이 있는 컬럼은 행 기준 CSR (행 -> 장르 번호들)
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.num_rows = len(df)
+        self.fields = {}  # 이름 -> (행별 범주 번호, 값, 값 정렬 순위)
+        for name, values in (('decade', release_decades(df['Released_Year'])),
+                             ('director', df['Director']),
+                             ('certificate', df['Certificate']),
+                             ('rating', rating_buckets(df['IMDB_Rating']))):
+            codes, labels = pd.factorize(pd.Series(np.asarray(values, dtype=object)), sort=True)
+            labels = np.asarray(labels, dtype=object)
+            self.fields[name] = (codes.astype(np.int32), labels, np.arange(len(labels)))
+
+        genres = pd.Series(df['Genre_List'].to_numpy(dtype=object)).explode().dropna()
+        codes, labels = pd.factorize(genres.to_numpy(dtype=object), sort=True)
+        self.genre_codes = codes.astype(np.int32)
+        self.genre_labels = np.asarray(labels, dtype=object)
+        self.genre_offsets = np.zeros(self.num_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(genres.index.to_numpy(dtype=np.int64), minlength=self.num_rows),
+                  out=self.genre_offsets[1:])
+
+    def _genre_positions(self, ids: np.ndarray) -> np.ndarray:
+        """행 번호들의 장르 CSR 위치 (행마다 [시작, 끝) 구간을 이어 붙인 것)"""
+        starts = self.genre_offsets[ids]
+        lengths = self.genre_offsets[ids + 1] - starts
+        ends = np.cumsum(lengths)
+        return np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+
+    def counts(self, ids: Optional[np.ndarray] = None, limit: int = DEFAULT_FACET_LIMIT) -> Dict:
+        """
+        매칭 행 (ids, None 이면 전체) 의 패싯별 개수
+        {'total': 매칭 행 수, 'genre': {'Drama': 120, ...}, 'decade': {1990: 40, ...}, ...}
+        """
+        ids = None if ids is None else np.asarray(ids, dtype=np.int64)
+        facets = {'total': self.num_rows if ids is None else len(ids)}
+        genre_codes = self.genre_codes if ids is None else self.genre_codes[self._genre_positions(ids)]
+        genre_counts = np.bincount(genre_codes, minlength=len(self.genre_labels))
+        facets['genre'] = top_counts(self.genre_labels, genre_counts, limit, np.arange(len(self.genre_labels)))
+        for name in FACET_FIELDS[1:]:
+            codes, labels, label_rank = self.fields[name]
+            selected = codes if ids is None else codes[ids]
+            # 없는 값 (-1) 은 0 번 칸으로 모은 뒤 버림
+            counts = np.bincount(selected + 1, minlength=len(labels) + 1)[1:]
+            facets[name] = top_counts(labels, counts, limit, label_rank)
+        return facets
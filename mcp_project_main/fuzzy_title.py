@@ -0,0 +1,83 @@
+"""
+오타에 강한 영화 제목 검색 (문자 트라이그램 색인)
+'Shawshenk' 처럼 철자가 틀린 제목도 전체 스캔 없이 유사도 순 후보를 반환
+"""
+
+import math
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from search_index import EMPTY_IDS, CsrPostings, contains_sorted, normalize_name, union_ids
+
+NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_title(title) -> str:
+    """제목 정규화: 악센트 제거, 소문자, 구두점 -> 공백"""
+    return ' '.join(NON_WORD.sub(' ', normalize_name(title)).split())
+
+
+def title_trigrams(title) -> List[str]:
+    """단어마다 앞 2칸, 뒤 1칸 공백을 붙여 만든 트라이그램 집합 (pg_trgm 방식)"""
+    grams = set()
+    for word in normalize_title(title).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return sorted(grams)
+
+
+class TitleTrigramIndex:
+    """
+    트라이그램 -> 제목 행 번호 포스팅
+    후보는 쿼리 트라이그램 중 가장 드문 것들의 포스팅에서만 모으고 (prefix filtering),
+    나머지 트라이그램은 후보에 대해서만 이진 탐색으로 공유 개수를 센다
+    """
+
+    def __init__(self, titles: pd.Series):
+        grams_per_title = [title_trigrams(t) for t in titles.fillna('').to_numpy()]
+        self.gram_counts = np.array([len(g) for g in grams_per_title], dtype=np.int32)
+        keys = np.array([g for grams in grams_per_title for g in grams], dtype=object)
+        rows = np.repeat(np.arange(len(grams_per_title), dtype=np.int64), self.gram_counts)
+        self.postings = CsrPostings(keys, rows)
+
+    def updated(self, diff, added_titles: pd.Series) -> 'TitleTrigramIndex':
+        """재로드된 카탈로그용 새 색인 (바뀐/추가된 제목만 트라이그램으로 분해)"""
+        added = TitleTrigramIndex(added_titles)
+        index = TitleTrigramIndex.__new__(TitleTrigramIndex)
+        index.gram_counts = np.zeros(diff.num_rows, dtype=np.int32)
+        moved = diff.id_map >= 0
+        index.gram_counts[diff.id_map[moved]] = self.gram_counts[moved]
+        index.gram_counts[diff.added_ids] = added.gram_counts
+        index.postings = self.postings.updated(diff.id_map, added.postings, diff.added_ids)
+        return index
+
+    def search(self, query, limit: int = 5, min_similarity: float = 0.5,
+               tie_rank: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (행 번호, 유사도) 를 유사도 내림차순으로 최대 limit 개 반환
+        유사도는 쿼리 트라이그램 중 제목에 포함된 비율, 동점이면 Jaccard 유사도가 높은 (길이가 비슷한) 제목 우선
+        """
+        grams = title_trigrams(query)
+        if not grams:
+            return EMPTY_IDS, np.empty(0)
+        grams.sort(key=self.postings.count)
+        need = max(1, math.ceil(min_similarity * len(grams)))
+
+        # 공유 트라이그램이 need 개 이상이려면 가장 드문 (len - need + 1) 개 중 하나는 반드시 포함
+        candidates = union_ids([self.postings.get(g) for g in grams[:len(grams) - need + 1]])
+        if not len(candidates):
+            return EMPTY_IDS, np.empty(0)
+        shared = np.zeros(len(candidates), dtype=np.int32)
+        for gram in grams:
+            shared += contains_sorted(self.postings.get(gram), candidates)
+
+        keep = shared >= need
+        candidates, shared = candidates[keep], shared[keep]
+        similarity = shared / len(grams)
+        jaccard = shared / (len(grams) + self.gram_counts[candidates] - shared)
+        ties = tie_rank[candidates] if tie_rank is not None else candidates
+        order = np.lexsort((ties, -jaccard, -similarity))[:limit]
+        return candidates[order], similarity[order]
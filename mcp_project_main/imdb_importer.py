@@ -0,0 +1,268 @@
+"""
+IMDb 비상업용 TSV 덤프 대량 가져오기
+title.basics / title.ratings / title.principals / name.basics 를 청크 단위로 스트리밍하면서 조인해
+번들 CSV (imdb_top_1000.csv) 와 같은 스키마의 카탈로그 CSV 를 만든다
+-> MovieDataManager(csv_path=...) 가 그대로 스냅샷/정규화/색인을 구축
+
+메모리는 덤프 크기가 아니라 선택된 영화 수에 비례 (principals 처럼 수천만 행인 파일도 청크만 메모리에 올림)
+
+사용:
+  python imdb_importer.py --dumps ./imdb --output dataset/imdb_full.csv --min-votes 1000
+  python imdb_importer.py --synthetic 50000 --dumps ./synthetic_imdb   # 오프라인 테스트용 덤프 생성
+"""
+
+import argparse
+import csv
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DUMP_FILES = {
+    'basics': 'title.basics.tsv',
+    'ratings': 'title.ratings.tsv',
+    'principals': 'title.principals.tsv',
+    'names': 'name.basics.tsv',
+}
+NULL = '\\N'
+DEFAULT_CHUNK_SIZE = 200_000
+DEFAULT_TITLE_TYPES = ('movie',)
+STAR_CATEGORIES = ('actor', 'actress')
+NUM_STARS = 4
+
+# 번들 CSV 와 같은 컬럼 순서 (덤프에 없는 필드는 비워 둠)
+CATALOG_COLUMNS = ['Poster_Link', 'Series_Title', 'Released_Year', 'Certificate', 'Runtime', 'Genre',
+                   'IMDB_Rating', 'Overview', 'Meta_score', 'Director', 'Star1', 'Star2', 'Star3', 'Star4',
+                   'No_of_Votes', 'Gross']
+
+
+def dump_path(directory, name) -> str:
+    """압축본 (.tsv.gz) 이 있으면 우선 사용"""
+    path = os.path.join(directory, DUMP_FILES[name])
+    return path + '.gz' if os.path.exists(path + '.gz') else path
+
+
+def read_tsv_chunks(path, usecols, chunk_size):
+    """IMDb TSV 를 문자열 청크로 스트리밍 (\\N 은 결측, 따옴표 해석 안 함)"""
+    return pd.read_csv(path, sep='\t', usecols=usecols, dtype=str, na_values=[NULL], keep_default_na=False,
+                       quoting=csv.QUOTE_NONE, chunksize=chunk_size)
+
+
+def imdb_ids(values: pd.Series) -> np.ndarray:
+    """'tt0111161' / 'nm0000151' -> 정수 id (조인은 정렬된 정수 배열의 이진 탐색으로)"""
+    return values.str.slice(2).astype(np.int64).to_numpy()
+
+
+def lookup(sorted_ids: np.ndarray, ids: np.ndarray):
+    """(위치, 존재 여부) - sorted_ids 안에서 ids 의 위치"""
+    positions = np.searchsorted(sorted_ids, ids)
+    found = positions < len(sorted_ids)
+    found[found] = sorted_ids[positions[found]] == ids[found]
+    return positions, found
+
+
+def _load_ratings(path, min_votes, chunk_size):
+    ids, ratings, votes = [], [], []
+    for chunk in read_tsv_chunks(path, ['tconst', 'averageRating', 'numVotes'], chunk_size):
+        chunk_votes = chunk['numVotes'].astype(np.int64).to_numpy()
+        keep = chunk_votes >= min_votes
+        ids.append(imdb_ids(chunk['tconst'])[keep])
+        ratings.append(chunk['averageRating'].astype(np.float64).to_numpy()[keep])
+        votes.append(chunk_votes[keep])
+    ids, ratings, votes = np.concatenate(ids), np.concatenate(ratings), np.concatenate(votes)
+    order = np.argsort(ids, kind='stable')
+    return ids[order], ratings[order], votes[order]
+
+
+def _load_movies(path, rated_ids, title_types, chunk_size) -> pd.DataFrame:
+    parts = []
+    usecols = ['tconst', 'titleType', 'primaryTitle', 'isAdult', 'startYear', 'runtimeMinutes', 'genres']
+    for chunk in read_tsv_chunks(path, usecols, chunk_size):
+        chunk = chunk[chunk['titleType'].isin(title_types) & (chunk['isAdult'] != '1')]
+        ids = imdb_ids(chunk['tconst'])
+        positions, found = lookup(rated_ids, ids)
+        chunk = chunk[found]
+        parts.append(pd.DataFrame({
+            'rated_pos': positions[found],
+            'title': chunk['primaryTitle'].to_numpy(),
+            'year': chunk['startYear'].to_numpy(),
+            'runtime': chunk['runtimeMinutes'].to_numpy(),
+            'genres': chunk['genres'].to_numpy(),
+        }))
+    movies = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+        columns=['rated_pos', 'title', 'year', 'runtime', 'genres'])
+    return movies.sort_values('rated_pos', ignore_index=True)
+
+
+def _load_principals(path, movie_ids, chunk_size):
+    """(영화 위치, ordering, 인물 id, 감독 여부) - 감독/배우만, 선택된 영화만"""
+    movie_pos, ordering, person_ids, is_director = [], [], [], []
+    for chunk in read_tsv_chunks(path, ['tconst', 'ordering', 'nconst', 'category'], chunk_size):
+        directors = (chunk['category'] == 'director').to_numpy()
+        chunk_mask = directors | chunk['category'].isin(STAR_CATEGORIES).to_numpy()
+        chunk, directors = chunk[chunk_mask], directors[chunk_mask]
+        positions, found = lookup(movie_ids, imdb_ids(chunk['tconst']))
+        movie_pos.append(positions[found])
+        ordering.append(chunk['ordering'].astype(np.int32).to_numpy()[found])
+        person_ids.append(imdb_ids(chunk['nconst'])[found])
+        is_director.append(directors[found])
+    if not movie_pos:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, np.empty(0, dtype=bool)
+    return (np.concatenate(movie_pos), np.concatenate(ordering),
+            np.concatenate(person_ids), np.concatenate(is_director))
+
+
+def _first_per_movie(movie_pos, ordering, person_ids, slots, num_movies) -> np.ndarray:
+    """영화별 ordering 이 가장 앞선 인물 slots 명 -> (num_movies, slots) 인물 id (없으면 -1)"""
+    result = np.full((num_movies, slots), -1, dtype=np.int64)
+    if not len(movie_pos):
+        return result
+    order = np.lexsort((ordering, movie_pos))
+    movie_pos, person_ids = movie_pos[order], person_ids[order]
+    starts = np.searchsorted(movie_pos, movie_pos, side='left')
+    rank = np.arange(len(movie_pos)) - starts
+    keep = rank < slots
+    result[movie_pos[keep], rank[keep]] = person_ids[keep]
+    return result
+
+
+def _load_names(path, person_ids, chunk_size) -> Dict[int, str]:
+    names = {}
+    for chunk in read_tsv_chunks(path, ['nconst', 'primaryName'], chunk_size):
+        ids = imdb_ids(chunk['nconst'])
+        _, found = lookup(person_ids, ids)
+        names.update(zip(ids[found].tolist(), chunk['primaryName'].to_numpy()[found].tolist()))
+    return names
+
+
+def import_catalog(dumps_dir, min_votes: int = 1000, title_types=DEFAULT_TITLE_TYPES,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """덤프 -> 번들 CSV 스키마의 카탈로그 데이터프레임 (평점 내림차순)"""
+    rated_ids, ratings, votes = _load_ratings(dump_path(dumps_dir, 'ratings'), min_votes, chunk_size)
+    movies = _load_movies(dump_path(dumps_dir, 'basics'), rated_ids, list(title_types), chunk_size)
+    movie_ids = rated_ids[movies['rated_pos'].to_numpy()]
+
+    movie_pos, ordering, person_ids, is_director = _load_principals(
+        dump_path(dumps_dir, 'principals'), movie_ids, chunk_size)
+    directors = _first_per_movie(movie_pos[is_director], ordering[is_director], person_ids[is_director],
+                                 1, len(movies))
+    stars = _first_per_movie(movie_pos[~is_director], ordering[~is_director], person_ids[~is_director],
+                             NUM_STARS, len(movies))
+    needed = np.unique(np.concatenate([directors.ravel(), stars.ravel()]))
+    names = _load_names(dump_path(dumps_dir, 'names'), needed[needed >= 0], chunk_size)
+
+    def people(ids):
+        return [names.get(i) for i in ids.tolist()]
+
+    positions = movies['rated_pos'].to_numpy()
+    catalog = pd.DataFrame({
+        'Poster_Link': None,
+        'Series_Title': movies['title'].to_numpy(),
+        'Released_Year': movies['year'].to_numpy(),
+        'Certificate': None,
+        'Runtime': [None if pd.isna(m) else f"{m} min" for m in movies['runtime'].to_numpy()],
+        'Genre': movies['genres'].str.replace(',', ', ', regex=False).to_numpy(),
+        'IMDB_Rating': ratings[positions],
+        'Overview': '',
+        'Meta_score': np.nan,
+        'Director': people(directors[:, 0]),
+        **{f'Star{i + 1}': people(stars[:, i]) for i in range(NUM_STARS)},
+        'No_of_Votes': votes[positions],
+        'Gross': None,
+    }, columns=CATALOG_COLUMNS)
+    order = np.lexsort((-catalog['No_of_Votes'].to_numpy(), -catalog['IMDB_Rating'].to_numpy()))
+    return catalog.iloc[order].reset_index(drop=True)
+
+
+def write_catalog(catalog: pd.DataFrame, output_path) -> None:
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    catalog.to_csv(output_path, index=False)
+
+
+def generate_synthetic_dumps(directory, num_titles: int = 10_000, num_people: Optional[int] = None,
+                             seed: int = 0) -> Dict[str, str]:
+    """IMDb 덤프와 같은 형식의 합성 TSV 4종 생성 (오프라인 테스트용)"""
+    rng = np.random.default_rng(seed)
+    num_people = num_people or max(num_titles // 2, 10)
+    os.makedirs(directory, exist_ok=True)
+    paths = {name: os.path.join(directory, filename) for name, filename in DUMP_FILES.items()}
+
+    genres = np.array(['Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Drama', 'Fantasy',
+                       'Horror', 'Mystery', 'Romance', 'Sci-Fi', 'Thriller', 'War', 'Western'])
+    words = np.array(['Dark', 'Night', 'Return', 'Lost', 'City', 'Dream', 'War', 'Star', 'Love', 'Prison',
+                      'Escape', 'King', 'Shadow', 'River', 'Last', 'Secret', 'Storm', 'Ghost', 'Road', 'Fire'])
+    tconst = [f"tt{i:07d}" for i in range(1, num_titles + 1)]
+    title_types = rng.choice(['movie', 'movie', 'movie', 'short', 'tvSeries', 'tvEpisode'], num_titles)
+    title_words = rng.integers(0, len(words), (num_titles, 3))
+    titles = [' '.join(words[w]) + f" {i}" for i, w in enumerate(title_words)]
+    years = rng.integers(1920, 2025, num_titles).astype(str).astype(object)
+    years[rng.random(num_titles) < 0.02] = NULL
+    runtimes = rng.integers(60, 220, num_titles).astype(str).astype(object)
+    runtimes[rng.random(num_titles) < 0.05] = NULL
+    genre_lists = [','.join(sorted(rng.choice(genres, rng.integers(1, 4), replace=False)))
+                   for _ in range(num_titles)]
+    pd.DataFrame({
+        'tconst': tconst, 'titleType': title_types, 'primaryTitle': titles, 'originalTitle': titles,
+        'isAdult': np.where(rng.random(num_titles) < 0.01, '1', '0'), 'startYear': years, 'endYear': NULL,
+        'runtimeMinutes': runtimes, 'genres': genre_lists,
+    }).to_csv(paths['basics'], sep='\t', index=False, quoting=csv.QUOTE_NONE)
+
+    rated = np.flatnonzero(rng.random(num_titles) < 0.8)
+    pd.DataFrame({
+        'tconst': [tconst[i] for i in rated],
+        'averageRating': np.round(rng.uniform(1, 10, len(rated)), 1),
+        'numVotes': rng.lognormal(6, 2, len(rated)).astype(np.int64) + 5,
+    }).to_csv(paths['ratings'], sep='\t', index=False, quoting=csv.QUOTE_NONE)
+
+    credits_per_title = rng.integers(3, 11, num_titles)
+    title_index = np.repeat(np.arange(num_titles), credits_per_title)
+    ordering = np.arange(len(title_index)) - np.repeat(np.cumsum(credits_per_title) - credits_per_title,
+                                                       credits_per_title) + 1
+    categories = rng.choice(['actor', 'actress', 'director', 'writer', 'producer', 'composer', 'self'],
+                            len(title_index), p=[0.3, 0.25, 0.1, 0.1, 0.1, 0.1, 0.05])
+    people = rng.integers(1, num_people + 1, len(title_index))
+    principals = pd.DataFrame({
+        'tconst': np.array(tconst, dtype=object)[title_index], 'ordering': ordering,
+        'nconst': [f"nm{p:07d}" for p in people], 'category': categories, 'job': NULL, 'characters': NULL,
+    })
+    # 실제 덤프처럼 영화 내 ordering 순서가 섞여 있을 수 있음
+    principals.sample(frac=1, random_state=seed).to_csv(paths['principals'], sep='\t', index=False,
+                                                         quoting=csv.QUOTE_NONE)
+
+    first = np.array(['Alex', 'Maria', 'John', 'Yuna', 'Pierre', 'Aiko', 'Carlos', 'Sofia', 'Min', 'Omar'])
+    last = np.array(['Kim', 'Smith', 'Garcia', 'Dubois', 'Tanaka', 'Rossi', 'Novak', 'Lee', 'Brown', 'Silva'])
+    name_parts = rng.integers(0, 10, (num_people, 2))
+    pd.DataFrame({
+        'nconst': [f"nm{p:07d}" for p in range(1, num_people + 1)],
+        'primaryName': [f"{first[a]} {last[b]} {p}" for p, (a, b) in enumerate(name_parts, 1)],
+        'birthYear': NULL, 'deathYear': NULL, 'primaryProfession': NULL, 'knownForTitles': NULL,
+    }).to_csv(paths['names'], sep='\t', index=False, quoting=csv.QUOTE_NONE)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="IMDb TSV 덤프 -> 영화 카탈로그 CSV")
+    parser.add_argument('--dumps', required=True, help="덤프 디렉토리 (title.basics.tsv[.gz] 등)")
+    parser.add_argument('--output', default='dataset/imdb_full.csv')
+    parser.add_argument('--min-votes', type=int, default=1000)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--synthetic', type=int, metavar='N', help="N개 타이틀의 합성 덤프를 --dumps 에 생성만 함")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        generate_synthetic_dumps(args.dumps, args.synthetic)
+        print(f"✅ 합성 덤프 생성: {args.dumps} ({args.synthetic:,}개 타이틀)")
+        return
+    start = time.perf_counter()
+    catalog = import_catalog(args.dumps, args.min_votes, chunk_size=args.chunk_size)
+    write_catalog(catalog, args.output)
+    print(f"✅ {len(catalog):,}개 영화 -> {args.output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
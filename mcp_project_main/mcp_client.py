@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from catalog_schema import movie_records
+
 class MCPClient:
     """MCP 프로토콜을 구현하는 클라이언트"""
     
@@ -238,7 +240,7 @@ class MCPMovieToolHandler:
             results = self.movie_manager.search_movies(**search_params)
             
             # 결과를 MCP 형식으로 변환
-            movies = results.to_dict(orient='records') if not results.empty else []
+            movies = movie_records(results)
             
             return {
                 "content": [
@@ -1,52 +1,445 @@
-import pandas as pd
+import os
+
+import numpy as np
+from catalog_registry import DEFAULT_CSV_PATH, get_catalog
+from plot_ann import ANN_MIN_ROWS
+from query_cache import get_query_cache
+from query_planner import BitmapPredicate, KeywordPredicate, PersonPredicate, RowSetPredicate
+from search_cursor import SearchCursor, decode_cursor
+from search_index import (EMPTY_IDS, ROLE_DIRECTOR, STAR_ROLES, intersect_ids, normalize_key,
+                          parse_decade, parse_genres, person_key, union_ids)
+from session_candidates import CandidateScope, CandidateSet, store_candidates, stored_candidates
+from substring_index import normalize_keyword
+
+# 검색 백엔드: 'pandas' (프로세스 메모리의 색인) / 'sqlite' (프로세스 간 공유하는 디스크 색인)
+BACKENDS = ('pandas', 'sqlite')
+
+# search_movies / search_movies_many 가 받는 검색 파라미터
+SEARCH_PARAMETERS = ('keywords', 'genre', 'director', 'actor', 'min_rating', 'max_rating', 'top_n',
+                     'certificate', 'decade', 'rank_by', 'facets', 'within')
+
+
+def row_ids(ids):
+    """행 번호 모음 -> 정렬된 중복 없는 int64 배열 (None 은 제한 없음)"""
+    if ids is None:
+        return None
+    return np.unique(np.asarray(ids, dtype=np.int64))
+
 
 class MovieDataManager:
-    def __init__(self, csv_path='dataset/imdb_top_1000.csv'):
-        self.df = pd.read_csv(csv_path)
-        # 'Genre' 컬럼을 쉼표로 분리하여 리스트로 저장
-        self.df['Genre_List'] = self.df['Genre'].apply(lambda x: [g.strip() for g in x.split(',')])
+    """
+    공용 카탈로그에 대한 가벼운 읽기 전용 핸들
+    데이터/색인 (df, substring_index, planner, ...) 은 catalog_registry 가 프로세스당 한 번만 만든다
+    backend='sqlite' 이면 search_movies 는 SQLite 파일에서 실행하고, 메모리 카탈로그는
+    다른 기능 (제목/묘사 검색 등) 이 처음 필요로 할 때만 로드 (기본값은 환경변수 MOVIE_SEARCH_BACKEND)
+    검색 결과는 경로별 공용 캐시 (query_cache) 에 보관 (use_cache=False 이면 사용 안 함)
+    CSV 가 바뀌면 레지스트리가 새 버전의 카탈로그로 교체하고, 검색 하나는 시작할 때의 버전만 사용한다
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, catalog=None, backend=None, use_cache=True):
+        self.csv_path = csv_path
+        self.backend = backend or os.environ.get('MOVIE_SEARCH_BACKEND', 'pandas')
+        if self.backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 검색 백엔드: {self.backend} (가능: {', '.join(BACKENDS)})")
+        self._catalog = catalog
+        self.store = None
+        if self.backend == 'sqlite':
+            from sqlite_backend import get_sqlite_store
+            self.store = get_sqlite_store(csv_path)
+        elif catalog is None:
+            get_catalog(csv_path)  # 생성 시 로드 (핸들은 특정 버전에 고정하지 않음)
+        self.query_cache = get_query_cache(csv_path) if use_cache else None
+
+    @property
+    def catalog(self):
+        """생성 시 받은 카탈로그, 없으면 레지스트리의 현재 버전"""
+        return self._catalog if self._catalog is not None else get_catalog(self.csv_path)
 
-    def search_movies(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None, top_n=10):
-        results = self.df.copy()
+    def __getattr__(self, name):
+        # df, 색인, load_stats 등은 공용 카탈로그 속성을 그대로 사용
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.catalog, name)
 
-        # 키워드 검색: 제목, 줄거리, 장르, 감독, 배우 필드에서 검색
+    def __len__(self):
+        """카탈로그 영화 수 (sqlite 백엔드는 메모리 카탈로그를 로드하지 않음)"""
+        return len(self.store) if self.store is not None else len(self.catalog.df)
+
+    def _predicates(self, keywords=None, genre=None, director=None, actor=None, certificate=None, decade=None,
+                    within=None, catalog=None):
+        """검색 파라미터를 플래너 조건 목록으로 변환 (catalog: 검색에 고정한 카탈로그 버전)"""
+        catalog = catalog or self.catalog
+        predicates = []
+        # 후보 집합 제한: 대화 세션이 앞선 턴에서 좁혀 둔 행 번호 (작으면 플래너가 후보 생성에 사용)
+        if within is not None:
+            predicates.append(RowSetPredicate(within))
+        # 키워드 검색: 제목, 줄거리, 장르, 감독, 배우 필드의 부분 문자열 색인 (여러 키워드는 OR)
         if keywords:
-            keyword_pattern = '|'.join(keywords) # 여러 키워드를 OR 조건으로 검색
-            results = results[
-                results['Series_Title'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Overview'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Genre'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Director'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Star1'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Star2'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Star3'].str.contains(keyword_pattern, case=False, na=False) |
-                results['Star4'].str.contains(keyword_pattern, case=False, na=False)
-            ]
-
-        if genre:
-            results = results[results['Genre_List'].apply(lambda x: genre.lower() in [g.lower() for g in x])]
+            predicates.append(KeywordPredicate(catalog.substring_index, keywords))
+        # 감독/배우 필터: 인물 색인의 포스팅 리스트
         if director:
-            results = results[results['Director'].str.lower().str.contains(director.lower(), na=False)]
+            predicates.append(PersonPredicate('director', catalog.person_index, director, [ROLE_DIRECTOR]))
         if actor:
-            actor_lower = actor.lower()
-            results = results[
-                results['Star1'].str.lower().str.contains(actor_lower, na=False) |
-                results['Star2'].str.lower().str.contains(actor_lower, na=False) |
-                results['Star3'].str.lower().str.contains(actor_lower, na=False) |
-                results['Star4'].str.lower().str.contains(actor_lower, na=False)
-            ]
-        if min_rating:
-            results = results[results['IMDB_Rating'] >= min_rating]
-        if max_rating:
-            results = results[results['IMDB_Rating'] <= max_rating]
-
-        # 평점 기준으로 내림차순 정렬
-        if not results.empty:
-            results = results.sort_values(by='IMDB_Rating', ascending=False)
+            predicates.append(PersonPredicate('actor', catalog.person_index, actor, STAR_ROLES))
+        # 장르(AND)/관람등급(OR)/연대(OR) 필터: 미리 계산된 비트맵
+        genres = parse_genres(genre) if genre else []
+        if genres:
+            predicates.append(BitmapPredicate('genre', catalog.genre_bitmaps, genres, 'all', catalog.stats))
+        if certificate:
+            certificates = certificate if isinstance(certificate, (list, tuple, set)) else [certificate]
+            predicates.append(BitmapPredicate('certificate', catalog.certificate_bitmaps, certificates, 'any', catalog.stats))
+        if decade:
+            decades = decade if isinstance(decade, (list, tuple, set)) else [decade]
+            predicates.append(BitmapPredicate('decade', catalog.decade_bitmaps,
+                                              [parse_decade(d) for d in decades], 'any', catalog.stats))
+        return predicates
+
+    def plan_query(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None, top_n=10,
+                   certificate=None, decade=None, within=None):
+        """검색 실행 계획 (조건 평가 순서는 plan.explain() 으로 확인)"""
+        return self._plan(self.catalog, keywords, genre, director, actor, min_rating, max_rating, top_n,
+                          certificate, decade, within=row_ids(within))
+
+    def _plan(self, catalog, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None,
+              top_n=10, certificate=None, decade=None, start_rank=0, within=None):
+        predicates = self._predicates(keywords, genre, director, actor, certificate, decade, within, catalog)
+        return catalog.planner.plan(predicates, min_rating or None, max_rating or None, top_n, start_rank)
+
+    def match_ids(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None,
+                  certificate=None, decade=None, within=None):
+        """
+        모든 조건을 만족하는 행 번호 전체 (정렬됨, 메모리 카탈로그 기준)
+        within 을 주면 그 행 번호 안에서만 찾으므로 비용이 카탈로그가 아니라 within 크기에 비례
+        """
+        catalog = self.catalog
+        # 전체 매칭이 필요하므로 top_n 대신 카탈로그 크기로 비용 추정 (조기 종료하는 평점순 순회를 고르지 않게)
+        return self._plan(catalog, keywords, genre, director, actor, min_rating, max_rating, len(catalog.df),
+                          certificate, decade, within=row_ids(within)).match_ids()
+
+    def _source(self):
+        """이번 검색에 쓸 (카탈로그 또는 SQLite 저장소) - 검색 하나 동안 같은 버전을 유지"""
+        return self.store if self.store is not None else self.catalog
+
+    def _cache_key(self, query, after=None):
+        """
+        정규화된 검색 파라미터 (같은 결과를 내는 검색은 같은 키)
+        키워드는 casefold 후 정렬된 집합 (대소문자/순서/중복 무시), 장르/관람등급/연대는 정렬된 집합, 인물은 정규화한 이름
+        after: 커서로 이어 찾는 페이지의 시작 위치
+        """
+        keywords = query.get('keywords')
+        genre = query.get('genre')
+        collections = []
+        for name, parse in (('certificate', normalize_key), ('decade', parse_decade)):
+            values = query.get(name)
+            if values:
+                values = values if isinstance(values, (list, tuple, set)) else [values]
+                collections.append(tuple(sorted({parse(v) for v in values}, key=repr)))
+            else:
+                collections.append(None)
+        return (
+            self.backend,
+            tuple(sorted({normalize_keyword(k) for k in keywords})) if keywords else None,
+            tuple(sorted({normalize_key(g) for g in parse_genres(genre)})) if genre else None,
+            person_key(query['director']) if query.get('director') else None,
+            person_key(query['actor']) if query.get('actor') else None,
+            float(query['min_rating']) if query.get('min_rating') else None,
+            float(query['max_rating']) if query.get('max_rating') else None,
+            int(query.get('top_n', 10)),
+            *collections,
+            query.get('rank_by', 'rating') if keywords else 'rating',
+            bool(query.get('facets')),
+            after,
+        )
+
+    def _cached(self, source, query, after=None):
+        """(캐시 키, 저장된 결과 또는 None) - 캐시를 쓰지 않거나 세션 후보 집합 안의 검색이면 키도 None"""
+        if self.query_cache is None or not self.query_cache.enabled or query.get('within') is not None:
+            return None, None
+        self.query_cache.bind(source.content_hash)
+        key = self._cache_key(query, after)
+        return key, self.query_cache.get(key)
+
+    def search_movies(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None, top_n=10,
+                      certificate=None, decade=None, rank_by='rating', cursor=None, facets=False, within=None):
+        """
+        결과가 top_n 개를 채우면 results.attrs['next_cursor'] 에 다음 페이지 커서 (아니면 None)
+        cursor 를 주면 다른 파라미터는 무시하고 커서에 담긴 검색의 다음 페이지를 반환
+        (카탈로그가 바뀌었거나 커서가 잘못되었으면 ValueError)
+        facets=True 이면 results.attrs['facets'] 에 매칭 행 전체의 장르/연대/감독/관람등급/평점 구간별 개수
+        within: 이 행 번호들 (또는 CandidateSet) 안에서만 검색 (결과 캐시는 쓰지 않음)
+        CandidateSet 이면 그 집합을 좁힐 때 쓴 조건과 같은 조건은 다시 평가하지 않고 좁힌 행 번호를 그대로 사용
+        """
+        scope = within.scope() if isinstance(within, CandidateSet) else self._scope(within)
+        query = {'keywords': keywords, 'genre': genre, 'director': director, 'actor': actor, 'min_rating': min_rating,
+                 'max_rating': max_rating, 'top_n': top_n, 'certificate': certificate, 'decade': decade,
+                 'rank_by': rank_by, 'facets': facets, 'within': scope.ids if scope is not None else None}
+        source = self._source()
+        after = None
+        if cursor is not None:
+            query, after, scope = self._resume(source, cursor)
+        key, cached = self._cached(source, query, after)
+        if cached is not None:
+            # 얕은 복사 (copy-on-write 라 호출한 쪽이 수정해도 캐시 값은 그대로)
+            return cached.copy(deep=False)
+        applied = scope.applied(query) if scope is not None else {}
+        results = self._paged(source, query, *self._search(source, after, applied=applied, **query),
+                              scope=scope, applied=applied)
+        if key is not None:
+            self.query_cache.put(key, results)
+            results = results.copy(deep=False)
+        return results
+
+    @staticmethod
+    def _scope(within):
+        """행 번호 모음 -> 검색 범위 (None 은 카탈로그 전체)"""
+        return None if within is None else CandidateScope(within)
+
+    def _resume(self, source, cursor):
+        """커서 토큰 -> (검색 파라미터, 시작 위치, 검색 범위 또는 None)"""
+        cursor = cursor if isinstance(cursor, SearchCursor) else decode_cursor(cursor)
+        if cursor.backend != self.backend:
+            raise ValueError(f"다른 검색 백엔드 ({cursor.backend}) 에서 만든 커서입니다")
+        if not cursor.matches(source.content_hash):
+            raise ValueError("검색 커서가 만료되었습니다 (카탈로그가 바뀜) - 처음부터 다시 검색하세요")
+        unknown = set(cursor.query) - set(SEARCH_PARAMETERS)
+        if unknown:
+            raise ValueError(f"잘못된 검색 커서입니다: 알 수 없는 파라미터 {', '.join(sorted(unknown))}")
+        query = dict(cursor.query)
+        scope = None
+        if query.get('within') is not None:
+            # 커서에는 서버에 보관한 후보 범위의 키만 있음
+            scope = stored_candidates(str(query['within']))
+            if scope is None:
+                raise ValueError("검색 커서가 만료되었습니다 (후보 집합이 더 이상 보관되어 있지 않음) - 처음부터 다시 검색하세요")
+            query['within'] = scope.ids
+        return query, (cursor.after_id, cursor.after_score), scope
+
+    def _paged(self, source, query, results, scores, scope=None, applied=None):
+        """
+        결과가 페이지를 채웠으면 마지막 행 위치로 다음 페이지 커서를 붙임
+        후보 범위 (scope) 는 서버에 보관하고 커서에는 그 키만 담음 (applied: 다음 페이지에서도 다시 평가하지 않을 조건)
+        """
+        next_cursor = None
+        if len(results) and len(results) >= int(query.get('top_n', 10)):
+            score = scores[-1] if scores is not None else None
+            # 패싯은 첫 페이지에서만 계산 (커서로 이어 받는 페이지에는 없음)
+            page_query = {name: value for name, value in query.items() if name != 'facets'}
+            if page_query.get('within') is not None:
+                page_query['within'] = store_candidates(scope or self._scope(page_query['within']), applied)
+            next_cursor = SearchCursor(page_query, self.backend, source.content_hash, results.index[-1], score).encode()
+        results.attrs['next_cursor'] = next_cursor
+        return results
+
+    def _search(self, source, after=None, keywords=None, genre=None, director=None, actor=None, min_rating=None,
+                max_rating=None, top_n=10, certificate=None, decade=None, rank_by='rating', facets=False, within=None,
+                applied=None):
+        """
+        (결과, 관련도순이면 원래 점수 배열 아니면 None) - after 는 커서의 (행 번호, 점수)
+        applied: within 의 행들이 이미 만족하는 조건 (평가하지 않음, 키워드는 관련도 점수에만 사용)
+        """
+        relevance = rank_by == 'relevance' and keywords
+        filters = {'keywords': keywords, 'genre': genre, 'director': director, 'actor': actor,
+                   'min_rating': min_rating, 'max_rating': max_rating, 'certificate': certificate, 'decade': decade}
+        filters.update(dict.fromkeys(applied or ()))
+        if source is self.store:
+            # FTS 관련도 점수는 MATCH 조건이 있어야 계산되므로 관련도순이면 키워드 조건은 남김
+            if relevance:
+                filters['keywords'] = keywords
+            return source.search_page(top_n=top_n, rank_by=rank_by, after=after, facets=facets, within=within,
+                                      **filters)
+        # 원본 데이터프레임은 복사하지 않음: 플래너가 고른 순서대로 행 번호 배열을 좁히고
+        # 상위 top_n 행만 꺼낸다
+        catalog = source
+        rating_order = catalog.rating_order
+        if after is not None and not 0 <= after[0] < len(rating_order):
+            return catalog.df.iloc[EMPTY_IDS].copy(), None
+        # 평점순 다음 페이지는 마지막 행의 평점 순위 다음부터 순회
+        start_rank = int(rating_order.rank[after[0]]) + 1 if after is not None and not relevance else 0
+        # 패싯은 조기 종료 없이 매칭 행 전체가 필요 (관련도순은 어차피 전체 후보를 점수화)
+        full_match = relevance or facets
+        plan = self._plan(catalog, top_n=len(catalog.df) if full_match else top_n, start_rank=start_rank,
+                          within=within, **filters)
+        match_ids = plan.match_ids() if full_match else None
+        if relevance:
+            # 조건을 만족하는 전체 후보를 BM25 점수 순으로 (동점은 평점순)
+            resume = (after[1], rating_order.rank[after[0]]) if after is not None else None
+            top_ids, scores = catalog.bm25.rank(keywords, match_ids, top_n, tie_rank=rating_order.rank, after=resume)
+            results = catalog.df.iloc[top_ids].copy()
+            results['Relevance'] = np.round(scores, 4)
         else:
-            return results # 결과가 없으면 빈 데이터프레임 반환
+            # 평점 내림차순
+            scores = None
+            top_ids = plan.execute(top_n) if match_ids is None else rating_order.top_k_of(match_ids, top_n)
+            results = catalog.df.iloc[top_ids]
+        if facets:
+            results.attrs['facets'] = catalog.facets.counts(match_ids)
+        return results, scores
+
+    def search_movies_many(self, queries, top_n=10):
+        """
+        여러 검색 파라미터 세트 (search_movies 키워드 인자 dict 리스트) 를 한 번에 실행해 쿼리별 결과 리스트 반환
+        같은 조건 (키워드 하나, 감독, 배우, 장르 하나, 관람등급, 연대) 의 매칭 행은 배치 안에서 한 번만 계산하고
+        결과 행은 데이터프레임에서 한 번에 꺼낸다. 각 결과는 search_movies 를 따로 호출한 것과 같다
+        (캐시에 있는 쿼리는 캐시에서, 나머지만 배치로 실행)
+        """
+        queries = [{'top_n': top_n, **query} for query in queries]
+        for query in queries:
+            unknown = set(query) - set(SEARCH_PARAMETERS)
+            if unknown:
+                raise TypeError(f"알 수 없는 검색 파라미터: {', '.join(sorted(unknown))}")
+            if query.get('within') is not None:
+                query['within'] = row_ids(query['within'])
+        source = self._source()
+        cached = [self._cached(source, query) for query in queries]
+        misses = [query for query, (_, result) in zip(queries, cached) if result is None]
+        computed = iter(self._paged(source, query, *result)
+                        for query, result in zip(misses, self._search_many(source, misses)))
+        results = []
+        for key, result in cached:
+            if result is None:
+                result = next(computed)
+                if key is not None:
+                    self.query_cache.put(key, result)
+            results.append(result.copy(deep=False) if key is not None else result)
+        return results
+
+    def _search_many(self, source, queries):
+        """쿼리별 (결과, 관련도 점수 또는 None)"""
+        if source is self.store:
+            return [source.search_page(**query) for query in queries]
+
+        catalog = source
+        rating_order = catalog.rating_order
+        shared = {}
+        selections = []  # (행 번호, BM25 점수 또는 None)
+        facet_counts = []
+        for query in queries:
+            ids = self._batch_match_ids(catalog, shared, query)
+            start, end = rating_order.rating_range(query.get('min_rating') or None, query.get('max_rating') or None)
+            keywords = query.get('keywords')
+            relevance = query.get('rank_by', 'rating') == 'relevance' and keywords
+            if relevance or query.get('facets'):
+                # 평점 구간까지 적용한 매칭 행 전체
+                if ids is None:
+                    ids = np.sort(rating_order.order[start:end])
+                else:
+                    ranks = rating_order.rank[ids]
+                    ids = ids[(ranks >= start) & (ranks < end)]
+            facet_counts.append(catalog.facets.counts(ids) if query.get('facets') else None)
+            if relevance:
+                selections.append(catalog.bm25.rank(keywords, ids, query['top_n'], tie_rank=rating_order.rank))
+            elif ids is None:
+                selections.append((rating_order.top_k(query['top_n'], start=start, end=end), None))
+            else:
+                selections.append((rating_order.top_k_of(ids, query['top_n'], start, end), None))
+
+        # 모든 쿼리의 결과 행을 한 번의 iloc 으로 꺼낸 뒤 쿼리별 구간으로 나눔
+        rows = catalog.df.iloc[np.concatenate([ids for ids, _ in selections] + [EMPTY_IDS])]
+        results = []
+        offset = 0
+        for (ids, scores), facets in zip(selections, facet_counts):
+            result = rows.iloc[offset:offset + len(ids)]
+            offset += len(ids)
+            if scores is not None:
+                result = result.copy()
+                result['Relevance'] = np.round(scores, 4)
+            else:
+                result = result.copy(deep=False)  # 쿼리마다 attrs (다음 페이지 커서, 패싯) 를 따로 가짐
+            if facets is not None:
+                result.attrs['facets'] = facets
+            results.append((result, scores))
+        return results
+
+    @staticmethod
+    def _batch_match_ids(catalog, shared, query):
+        """
+        평점 구간을 뺀 모든 조건을 만족하는 행 번호 (정렬됨, 조건이 없으면 None)
+        shared: 배치 안에서 조건별 매칭 행을 재사용하는 dict
+        """
+        def matched(key, compute):
+            ids = shared.get(key)
+            if ids is None:
+                ids = shared[key] = compute()
+            return ids
+
+        id_sets = []
+        keywords = query.get('keywords')
+        if keywords:
+            # 키워드끼리는 OR: 키워드 하나의 매칭 행을 공유하고 합집합
+            id_sets.append(union_ids([matched(('keyword', normalize_keyword(k)),
+                                              lambda k=k: catalog.substring_index.match_keyword(k))
+                                      for k in keywords]))
+        for role, roles in (('director', [ROLE_DIRECTOR]), ('actor', STAR_ROLES)):
+            person = query.get(role)
+            if person:
+                id_sets.append(matched((role, person_key(person)),
+                                       lambda p=person, r=roles: catalog.person_index.match_rows(p, roles=r)))
+        genre = query.get('genre')
+        for genre_name in (parse_genres(genre) if genre else []):
+            key = normalize_key(genre_name)
+            id_sets.append(matched(('genre', key), lambda key=key: catalog.genre_bitmaps.postings.get(key)))
+        for name, index, parse in (('certificate', catalog.certificate_bitmaps, normalize_key),
+                                   ('decade', catalog.decade_bitmaps, lambda d: normalize_key(parse_decade(d)))):
+            values = query.get(name)
+            if not values:
+                continue
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            keys = [parse(v) for v in values]
+            id_sets.append(union_ids([matched((name, key), lambda key=key, index=index: index.postings.get(key))
+                                      for key in keys]))
+        if query.get('within') is not None:
+            id_sets.append(query['within'])
+        if not id_sets:
+            return None
+        return intersect_ids(id_sets)
+
+    def find_titles(self, title, limit=5, min_similarity=0.5):
+        """
+        오타를 허용하는 제목 검색: 유사도 순 후보 (Similarity 컬럼 포함)
+        트라이그램 색인은 메모리 카탈로그에만 있으므로 sqlite 백엔드에서도 처음 호출할 때 카탈로그를 로드
+        """
+        catalog = self.catalog
+        row_ids, similarity = catalog.title_index.search(title, limit, min_similarity,
+                                                         tie_rank=catalog.rating_order.rank)
+        results = catalog.df.iloc[row_ids].copy()
+        results['Similarity'] = np.round(similarity, 3)
+        return results
+
+    def search_by_description(self, description, top_n=10, approximate=None, nprobe=None):
+        """
+        줄거리 묘사와 코사인 유사도가 높은 영화 (Similarity 컬럼 포함, 네트워크 호출 없음)
+        approximate: True 이면 줄거리 벡터 ANN 색인 (nprobe 개 목록의 후보만 정확하게 다시 점수화),
+        None 이면 ANN_MIN_ROWS 편 이상이고 색인의 측정 recall@10 이 ANN_RECALL_TARGET 이상일 때만
+        (못 미치면 정확한 TF-IDF 검색을 그대로 사용)
+        """
+        if isinstance(description, (list, tuple)):
+            description = ' '.join(str(d) for d in description)
+        catalog = self.catalog
+        if approximate is None:
+            approximate = len(catalog.df) >= ANN_MIN_ROWS and catalog.plot_index.meets_target
+        search = (lambda text, k: catalog.plot_index.search(text, k, nprobe)) if approximate else catalog.tfidf.search
+        row_ids, similarity = search(description, top_n)
+        results = catalog.df.iloc[row_ids].copy()
+        results['Similarity'] = np.round(similarity.astype(np.float64), 4)
+        return results
 
-        return results.head(top_n)
+    def similar_movies(self, title, k=10):
+        """
+        제목 (오타 허용) 과 비슷한 영화 최대 k 개 (장르/감독/출연진/줄거리 코사인 유사도 순, Similarity 컬럼 포함)
+        k 가 이웃 그래프의 k (기본 20) 이하면 미리 계산된 행을 읽어 O(k), 더 크면 전체 영화와 직접 비교
+        (results.attrs['exact'] = True), 기준 영화는 results.attrs['source_title'] (못 찾으면 None)
+        """
+        if k < 1:
+            raise ValueError(f"비슷한 영화 수 k 는 1 이상이어야 합니다: {k}")
+        catalog = self.catalog
+        source_ids, _ = catalog.title_index.search(title, 1, tie_rank=catalog.rating_order.rank)
+        row_ids, similarity = (catalog.neighbor_graph.neighbors_of(int(source_ids[0]), k) if len(source_ids)
+                               else (EMPTY_IDS, np.empty(0, dtype=np.float32)))
+        results = catalog.df.iloc[row_ids].copy()
+        results['Similarity'] = np.round(similarity.astype(np.float64), 4)
+        results.attrs['exact'] = k > catalog.neighbor_graph.k
+        results.attrs['source_title'] = catalog.df['Series_Title'].iloc[source_ids[0]] if len(source_ids) else None
+        return results
 
 if __name__ == '__main__':
     manager = MovieDataManager()
@@ -0,0 +1,305 @@
+"""
+'비슷한 영화' k-최근접 이웃 그래프
+장르/감독/출연진/줄거리 특징을 하나의 희소 벡터로 합치고, 특징을 공유하는 영화 쌍의 코사인 유사도만
+행 묶음 (chunk) 단위로 (쌍 -> 점수) 정렬 후 합산해 영화마다 상위 k 개 이웃만 저장한다
+너무 흔한 특징 (문서 빈도 > max_candidate_df, 예: 큰 카탈로그의 'Drama') 은 후보 쌍을 만들지 않고
+다른 특징으로 만든 후보 쌍의 유사도에만 더하므로, 구축 비용은 영화 수에 대략 선형이다
+(모든 특징이 상한 이하인 작은 카탈로그에서는 전체 쌍을 직접 계산한 결과와 같음)
+조회는 미리 계산된 (영화 수 x k) 배열의 한 행을 읽는 O(k), 그래프의 k 보다 많이 요청하면 그 영화와
+모든 영화의 유사도를 특징 목록으로 직접 계산 (exact_neighbors)
+구축한 그래프는 카탈로그 스냅샷 옆 (dataset/.snapshot/<이름>.neighbors/) 에 .npy 로 저장해 다음 실행부터 메모리 매핑
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from catalog_snapshot import default_snapshot_dir
+from search_index import EMPTY_IDS, PERSON_ROLE_COLUMNS, csr_codes, normalize_name
+from vector_search import TfidfIndex
+
+# 특징 묶음별 가중치 (코사인 유사도 = 묶음별 코사인 유사도의 가중 평균)
+DEFAULT_FEATURE_WEIGHTS = {
+    'genre': 1.0,
+    'director': 1.0,
+    'cast': 1.0,
+    'overview': 1.0,
+}
+# 영화마다 저장할 이웃 수
+DEFAULT_NEIGHBORS = 20
+# 묶음 하나에서 동시에 만드는 특징 곱 수 상한 (메모리 사용량 제한)
+MAX_CHUNK_CELLS = 4_000_000
+# 이보다 많은 영화가 가진 특징은 후보 쌍을 만들지 않음 (후보 쌍의 유사도에는 더함)
+MAX_CANDIDATE_DF = 1000
+
+# 저장 형식 (형식이 바뀌면 올려서 이전 파일은 다시 구축)
+GRAPH_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+# 저장/로드하는 배열 (이웃 표 + exact_neighbors 에 필요한 특징 CSR)
+GRAPH_ARRAYS = ('neighbors', 'similarities', 'tie_rank', 'feature_offsets', 'feature_rows', 'feature_values',
+                'doc_offsets', 'doc_features', 'doc_values')
+
+
+def default_graph_dir(csv_path) -> str:
+    """dataset/imdb_top_1000.csv -> dataset/.snapshot/imdb_top_1000.neighbors"""
+    return default_snapshot_dir(csv_path) + '.neighbors'
+
+
+def _idf_block(keys: np.ndarray, rows: np.ndarray, num_docs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(특징 값, 행 번호) 쌍 -> (특징 번호, 행 번호, 영화마다 L2 정규화된 IDF 가중치)"""
+    codes, _ = pd.factorize(keys)
+    stride = max(num_docs, 1)
+    pairs = np.unique(codes.astype(np.int64) * stride + rows)
+    codes, rows = pairs // stride, pairs % stride
+    doc_freqs = np.bincount(codes)
+    values = np.log((1 + num_docs) / (1 + doc_freqs[codes])) + 1
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=num_docs))
+    return codes, rows, values / norms[rows]
+
+
+def feature_blocks(df: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """특징 묶음별 (특징 번호, 행 번호, 가중치) - 인물은 정규화한 이름 전체가 하나의 특징"""
+    num_docs = len(df)
+    genres = pd.Series(df['Genre_List'].to_numpy(dtype=object)).explode().dropna()
+    blocks = {'genre': _idf_block(genres.to_numpy(dtype=object), genres.index.to_numpy(dtype=np.int64), num_docs)}
+    for name, columns in (('director', ['Director']),
+                          ('cast', [c for c in PERSON_ROLE_COLUMNS if c != 'Director'])):
+        people = pd.concat([pd.Series(df[c].to_numpy(dtype=object)) for c in columns]).dropna().map(normalize_name)
+        people = people[people != '']
+        blocks[name] = _idf_block(people.to_numpy(dtype=object), people.index.to_numpy(dtype=np.int64), num_docs)
+    # 줄거리는 TF-IDF 색인과 같은 로그 TF x IDF (이미 영화마다 L2 정규화됨)
+    overview = TfidfIndex(df, {'Overview': 1.0})
+    blocks['overview'] = (csr_codes(overview.offsets), overview.doc_ids.astype(np.int64),
+                          overview.values.astype(np.float64))
+    return blocks
+
+
+class NeighborGraph:
+    """
+    영화별 상위 k 개 이웃 (행 번호, 코사인 유사도) - 유사도 순, 동점은 tie_rank (예: 평점 순위) 가 작은 쪽
+    이웃이 k 개보다 적으면 나머지 칸은 -1
+    """
+
+    def __init__(self, df: pd.DataFrame, k: int = DEFAULT_NEIGHBORS, tie_rank: Optional[np.ndarray] = None,
+                 feature_weights: Optional[Dict[str, float]] = None, max_chunk_cells: int = MAX_CHUNK_CELLS,
+                 max_candidate_df: Optional[int] = MAX_CANDIDATE_DF):
+        self.num_docs = len(df)
+        self.k = k
+        self.feature_weights = dict(feature_weights or DEFAULT_FEATURE_WEIGHTS)
+        self.tie_rank = np.arange(self.num_docs) if tie_rank is None else np.asarray(tie_rank)
+        self._build_vectors(feature_blocks(df))
+        self._split_common_features(max_candidate_df)
+        self.neighbors = np.full((self.num_docs, k), -1, dtype=np.int32)
+        self.similarities = np.zeros((self.num_docs, k), dtype=np.float32)
+        # 구축 통계: 펼친 특징 곱 수, 유사도를 계산한 후보 쌍 수 (영화 수에 선형인지 확인용)
+        self.build_stats = {'products': 0, 'candidate_pairs': 0, 'common_features': int(self.common.sum())}
+        for start, end in self._chunks(max_chunk_cells):
+            self._build_chunk(start, end)
+
+    def _build_vectors(self, blocks):
+        """묶음을 가중치의 제곱근을 곱해 이어 붙이고 다시 L2 정규화 -> 특징 기준 CSR 과 영화 기준 CSR"""
+        codes, rows, values = [], [], []
+        offset = 0
+        for name, weight in self.feature_weights.items():
+            block_codes, block_rows, block_values = blocks[name]
+            codes.append(block_codes + offset)
+            rows.append(block_rows)
+            values.append(block_values * np.sqrt(weight))
+            offset += int(block_codes.max(initial=-1)) + 1
+        codes, rows, values = np.concatenate(codes), np.concatenate(rows), np.concatenate(values)
+        norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=self.num_docs))
+        values = (values / np.maximum(norms[rows], 1e-12)).astype(np.float32)
+
+        by_feature = np.lexsort((rows, codes))
+        self.feature_offsets = np.zeros(offset + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=offset), out=self.feature_offsets[1:])
+        self.feature_rows = rows[by_feature].astype(np.int32)
+        self.feature_values = values[by_feature]
+
+        by_doc = np.lexsort((codes, rows))
+        self.doc_offsets = np.zeros(self.num_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_docs), out=self.doc_offsets[1:])
+        self.doc_features = codes[by_doc]
+        self.doc_values = values[by_doc]
+
+    def _split_common_features(self, max_candidate_df: Optional[int]):
+        """문서 빈도가 상한을 넘는 흔한 특징 표시 (후보 쌍을 만들지 않고 _common_scores 로 더함)"""
+        doc_freqs = np.diff(self.feature_offsets)
+        self.common = (doc_freqs > max_candidate_df if max_candidate_df is not None
+                       else np.zeros(len(doc_freqs), dtype=bool))
+        self.common_features = np.flatnonzero(self.common)
+
+    def _chunks(self, max_cells: int):
+        """
+        영화 [start, end) 구간들: 구간마다 (흔하지 않은 특징으로 펼친 곱 수 + 영화 수) 의 합이 max_cells 이하
+        (영화 하나가 상한을 넘으면 그 영화 혼자 한 구간)
+        """
+        posting_lengths = np.where(self.common, 0, np.diff(self.feature_offsets))
+        expansion = np.bincount(np.repeat(np.arange(self.num_docs), np.diff(self.doc_offsets)),
+                                weights=posting_lengths[self.doc_features], minlength=self.num_docs)
+        cost = np.cumsum(expansion + 1)
+        start = 0
+        while start < self.num_docs:
+            used = cost[start - 1] if start else 0
+            end = max(start + 1, int(np.searchsorted(cost, used + max_cells, side='right')))
+            yield start, end
+            start = end
+
+    def _build_chunk(self, start: int, end: int):
+        """
+        영화 [start, end) 의 상위 k 이웃
+        흔하지 않은 특징마다 그 특징을 가진 영화로 펼친 (영화, 후보) 쌍의 곱을 정렬 후 합산하고,
+        후보 쌍마다 흔한 특징의 곱을 더한 뒤, 영화별로 (유사도 내림차순, tie_rank) 앞의 k 개
+        """
+        num_docs, size = self.num_docs, end - start
+        k = min(self.k, num_docs - 1)
+        if k <= 0:
+            return
+        entries = np.arange(self.doc_offsets[start], self.doc_offsets[end])
+        local = np.repeat(np.arange(size, dtype=np.int64), np.diff(self.doc_offsets[start:end + 1]))
+        rare = ~self.common[self.doc_features[entries]]
+        entries, local = entries[rare], local[rare]
+        features = self.doc_features[entries]
+        # 특징마다 그 특징을 가진 모든 영화로 펼침
+        starts = self.feature_offsets[features]
+        lengths = self.feature_offsets[features + 1] - starts
+        ends = np.cumsum(lengths)
+        positions = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+        products = self.feature_values[positions] * np.repeat(self.doc_values[entries], lengths)
+        cells = np.repeat(local, lengths) * num_docs + self.feature_rows[positions]
+        # (영화, 후보) 쌍별 합: 정렬 후 같은 쌍끼리 더함 (밀집 행렬 없이 후보 수에 비례)
+        pairs, inverse = np.unique(cells, return_inverse=True)
+        scores = np.bincount(inverse, weights=products, minlength=len(pairs))
+        sources, candidates = pairs // num_docs, pairs % num_docs
+        keep = candidates != sources + start  # 자기 자신 제외
+        sources, candidates, scores = sources[keep], candidates[keep], scores[keep]
+        scores = scores + self._common_scores(start, end, sources, candidates)
+        self.build_stats['products'] += int(len(products))
+        self.build_stats['candidate_pairs'] += int(len(scores))
+
+        if not len(scores):
+            return
+        # 영화별 k 번째 유사도 이상인 후보만 남김: (영화, float32 유사도 비트 반전) 를 int64 키 하나로 정렬
+        # (음이 아닌 float32 의 비트는 값 순서와 같음, 동점은 모두 남겨 아래에서 tie_rank 로 정렬)
+        bits = scores.astype(np.float32).view(np.int32).astype(np.int64)
+        keys = sources << 31 | (np.int64(2 ** 31 - 1) - bits)
+        counts = np.bincount(sources, minlength=size)
+        group_starts = np.cumsum(counts) - counts
+        kth = np.sort(keys)[group_starts + np.minimum(counts, k) - 1]
+        survivors = keys <= kth[sources]
+        sources, candidates, scores = sources[survivors], candidates[survivors], scores[survivors]
+        # 영화별 (유사도 내림차순, tie_rank) 정렬 후 앞의 k 개
+        order = np.lexsort((self.tie_rank[candidates], -scores.astype(np.float32), sources))
+        sources, candidates, scores = sources[order], candidates[order], scores[order]
+        group_starts = np.searchsorted(sources, np.arange(size))
+        slots = np.arange(len(sources)) - group_starts[sources]
+        # 특징을 하나도 공유하지 않는 (유사도 0) 이웃은 -1 로 남김
+        kept = (slots < k) & (scores > 1e-6)
+        self.neighbors[start + sources[kept], slots[kept]] = candidates[kept]
+        self.similarities[start + sources[kept], slots[kept]] = scores[kept]
+
+    def _common_scores(self, start: int, end: int, sources: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """
+        (영화 - start, 후보) 쌍마다 두 영화가 함께 가진 흔한 특징의 곱의 합 (sources 는 정렬되어 있어야 함)
+        흔한 특징은 적으므로 특징마다 전체 영화의 가중치를 밀집 배열에 펼쳐 두고, 그 특징을 가진 영화의 쌍만 조회
+        """
+        scores = np.zeros(len(sources))
+        group_starts = np.searchsorted(sources, np.arange(end - start + 1))
+        column = np.zeros(self.num_docs)
+        for feature in self.common_features:
+            postings = slice(self.feature_offsets[feature], self.feature_offsets[feature + 1])
+            rows, values = self.feature_rows[postings], self.feature_values[postings]
+            inside = slice(np.searchsorted(rows, start), np.searchsorted(rows, end))
+            local, local_values = rows[inside] - start, values[inside]
+            lengths = group_starts[local + 1] - group_starts[local]
+            if not lengths.sum():
+                continue
+            ends = np.cumsum(lengths)
+            pairs = np.repeat(group_starts[local] - (ends - lengths), lengths) + np.arange(ends[-1])
+            column[rows] = values
+            scores[pairs] += column[candidates[pairs]] * np.repeat(local_values, lengths)
+            column[rows] = 0
+        return scores
+
+    def save(self, directory: str, content_hash: str) -> None:
+        """임시 디렉토리에 쓴 뒤 교체 (중간 상태가 읽히지 않음)"""
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.building-', dir=parent)
+        try:
+            for name in GRAPH_ARRAYS:
+                np.save(os.path.join(staging, f'{name}.npy'), np.asarray(getattr(self, name)))
+            manifest = {'version': GRAPH_VERSION, 'content_hash': content_hash, 'num_docs': self.num_docs,
+                        'k': self.k, 'feature_weights': self.feature_weights, 'build_stats': self.build_stats}
+            with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory: str, content_hash: str,
+             feature_weights: Optional[Dict[str, float]] = None) -> 'NeighborGraph':
+        """
+        저장된 그래프 (배열은 읽기 전용 메모리 매핑)
+        없거나 형식/카탈로그 내용 해시/특징 가중치가 다르면 ValueError
+        """
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != GRAPH_VERSION or manifest.get('content_hash') != content_hash:
+                raise ValueError("이웃 그래프가 현재 카탈로그와 다릅니다")
+            if manifest['feature_weights'] != dict(feature_weights or DEFAULT_FEATURE_WEIGHTS):
+                raise ValueError("이웃 그래프의 특징 가중치가 다릅니다")
+            arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in GRAPH_ARRAYS}
+        except (OSError, KeyError) as e:
+            raise ValueError(f"이웃 그래프를 읽을 수 없습니다: {e}") from e
+        if arrays['neighbors'].shape != (manifest['num_docs'], manifest['k']):
+            raise ValueError("이웃 그래프가 손상되었습니다")
+        graph = cls.__new__(cls)
+        graph.num_docs, graph.k = manifest['num_docs'], manifest['k']
+        graph.feature_weights = manifest['feature_weights']
+        graph.build_stats = manifest['build_stats']
+        for name, array in arrays.items():
+            setattr(graph, name, array)
+        return graph
+
+    def neighbors_of(self, row_id: int, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        영화 하나의 이웃 (행 번호, 유사도) 최대 k 개 - 미리 계산된 행을 그대로 읽음
+        k 가 그래프의 k 보다 크면 exact_neighbors 로 직접 계산
+        """
+        if not 0 <= row_id < self.num_docs:
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        if k is not None and k > self.k:
+            return self.exact_neighbors(row_id, k)
+        ids = self.neighbors[row_id, :k]
+        present = ids >= 0
+        return ids[present], self.similarities[row_id, :k][present]
+
+    def exact_neighbors(self, row_id: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        영화 하나와 모든 영화의 유사도를 직접 계산한 이웃 (행 번호, 유사도) 최대 k 개 (순서는 그래프와 같음)
+        그 영화의 특징마다 특징 목록 전체를 훑으므로 흔한 특징이 있으면 카탈로그 크기에 비례
+        """
+        entries = slice(self.doc_offsets[row_id], self.doc_offsets[row_id + 1])
+        features, values = self.doc_features[entries], self.doc_values[entries]
+        starts = self.feature_offsets[features]
+        lengths = self.feature_offsets[features + 1] - starts
+        ends = np.cumsum(lengths)
+        positions = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+        scores = np.bincount(self.feature_rows[positions], minlength=self.num_docs,
+                             weights=self.feature_values[positions] * np.repeat(values, lengths))
+        scores[row_id] = 0
+        candidates = np.flatnonzero(scores > 1e-6)
+        scores = scores[candidates].astype(np.float32)
+        order = np.lexsort((self.tie_rank[candidates], -scores))[:k]
+        return candidates[order].astype(np.int32), scores[order]
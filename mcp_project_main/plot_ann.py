@@ -0,0 +1,432 @@
+"""
+줄거리 벡터 근사 최근접 이웃 (ANN) 색인 - IVF (역파일) 방식, numpy 만 사용 (CPU)
+모호한 묘사 검색의 TF-IDF 행렬을 무작위 절단 SVD (잠재 의미 분석) 로 고정 차원 밀집 벡터에 투영하고,
+구면 k-평균 중심으로 벡터를 나눈 목록 중 쿼리와 가까운 nprobe 개 목록에서 후보 rerank 개를 고른 뒤,
+후보만 정확한 TF-IDF 코사인으로 다시 점수화한다 (잠재 공간 유사도만으로는 정확 검색 상위 10개의 절반도 못 찾음)
+정확도 기준은 항상 정확한 TF-IDF 검색 (TfidfIndex.search) 대비 recall@10 - 구축 시 표본 묘사 쿼리로
+ANN_RECALL_TARGET 을 넘는 가장 작은 nprobe 를 고르고, 넘지 못하면 자동 전환하지 않는다 (recall 은 measured)
+색인은 디렉토리 하나의 .npy 파일들로 저장하고 메모리 매핑으로 읽는다 (카탈로그 내용 해시가 다르면 다시 구축)
+
+벤치마크: python plot_ann.py [csv 경로] [--nprobe 1 4 16 ...] [--rerank 200]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from catalog_snapshot import default_snapshot_dir
+from search_index import EMPTY_IDS, csr_codes, tokenize
+from vector_search import TfidfIndex
+
+INDEX_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+# 밀집 벡터 차원, 무작위 SVD 의 추가 표본 열 수 / 거듭제곱 반복 횟수
+DEFAULT_DIMS = 128
+SVD_OVERSAMPLE = 16
+SVD_POWER_ITERATIONS = 2
+# 목록 수 = LISTS_PER_SQRT x sqrt(벡터 수), 기본 nprobe
+LISTS_PER_SQRT = 2
+DEFAULT_NPROBE = 16
+# k-평균 학습: 목록당 표본 벡터 수, 반복 횟수
+TRAIN_POINTS_PER_LIST = 32
+TRAIN_ITERATIONS = 10
+# 묶음 하나에서 동시에 만드는 (벡터 x 차원 또는 중심) 칸 수 상한 (메모리 사용량 제한)
+MAX_CHUNK_CELLS = 4_000_000
+# 정확한 TF-IDF 코사인으로 다시 점수화할 IVF 후보 수 (k 보다 작으면 k)
+DEFAULT_RERANK = 200
+# 카탈로그가 이 편수 이상이고 측정한 recall@10 이 목표 이상이면 묘사 검색에 ANN 색인 사용
+# (작은 카탈로그는 정확한 TF-IDF 검색이 더 빠름)
+ANN_MIN_ROWS = int(os.environ.get('MOVIE_ANN_MIN_ROWS', '100000'))
+ANN_RECALL_TARGET = float(os.environ.get('MOVIE_ANN_RECALL_TARGET', '0.9'))
+# recall 측정: 표본 묘사 쿼리 수, 상위 몇 개를 비교하는지
+CALIBRATION_QUERIES = 100
+RECALL_K = 10
+
+
+def default_index_dir(csv_path) -> str:
+    """dataset/imdb_top_1000.csv -> dataset/.snapshot/imdb_top_1000.plot_ivf"""
+    return default_snapshot_dir(csv_path) + '.plot_ivf'
+
+
+def description_queries(texts, count: int = CALIBRATION_QUERIES, seed: int = 0) -> List[str]:
+    """recall 측정용 묘사 쿼리: 무작위 줄거리에서 단어를 1/3 만 남긴 문장 (흐릿하게 기억한 묘사 흉내)"""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for row in rng.permutation(len(texts)):
+        words = tokenize(texts[row]) if isinstance(texts[row], str) else []
+        if len(words) < 3:
+            continue
+        kept = np.sort(rng.choice(len(words), max(3, len(words) // 3), replace=False))
+        queries.append(' '.join(words[i] for i in kept))
+        if len(queries) == count:
+            break
+    return queries
+
+
+def _csr_matmul(offsets: np.ndarray, columns: np.ndarray, values: np.ndarray, dense: np.ndarray,
+                max_chunk_cells: int = MAX_CHUNK_CELLS) -> np.ndarray:
+    """희소 행렬 (CSR: 행 오프셋, 열 번호, 값) x 밀집 행렬 - 행 묶음마다 곱을 만들어 행별로 합산"""
+    num_rows, width = len(offsets) - 1, dense.shape[1]
+    result = np.zeros((num_rows, width), dtype=np.float32)
+    row_nnz = np.diff(offsets)
+    cost = np.cumsum(np.maximum(row_nnz, 1) * width)
+    start = 0
+    while start < num_rows:
+        used = cost[start - 1] if start else 0
+        end = max(start + 1, int(np.searchsorted(cost, used + max_chunk_cells, side='right')))
+        entries = slice(offsets[start], offsets[end])
+        if entries.stop > entries.start:
+            products = values[entries, None] * dense[columns[entries]]
+            present = np.flatnonzero(row_nnz[start:end]) + start
+            result[present] = np.add.reduceat(products, offsets[present] - offsets[start], axis=0)
+        start = end
+    return result
+
+
+def lsa_components(tfidf: TfidfIndex, dims: int = DEFAULT_DIMS, oversample: int = SVD_OVERSAMPLE,
+                   power_iterations: int = SVD_POWER_ITERATIONS, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (단어 x dims 투영 행렬, 문서 벡터 (문서 수 x dims, L2 정규화, 단어가 없는 문서는 0 벡터))
+    문서 x 단어 TF-IDF 행렬의 무작위 절단 SVD (잠재 의미 분석) - 희소 행렬 곱 몇 번으로 상위 특이 벡터를 구함
+    """
+    codes = csr_codes(tfidf.offsets)
+    by_doc = np.argsort(tfidf.doc_ids, kind='stable')
+    doc_offsets = np.zeros(tfidf.num_docs + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tfidf.doc_ids, minlength=tfidf.num_docs), out=doc_offsets[1:])
+    doc_codes, doc_values = codes[by_doc], tfidf.values[by_doc]
+
+    def times(dense):       # 문서 x 단어 행렬 곱
+        return _csr_matmul(doc_offsets, doc_codes, doc_values, dense)
+
+    def transposed(dense):  # 단어 x 문서 행렬 곱
+        return _csr_matmul(tfidf.offsets, tfidf.doc_ids, tfidf.values, dense)
+
+    num_terms = len(tfidf.offsets) - 1
+    width = max(1, min(dims + oversample, num_terms, tfidf.num_docs))
+    sample = times(np.random.default_rng(seed).standard_normal((num_terms, width)).astype(np.float32))
+    for _ in range(power_iterations):
+        sample = times(np.linalg.qr(transposed(np.linalg.qr(sample)[0]))[0])
+    basis = np.linalg.qr(sample)[0]
+    # 작은 행렬 (basis^T A) 의 SVD 에서 단어 쪽 특이 벡터
+    _, _, right = np.linalg.svd(transposed(basis).T, full_matrices=False)
+    components = np.zeros((num_terms, dims), dtype=np.float32)
+    components[:, :min(dims, len(right))] = right[:dims].T
+    vectors = times(components)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return components, vectors
+
+
+def _chunk_rows(num_rows: int, width: int, max_cells: int) -> Iterable[Tuple[int, int]]:
+    step = max(1, max_cells // max(width, 1))
+    for start in range(0, num_rows, step):
+        yield start, min(start + step, num_rows)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, max_cells: int = MAX_CHUNK_CELLS) -> np.ndarray:
+    """벡터마다 내적이 가장 큰 중심 번호"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start, end in _chunk_rows(len(vectors), len(centroids), max_cells):
+        labels[start:end] = np.argmax(np.asarray(vectors[start:end]) @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = TRAIN_ITERATIONS,
+                    points_per_list: int = TRAIN_POINTS_PER_LIST, seed: int = 0) -> np.ndarray:
+    """구면 k-평균 (표본 위에서 학습, 중심은 L2 정규화, 빈 목록은 임의 표본으로 다시 시작)"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * points_per_list)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        counts = np.bincount(labels, minlength=nlist)
+        order = np.argsort(labels, kind='stable')
+        starts = np.cumsum(counts) - counts
+        sums = np.zeros_like(centroids)
+        sums[counts > 0] = np.add.reduceat(sample[order], starts[counts > 0], axis=0)
+        empty = np.flatnonzero(counts == 0)
+        sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+class IvfIndex:
+    """
+    중심 (nlist x dims) + 목록 순서로 다시 늘어놓은 벡터 (CSR: list_offsets, 원래 행 번호 list_ids)
+    목록 하나의 벡터는 연속된 구간이라 메모리 매핑에서도 순차로 읽는다
+    """
+
+    def __init__(self, centroids: np.ndarray, list_offsets: np.ndarray, list_ids: np.ndarray, vectors: np.ndarray,
+                 nprobe: int = DEFAULT_NPROBE):
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+        self.vectors = vectors
+        self.nprobe = nprobe
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, nlist: Optional[int] = None, nprobe: int = DEFAULT_NPROBE,
+              seed: int = 0) -> 'IvfIndex':
+        num_vectors = len(vectors)
+        if nlist is None:
+            nlist = int(round(LISTS_PER_SQRT * np.sqrt(num_vectors)))
+        nlist = max(1, min(nlist, num_vectors))
+        centroids = train_centroids(vectors, nlist, seed=seed) if num_vectors else np.zeros((1, vectors.shape[1]),
+                                                                                              dtype=np.float32)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=len(centroids)), out=list_offsets[1:])
+        return cls(centroids, list_offsets, order.astype(np.int32), np.asarray(vectors, dtype=np.float32)[order],
+                   nprobe)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self):
+        return len(self.list_ids)
+
+    def _top_k(self, ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """점수 상위 k (점수 내림차순, 동점은 행 번호 순)"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return ids[top].astype(np.int32), scores[top].astype(np.float32)
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """쿼리와 가까운 nprobe 개 목록의 벡터만 점수화한 상위 k (행 번호, 내적)"""
+        nprobe = max(1, min(nprobe or self.nprobe, self.nlist))
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe] if nprobe < self.nlist else np.arange(self.nlist)
+        starts, ends = self.list_offsets[probe], self.list_offsets[probe + 1]
+        ids, scores = [], []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if end > start:
+                ids.append(self.list_ids[start:end])
+                scores.append(np.asarray(self.vectors[start:end]) @ query)
+        if not ids:
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        return self._top_k(np.concatenate(ids), np.concatenate(scores), k)
+
+    def exact_search(self, query: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """모든 벡터를 점수화한 상위 k (같은 잠재 공간 안의 기준, 묘사 검색의 정확도 기준은 TfidfIndex.search)"""
+        scores = np.concatenate([np.asarray(self.vectors[start:end]) @ query
+                                 for start, end in _chunk_rows(len(self), 1, MAX_CHUNK_CELLS)] or
+                                [np.empty(0, dtype=np.float32)])
+        return self._top_k(self.list_ids, scores, k)
+
+    def save(self, directory: str, meta: Optional[Dict] = None, extra: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """임시 디렉토리에 쓴 뒤 교체 (중간 상태가 읽히지 않음), extra: 함께 저장할 배열 (이름 -> 배열)"""
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.building-', dir=parent)
+        try:
+            arrays = {name: getattr(self, name) for name in ('centroids', 'list_offsets', 'list_ids', 'vectors')}
+            for name, array in {**arrays, **(extra or {})}.items():
+                np.save(os.path.join(staging, f'{name}.npy'), np.asarray(array))
+            manifest = {'version': INDEX_VERSION, 'num_vectors': len(self), 'nlist': self.nlist,
+                        'dims': int(self.centroids.shape[1]), 'nprobe': self.nprobe, **(meta or {})}
+            with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory: str) -> Tuple['IvfIndex', Dict]:
+        """(색인, manifest) - 벡터/행 번호는 읽기 전용 메모리 매핑 (없거나 형식이 다르면 ValueError)"""
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"ANN 색인을 읽을 수 없습니다: {e}") from e
+        if manifest.get('version') != INDEX_VERSION:
+            raise ValueError(f"지원하지 않는 ANN 색인 버전 {manifest.get('version')}")
+
+        def mapped(name):
+            return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+
+        index = cls(np.asarray(mapped('centroids')), np.asarray(mapped('list_offsets')), mapped('list_ids'),
+                    mapped('vectors'), manifest['nprobe'])
+        return index, manifest
+
+
+class PlotAnnIndex:
+    """
+    모호한 묘사 -> TF-IDF 쿼리 벡터 -> LSA 투영 -> IVF 후보 -> 정확한 TF-IDF 코사인으로 다시 점수화
+    투영 행렬은 단어 문자열로 찾으므로 (단어 번호가 다른) 재로드된 TfidfIndex 와도 같이 쓸 수 있다
+    recall: 기본 nprobe 에서 정확한 TF-IDF 검색 대비 recall@10 (calibrate 로 측정, 측정 전에는 None)
+    """
+
+    def __init__(self, tfidf: TfidfIndex, ivf: IvfIndex, components: np.ndarray, terms,
+                 rerank: int = DEFAULT_RERANK, recall: Optional[float] = None):
+        self.tfidf = tfidf
+        self.ivf = ivf
+        self.components = components
+        self.term_rows = {term: row for row, term in enumerate(terms)}
+        self.rerank = rerank
+        self.recall = recall
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def meets_target(self) -> bool:
+        """측정한 recall 이 ANN_RECALL_TARGET 이상인지 (자동 전환 조건)"""
+        return self.recall is not None and self.recall >= ANN_RECALL_TARGET
+
+    @classmethod
+    def build(cls, tfidf: TfidfIndex, dims: int = DEFAULT_DIMS, nlist: Optional[int] = None,
+              nprobe: int = DEFAULT_NPROBE, rerank: int = DEFAULT_RERANK,
+              queries: Optional[List[str]] = None) -> 'PlotAnnIndex':
+        """queries 를 주면 구축 후 calibrate (기본 nprobe 를 recall 목표에 맞춤)"""
+        components, vectors = lsa_components(tfidf, dims)
+        index = cls(tfidf, IvfIndex.build(vectors, nlist, nprobe), components, tfidf.terms(), rerank)
+        if queries:
+            index.calibrate(queries)
+        return index
+
+    def measure_recall(self, queries: List[str], nprobe: Optional[int] = None, k: int = RECALL_K,
+                       expected: Optional[List[np.ndarray]] = None) -> float:
+        """정확한 TF-IDF 검색 상위 k 중 찾은 비율의 평균 (정답이 없는 쿼리는 제외), expected: 미리 구한 정답"""
+        expected = expected if expected is not None else [self.tfidf.search(query, k)[0] for query in queries]
+        recalls = [len(np.intersect1d(self.search(query, k, nprobe)[0], ids)) / len(ids)
+                   for query, ids in zip(queries, expected) if len(ids)]
+        return float(np.mean(recalls)) if recalls else 1.0
+
+    def calibrate(self, queries: List[str], target: Optional[float] = None, k: int = RECALL_K) -> float:
+        """
+        nprobe 를 1 부터 두 배씩 늘려 recall@k 가 target 이상인 가장 작은 값을 기본값으로 (못 넘으면 모든 목록)
+        측정한 recall 을 self.recall 에 기록하고 반환
+        """
+        target = ANN_RECALL_TARGET if target is None else target
+        expected = [self.tfidf.search(query, k)[0] for query in queries]
+        nprobe = 1
+        while True:
+            recall = self.measure_recall(queries, nprobe, k, expected)
+            if recall >= target or nprobe >= self.ivf.nlist:
+                break
+            nprobe = min(nprobe * 2, self.ivf.nlist)
+        self.ivf.nprobe, self.recall = nprobe, recall
+        return recall
+
+    def save(self, directory: str, content_hash: str) -> None:
+        terms = [None] * len(self.term_rows)
+        for term, row in self.term_rows.items():
+            terms[row] = term
+        # 단어는 줄바꿈으로 이은 UTF-8 바이트 하나로 저장 (토큰은 \w+ 라 줄바꿈이 없음)
+        self.ivf.save(directory, {'content_hash': content_hash, 'num_terms': len(terms), 'rerank': self.rerank,
+                                  'recall': self.recall},
+                      {'components': self.components,
+                       'terms': np.frombuffer('\n'.join(terms).encode('utf-8'), dtype=np.uint8)})
+
+    @classmethod
+    def load(cls, tfidf: TfidfIndex, directory: str, content_hash: str) -> 'PlotAnnIndex':
+        """저장된 색인 (카탈로그 내용 해시가 다르면 ValueError)"""
+        ivf, manifest = IvfIndex.load(directory)
+        if manifest.get('content_hash') != content_hash or manifest['num_vectors'] != tfidf.num_docs:
+            raise ValueError("ANN 색인이 현재 카탈로그와 다릅니다")
+        try:
+            components = np.load(os.path.join(directory, 'components.npy'), mmap_mode='r')
+            text = np.load(os.path.join(directory, 'terms.npy')).tobytes().decode('utf-8')
+        except (OSError, ValueError) as e:
+            raise ValueError(f"ANN 색인을 읽을 수 없습니다: {e}") from e
+        terms = text.split('\n') if manifest['num_terms'] else []
+        if len(terms) != manifest['num_terms'] or len(terms) != len(components):
+            raise ValueError("ANN 색인의 단어 목록이 손상되었습니다")
+        return cls(tfidf, ivf, components, terms, manifest['rerank'], manifest['recall'])
+
+    def query_vector(self, text) -> np.ndarray:
+        """쿼리 텍스트 -> L2 정규화된 밀집 벡터 (투영할 단어가 없으면 0 벡터)"""
+        terms, _, weights = self.tfidf.query_terms(text)
+        rows = [self.term_rows.get(term, -1) for term in terms]
+        known = np.array([row >= 0 for row in rows], dtype=bool)
+        vector = np.zeros(self.dims, dtype=np.float32)
+        if known.any():
+            vector = weights[known] @ np.asarray(self.components[np.array(rows)[known]])
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).astype(np.float32)
+
+    def search(self, text, k: int = 10, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        유사도 상위 k (행 번호, TF-IDF 코사인 유사도 - 정확 검색과 같은 값), 유사도 0 이하는 제외
+        IVF 에서 잠재 공간 후보 max(k, rerank) 개를 고른 뒤 그 후보만 정확하게 점수화 (동점은 행 번호 순)
+        """
+        query = self.query_vector(text)
+        if not query.any():
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        candidates, _ = self.ivf.search(query, max(k, self.rerank), nprobe)
+        scores = self.tfidf.scores_of(text, candidates)
+        top = np.lexsort((candidates, -scores))[:k]
+        top = top[scores[top] > 0]
+        return candidates[top], scores[top]
+
+
+def benchmark(index: PlotAnnIndex, queries: List[str], k: int = RECALL_K,
+              nprobes: Iterable[int] = (1, 2, 4, 8, 16, 32, 64)) -> List[Dict]:
+    """
+    nprobe 별 정확한 TF-IDF 검색 (TfidfIndex.search) 대비 recall@k 와 쿼리당 평균 지연 시간
+    마지막 항목은 정확한 TF-IDF 검색 자체
+    """
+    start = time.perf_counter()
+    expected = [index.tfidf.search(query, k)[0] for query in queries]
+    exact_ms = (time.perf_counter() - start) / max(len(queries), 1) * 1000
+    report = []
+    for nprobe in sorted({min(nprobe, index.ivf.nlist) for nprobe in nprobes}):
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, k, nprobe)
+        elapsed = (time.perf_counter() - start) / max(len(queries), 1) * 1000
+        recall = index.measure_recall(queries, nprobe, k, expected)
+        report.append({'nprobe': nprobe, f'recall@{k}': round(recall, 4), 'ms': round(elapsed, 3)})
+    report.append({'nprobe': 'exact', f'recall@{k}': 1.0, 'ms': round(exact_ms, 3)})
+    return report
+
+
+def synthetic_vectors(count: int, dims: int = DEFAULT_DIMS, clusters: int = 1000, seed: int = 0) -> np.ndarray:
+    """군집이 있는 L2 정규화 벡터 (줄거리 벡터처럼 주제별로 모인 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + rng.standard_normal((count, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="줄거리 ANN 색인의 정확한 TF-IDF 검색 대비 recall@k / 지연 시간 벤치마크")
+    parser.add_argument('csv_path', nargs='?', default='dataset/imdb_top_1000.csv')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=RECALL_K)
+    parser.add_argument('--dims', type=int, default=DEFAULT_DIMS)
+    parser.add_argument('--nlist', type=int)
+    parser.add_argument('--rerank', type=int, default=DEFAULT_RERANK)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args(argv)
+
+    from catalog_registry import get_catalog
+    catalog = get_catalog(args.csv_path)
+    start = time.perf_counter()
+    index = PlotAnnIndex.build(catalog.tfidf, args.dims, args.nlist, rerank=args.rerank)
+    print(f"✅ ANN 색인 구축: {args.csv_path} ({len(catalog.df):,}편), {index.dims}차원, 목록 {index.ivf.nlist}개, "
+          f"후보 {index.rerank}개 재점수화 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    # 구축 시 calibrate 에 쓰는 표본과 겹치지 않게 다른 시드
+    queries = description_queries(catalog.df['Overview'].to_numpy(dtype=object), args.queries, seed=1)
+    for row in benchmark(index, queries, args.k, args.nprobe):
+        print(f"  nprobe={row['nprobe']:>5}  recall@{args.k}={row[f'recall@{args.k}']:.3f}  {row['ms']:.2f}ms/쿼리")
+    print(f"  자동 전환 목표: recall@{RECALL_K} >= {ANN_RECALL_TARGET}")
+
+
+if __name__ == "__main__":
+    main()
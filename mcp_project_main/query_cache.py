@@ -0,0 +1,110 @@
+"""
+검색 결과 캐시 (LRU + TTL)
+같은 검색 (놀란 감독, 톰 행크스, 감옥 탈출 ...) 이 반복되므로 정규화된 검색 파라미터를 키로
+결과를 보관한다. 카탈로그 내용 해시가 바뀌면 이전 결과는 모두 버린다
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('MOVIE_QUERY_CACHE_SIZE', '512'))
+DEFAULT_TTL_SECONDS = float(os.environ.get('MOVIE_QUERY_CACHE_TTL', '600'))
+
+
+class QueryCache:
+    """스레드 안전 LRU 캐시: 최대 항목 수를 넘으면 가장 오래 안 쓴 항목부터, TTL 이 지나면 조회 시 제거"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.content_hash = None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # 키 -> (만료 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def bind(self, content_hash: str) -> None:
+        """카탈로그 내용 해시 확인: 이전과 다르면 저장된 결과를 모두 무효화"""
+        if content_hash == self.content_hash:
+            return
+        with self._lock:
+            if content_hash != self.content_hash:
+                if self.content_hash is not None:
+                    self.invalidations += len(self._entries)
+                self._entries.clear()
+                self.content_hash = content_hash
+
+    def get(self, key):
+        """저장된 값 (없거나 만료됐으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """히트/미스/축출 카운터 (확인용)"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+_caches: Dict[str, QueryCache] = {}
+_lock = threading.Lock()
+
+
+def get_query_cache(csv_path) -> QueryCache:
+    """카탈로그 경로별 공용 캐시 (같은 프로세스의 모든 MovieDataManager 핸들이 공유)"""
+    key = os.path.realpath(csv_path)
+    cache = _caches.get(key)
+    if cache is None:
+        with _lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = QueryCache()
+    return cache
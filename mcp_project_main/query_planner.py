@@ -0,0 +1,293 @@
+"""
+검색 조건 실행 순서를 정하는 쿼리 플래너
+색인 통계(키워드 매칭 값 수, 장르 빈도, 평점 히스토그램)로 각 조건의 선택도와 비용을 추정해
+가장 싸고 선택적인 조건부터 평가하고, 나머지 조건은 남은 후보에만 적용한다
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from search_index import BitmapIndex, PersonIndex, RatingOrder, contains_sorted, normalize_key
+from substring_index import SubstringIndex
+
+# 행 하나를 검사하는 상대 비용
+COST_BITMAP = 1.0        # 비트 하나 읽기
+COST_POSTINGS = 2.0      # 정렬된 포스팅에서 이진 탐색
+
+
+class CatalogStatistics:
+    """플래너가 사용하는 카탈로그 통계"""
+
+    def __init__(self, num_rows: int, bitmaps: Dict[str, BitmapIndex], rating_order: RatingOrder):
+        self.num_rows = num_rows
+        # 키워드 조건의 매칭 행 수는 KeywordPredicate 가 부분 문자열 색인에서 추정 (통계는 그 색인을 구축시키지 않음)
+        self.bitmaps = bitmaps
+        self.rating_order = rating_order
+        # 범주별 빈도 (장르, 관람등급, 연대)
+        self.frequencies = {
+            name: {key: index.postings.count(key) for key in index.keys()}
+            for name, index in bitmaps.items()
+        }
+        # 0.1 단위 평점 히스토그램 (평점 구간 추정은 평점순 순열의 이진 탐색으로 정확히 계산)
+        ratings = rating_order.sorted_ratings
+        self.rating_bins = np.round(np.arange(0.0, 10.2, 0.1), 1)
+        self.rating_histogram, _ = np.histogram(ratings, bins=self.rating_bins)
+
+    def frequency(self, name: str, key) -> int:
+        return self.frequencies[name].get(normalize_key(key), 0)
+
+    def summary(self) -> Dict:
+        """통계 요약 (확인용)"""
+        return {
+            "num_rows": self.num_rows,
+            "frequencies": {name: len(freq) for name, freq in self.frequencies.items()},
+            "rating_histogram": {
+                float(self.rating_bins[i]): int(count)
+                for i, count in enumerate(self.rating_histogram) if count
+            },
+        }
+
+
+class Predicate:
+    """검색 조건 하나: 매칭 행 수 추정, 후보 생성, 후보 검사"""
+
+    name = "predicate"
+    cost_per_row = COST_POSTINGS
+    can_generate = True
+
+    def __init__(self, description: str):
+        self.description = description
+        self.estimate = 0
+
+    def generate(self) -> np.ndarray:
+        """조건을 만족하는 행 번호 전체 (정렬됨)"""
+        raise NotImplementedError
+
+    def test(self, ids: np.ndarray) -> np.ndarray:
+        """후보 행 번호 각각이 조건을 만족하는지 (bool)"""
+        raise NotImplementedError
+
+
+class KeywordPredicate(Predicate):
+    """
+    키워드 OR 조건 (부분 문자열 색인)
+    매칭 행 전체는 처음 필요할 때 만들고, 그 전까지 검사한 후보 수가 추정치보다 적으면 후보 행의 값만 직접 검사
+    (대화로 후보가 좁혀진 검색은 키워드가 흔해도 후보 수에 비례하는 비용)
+    """
+
+    name = "keywords"
+
+    def __init__(self, substring_index: SubstringIndex, keywords: List[str]):
+        super().__init__(f"키워드 {list(keywords)}")
+        self.substring_index = substring_index
+        self.keywords = [str(k) for k in keywords]
+        self.estimate = substring_index.estimate_any(self.keywords)
+        self.rows = None
+        self.tested = 0
+
+    def generate(self):
+        if self.rows is None:
+            self.rows = self.substring_index.match_any(self.keywords)
+        return self.rows
+
+    def test(self, ids):
+        if self.rows is None and self.tested + len(ids) <= self.estimate:
+            self.tested += len(ids)
+            return self.substring_index.test_any(self.keywords, ids)
+        return contains_sorted(self.generate(), ids)
+
+
+class RowSetPredicate(Predicate):
+    """이미 정해진 행 번호 집합 안으로 제한 (대화 세션의 후보 영화 집합 등)"""
+
+    name = "within"
+
+    def __init__(self, ids: np.ndarray):
+        super().__init__(f"후보 집합 ({len(ids)}행)")
+        self.rows = ids
+        self.estimate = len(ids)
+
+    def generate(self):
+        return self.rows
+
+    def test(self, ids):
+        return contains_sorted(self.rows, ids)
+
+
+class PersonPredicate(Predicate):
+    """감독/배우 조건 (인물 색인) - 이름 조회가 싸므로 매칭 행 수를 정확히 계산"""
+
+    def __init__(self, name: str, person_index: PersonIndex, query: str, roles):
+        super().__init__(f"{name} '{query}'")
+        self.name = name
+        self.rows = person_index.match_rows(query, roles=roles)
+        self.estimate = len(self.rows)
+
+    def generate(self):
+        return self.rows
+
+    def test(self, ids):
+        return contains_sorted(self.rows, ids)
+
+
+class BitmapPredicate(Predicate):
+    """범주형 조건 (비트맵): mode='all' 이면 AND, 'any' 이면 OR"""
+
+    cost_per_row = COST_BITMAP
+
+    def __init__(self, name: str, index: BitmapIndex, keys, mode: str, stats: CatalogStatistics):
+        super().__init__(f"{name} {'&' if mode == 'all' else '|'} {list(keys)}")
+        self.name = name
+        self.index = index
+        self.keys = list(keys)
+        self.mode = mode
+        self.bitmaps = [index.get(key) for key in self.keys]
+        counts = [stats.frequency(name, key) for key in self.keys]
+        if mode == 'all':
+            # 독립 가정: 가장 드문 값의 빈도 x 나머지 값의 비율
+            fractions = [c / max(1, stats.num_rows) for c in counts]
+            self.estimate = int(min(counts) * np.prod(sorted(fractions)[1:])) if counts else 0
+        else:
+            self.estimate = min(sum(counts), stats.num_rows)
+
+    def generate(self):
+        if self.mode == 'all':
+            # 가장 드문 값의 포스팅을 후보로 쓰고 나머지 비트맵으로 검사
+            rarest = min(self.keys, key=lambda k: self.index.postings.count(normalize_key(k)))
+            ids = self.index.postings.get(normalize_key(rarest))
+            return ids[self.test(ids)]
+        return np.unique(np.concatenate([self.index.postings.get(normalize_key(k)) for k in self.keys]))
+
+    def test(self, ids):
+        bits = [BitmapIndex.test(bitmap, ids) for bitmap in self.bitmaps]
+        return np.logical_and.reduce(bits) if self.mode == 'all' else np.logical_or.reduce(bits)
+
+
+class RatingRangePredicate(Predicate):
+    """평점 구간 조건 - 평점순 순열에서 순위 구간 검사 (후보 생성에는 쓰지 않음)"""
+
+    name = "rating"
+    cost_per_row = COST_BITMAP
+    can_generate = False
+
+    def __init__(self, rating_order: RatingOrder, rating_range):
+        super().__init__(f"평점 순위 구간 {list(rating_range)}")
+        self.rating_order = rating_order
+        self.start, self.end = rating_range
+        self.estimate = self.end - self.start
+
+    def test(self, ids):
+        ranks = self.rating_order.rank[ids]
+        return (ranks >= self.start) & (ranks < self.end)
+
+
+def apply_filters(filters: List[Predicate], ids: np.ndarray) -> np.ndarray:
+    """조건을 순서대로 검사하되 앞 조건을 통과한 행만 다음 조건에 넘긴다 (bool 마스크 반환)"""
+    keep = np.ones(len(ids), dtype=bool)
+    for predicate in filters:
+        alive = np.flatnonzero(keep)
+        if not len(alive):
+            break
+        keep[alive] = predicate.test(ids[alive])
+    return keep
+
+
+class QueryPlan:
+    """선택된 실행 순서. explain() 으로 확인 가능"""
+
+    def __init__(self, strategy: str, driver: Optional[Predicate], filters: List[Predicate],
+                 rating_range, rating_order: RatingOrder, estimated_cost: Dict[str, float]):
+        self.strategy = strategy          # 'rating_walk' 또는 'candidates'
+        self.driver = driver              # 후보를 생성하는 조건 (candidates 전략)
+        self.filters = filters            # 후보에 차례로 적용할 검사 조건
+        self.rating_range = rating_range
+        self.rating_order = rating_order
+        self.estimated_cost = estimated_cost
+
+    @property
+    def steps(self) -> List[Dict]:
+        steps = []
+        if self.driver is not None:
+            steps.append({"step": "generate", "predicate": self.driver.description,
+                          "estimate": self.driver.estimate})
+        else:
+            start, end = self.rating_range
+            steps.append({"step": "rating_walk", "predicate": "평점순 순회", "estimate": end - start})
+        for predicate in self.filters:
+            steps.append({"step": "filter", "predicate": predicate.description,
+                          "estimate": predicate.estimate, "cost_per_row": predicate.cost_per_row})
+        return steps
+
+    def explain(self) -> str:
+        lines = [f"전략: {self.strategy} (예상 비용 {self.estimated_cost})"]
+        for i, step in enumerate(self.steps, 1):
+            lines.append(f"  {i}. {step['step']}: {step['predicate']} (예상 {step['estimate']}행)")
+        return "\n".join(lines)
+
+    def candidate_ids(self) -> np.ndarray:
+        """candidates 전략에서 모든 조건을 통과한 행 번호 (정렬됨)"""
+        ids = self.driver.generate()
+        return ids[apply_filters(self.filters, ids)]
+
+    def match_ids(self) -> np.ndarray:
+        """평점 구간을 포함한 모든 조건을 통과한 행 번호 전체 (정렬됨, 조기 종료 없음)"""
+        if self.strategy == 'rating_walk':
+            start, end = self.rating_range
+            ids = np.sort(self.rating_order.order[start:end])
+            return ids[apply_filters(self.filters, ids)]
+        return self.candidate_ids()
+
+    def execute(self, top_n: int) -> np.ndarray:
+        """상위 top_n 행 번호 (평점 내림차순)"""
+        start, end = self.rating_range
+        if self.strategy == 'rating_walk':
+            filters = self.filters
+            test = (lambda ids: apply_filters(filters, ids)) if filters else None
+            return self.rating_order.top_k(top_n, test=test, start=start, end=end)
+        return self.rating_order.top_k_of(self.candidate_ids(), top_n)
+
+
+class QueryPlanner:
+    """조건별 추정치로 실행 전략과 순서를 고른다"""
+
+    def __init__(self, stats: CatalogStatistics, rating_order: RatingOrder):
+        self.stats = stats
+        self.rating_order = rating_order
+
+    @staticmethod
+    def _filter_rank(predicate: Predicate, num_rows: int) -> float:
+        # 행당 비용 / 탈락 비율이 작은 조건부터 (싸고 선택적인 조건 우선)
+        selectivity = predicate.estimate / max(1, num_rows)
+        return predicate.cost_per_row / max(1e-6, 1.0 - selectivity)
+
+    def plan(self, predicates: List[Predicate], min_rating=None, max_rating=None, top_n: int = 10,
+             start_rank: int = 0) -> QueryPlan:
+        """start_rank: 평점순 순위 start_rank 부터 찾음 (다음 페이지는 이전 페이지 마지막 행의 순위 + 1)"""
+        num_rows = max(1, self.stats.num_rows)
+        start, end = self.rating_order.rating_range(min_rating, max_rating)
+        rating_range = (max(start, start_rank), max(start, start_rank, end))
+        range_size = rating_range[1] - rating_range[0]
+
+        # 평점순 순회 비용: top_n 을 채우기까지 훑을 행 수 x 행당 검사 비용
+        selectivity = np.prod([p.estimate / num_rows for p in predicates]) if predicates else 1.0
+        walk_rows = range_size if selectivity <= 0 else min(range_size, top_n / selectivity)
+        walk_cost = walk_rows * max(1.0, sum(p.cost_per_row for p in predicates))
+
+        # 후보 생성 비용: 가장 작은 후보 집합 생성 + 나머지 조건 검사
+        generators = [p for p in predicates if p.can_generate]
+        driver = min(generators, key=lambda p: p.estimate) if generators else None
+        candidate_cost = float('inf')
+        if driver is not None:
+            rest = [p for p in predicates if p is not driver]
+            candidate_cost = driver.estimate * (driver.cost_per_row + sum(p.cost_per_row for p in rest))
+
+        costs = {"rating_walk": round(float(walk_cost), 1), "candidates": round(float(candidate_cost), 1)}
+        if driver is None or walk_cost <= candidate_cost:
+            filters = sorted(predicates, key=lambda p: self._filter_rank(p, num_rows))
+            return QueryPlan('rating_walk', None, filters, rating_range, self.rating_order, costs)
+        rest = [p for p in predicates if p is not driver]
+        if range_size < self.stats.num_rows:
+            rest.append(RatingRangePredicate(self.rating_order, rating_range))
+        filters = sorted(rest, key=lambda p: self._filter_rank(p, num_rows))
+        return QueryPlan('candidates', driver, filters, rating_range, self.rating_order, costs)
@@ -13,7 +13,10 @@ import json
 import logging
 import asyncio
 from typing import Dict, List, Any, Optional
+from catalog_schema import MOVIE_SUMMARY_FIELDS, display_value, format_count, format_runtime, json_value, movie_record
 from movie_data_manager import MovieDataManager
+from neighbor_graph import DEFAULT_NEIGHBORS
+from session_candidates import CandidateSet
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +35,8 @@ class RealMCPMovieSearch:
         import time
         self.session_id = f"real-mcp-{time.time()}"
         self.request_id = 0
+        # 세션의 후보 영화 집합 (narrow_candidates 검색이 턴마다 좁힘)
+        self.candidates = CandidateSet(self.session_id)
         
         # MCP 도구 정의 (실제 MCP 표준 형식)
         self.tools = {
@@ -62,10 +67,38 @@ class RealMCPMovieSearch:
                             "type": "number",
                             "description": "Minimum IMDb rating"
                         },
+                        "certificate": {
+                            "type": "string",
+                            "description": "Certificate filter (e.g. PG-13, R, U)"
+                        },
+                        "decade": {
+                            "type": "string",
+                            "description": "Release decade filter (e.g. 1990s)"
+                        },
+                        "rank_by": {
+                            "type": "string",
+                            "enum": ["rating", "relevance"],
+                            "description": "Order by IMDb rating or by BM25 plot/title relevance to the keywords",
+                            "default": "rating"
+                        },
                         "max_results": {
                             "type": "integer",
                             "description": "Maximum number of results",
                             "default": 5
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "next_cursor from a previous search_movies result (fetches the next page, other filters are ignored)"
+                        },
+                        "include_facets": {
+                            "type": "boolean",
+                            "description": "Also return genre/decade/director/certificate/rating-bucket counts over all matches",
+                            "default": False
+                        },
+                        "narrow_candidates": {
+                            "type": "boolean",
+                            "description": "Search only within this session's candidate set from earlier turns and narrow it (widens again when the filters contradict it)",
+                            "default": False
                         }
                     }
                 }
@@ -83,6 +116,27 @@ class RealMCPMovieSearch:
                     },
                     "required": ["movie_title"]
                 }
+            },
+            "similar_movies": {
+                "name": "similar_movies",
+                "description": "Find movies similar to a given movie (genre, director, cast and plot), from a precomputed neighbor graph",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "movie_title": {
+                            "type": "string",
+                            "description": "Title of the reference movie (typos allowed)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": (f"Maximum number of similar movies (up to {DEFAULT_NEIGHBORS} are read from "
+                                            "the precomputed graph; more are computed against every movie, which is slower)"),
+                            "minimum": 1,
+                            "default": 5
+                        }
+                    },
+                    "required": ["movie_title"]
+                }
             }
         }
         
@@ -152,6 +206,8 @@ class RealMCPMovieSearch:
                 result = await self._execute_search_movies(arguments)
             elif tool_name == "get_movie_details":
                 result = await self._execute_get_movie_details(arguments)
+            elif tool_name == "similar_movies":
+                result = await self._execute_similar_movies(arguments)
             else:
                 raise ValueError(f"Unknown tool: {tool_name}")
             
@@ -192,17 +248,42 @@ class RealMCPMovieSearch:
             director = arguments.get("director")
             actor = arguments.get("actor")
             min_rating = arguments.get("min_rating")
+            certificate = arguments.get("certificate")
+            decade = arguments.get("decade")
+            rank_by = arguments.get("rank_by", "rating")
             max_results = arguments.get("max_results", 5)
+            cursor = arguments.get("cursor") or None
+            include_facets = bool(arguments.get("include_facets", False))
             
-            # 실제 영화 검색 수행
+            # 세션 후보 집합 안에서 좁힌 뒤 그 안에서만 검색 (커서는 서버에 보관한 검색 범위의 키를 담고 있음)
+            # 좁힐 때 평가한 조건은 검색에서 다시 평가하지 않고 좁힌 행 번호를 그대로 사용
+            within = None
+            candidates = None
+            if arguments.get("narrow_candidates") and not cursor:
+                widened = self.candidates.narrow(self.movie_manager, {
+                    "keywords": keywords, "genre": genre, "director": director, "actor": actor,
+                    "min_rating": min_rating, "certificate": certificate, "decade": decade
+                })
+                # 조건이 카탈로그 전체에서도 매칭이 없으면 (widened None) 집합은 그대로이고 결과도 비어 있음
+                within = self.candidates
+                candidates = {**self.candidates.summary(), "widened": widened}
+            
+            # 실제 영화 검색 수행 (cursor 가 있으면 이전 검색의 다음 페이지)
             movies = self.movie_manager.search_movies(
                 keywords=keywords,
                 genre=genre,
                 director=director, 
                 actor=actor,
                 min_rating=min_rating,
-                top_n=max_results
+                top_n=max_results,
+                certificate=certificate,
+                decade=decade,
+                rank_by=rank_by,
+                cursor=cursor,
+                facets=include_facets,
+                within=within
             )
+            facets = movies.attrs.get("facets")
             
             if movies.empty:
                 return {
@@ -210,29 +291,29 @@ class RealMCPMovieSearch:
                     "message": "검색 조건에 맞는 영화를 찾을 수 없습니다.",
                     "search_params": arguments,
                     "count": 0,
-                    "movies": []
+                    "movies": [],
+                    "next_cursor": None,
+                    "facets": facets,
+                    "candidates": candidates
                 }
             
             # 결과 변환
             movies_data = []
             for _, movie in movies.iterrows():
-                movies_data.append({
-                    "Series_Title": movie["Series_Title"],
-                    "Released_Year": movie["Released_Year"],
-                    "IMDB_Rating": movie["IMDB_Rating"],
-                    "Genre": movie["Genre"],
-                    "Director": movie["Director"],
-                    "Star1": movie["Star1"],
-                    "Star2": movie["Star2"],
-                    "Overview": movie["Overview"]
-                })
+                movie_data = movie_record(movie, MOVIE_SUMMARY_FIELDS)
+                if "Relevance" in movie:
+                    movie_data["Relevance"] = float(movie["Relevance"])
+                movies_data.append(movie_data)
             
             return {
                 "success": True,
                 "message": f"{len(movies_data)}개의 영화를 찾았습니다.",
                 "search_params": arguments,
                 "count": len(movies_data),
-                "movies": movies_data
+                "movies": movies_data,
+                "next_cursor": movies.attrs.get("next_cursor"),
+                "facets": facets,
+                "candidates": candidates
             }
             
         except Exception as e:
@@ -245,8 +326,8 @@ class RealMCPMovieSearch:
             if not movie_title:
                 raise ValueError("movie_title 파라미터가 필요합니다")
             
-            # 영화 검색
-            movies = self.movie_manager.search_movies(keywords=[movie_title], top_n=1)
+            # 트라이그램 색인으로 제목 찾기 (오타 허용, 유사도 순)
+            movies = self.movie_manager.find_titles(movie_title, limit=5)
             
             if movies.empty:
                 return {
@@ -258,29 +339,67 @@ class RealMCPMovieSearch:
             movie = movies.iloc[0]
             movie_details = {
                 "title": movie["Series_Title"],
-                "year": movie["Released_Year"],
-                "rating": movie["IMDB_Rating"],
-                "votes": movie["No_of_Votes"],
+                "year": json_value(movie["Released_Year"]),
+                "rating": json_value(movie["IMDB_Rating"]),
+                "votes": json_value(movie["No_of_Votes"]),
                 "genre": movie["Genre"],
-                "certificate": movie.get("Certificate", "N/A"),
-                "runtime": movie["Runtime"],
+                "certificate": display_value(movie.get("Certificate")),
+                "runtime": format_runtime(movie["Runtime"]),
                 "director": movie["Director"],
-                "stars": [movie["Star1"], movie["Star2"], movie["Star3"], movie["Star4"]],
+                "stars": json_value([movie["Star1"], movie["Star2"], movie["Star3"], movie["Star4"]]),
                 "overview": movie["Overview"],
-                "metascore": movie.get("Meta_score", "N/A"),
-                "gross": movie.get("Gross", "N/A"),
-                "poster": movie.get("Poster_Link", "N/A")
+                "metascore": display_value(movie.get("Meta_score")),
+                "gross": format_count(movie.get("Gross")),
+                "poster": display_value(movie.get("Poster_Link"))
             }
             
             return {
                 "success": True,
                 "message": f"'{movie['Series_Title']}' 영화 상세 정보",
+                "similarity": float(movie["Similarity"]),
+                "suggestions": movies["Series_Title"].iloc[1:].tolist(),
                 "movie": movie_details
             }
             
         except Exception as e:
             raise Exception(f"영화 상세 정보 조회 중 오류: {str(e)}")
     
+    async def _execute_similar_movies(self, arguments: Dict) -> Dict:
+        """비슷한 영화 도구 실제 실행 (미리 계산된 이웃 그래프 조회)"""
+        try:
+            movie_title = arguments.get("movie_title")
+            if not movie_title:
+                raise ValueError("movie_title 파라미터가 필요합니다")
+            limit = arguments.get("limit", 5)
+
+            movies = self.movie_manager.similar_movies(movie_title, k=limit)
+            source_title = movies.attrs.get("source_title")
+            if source_title is None:
+                return {
+                    "success": False,
+                    "message": f"'{movie_title}' 영화를 찾을 수 없습니다.",
+                    "source_title": None,
+                    "count": 0,
+                    "movies": []
+                }
+
+            movies_data = []
+            for _, movie in movies.iterrows():
+                movie_data = movie_record(movie, MOVIE_SUMMARY_FIELDS)
+                movie_data["Similarity"] = float(movie["Similarity"])
+                movies_data.append(movie_data)
+
+            return {
+                "success": True,
+                "message": f"'{source_title}' 와 비슷한 영화 {len(movies_data)}개",
+                "source_title": source_title,
+                "count": len(movies_data),
+                "movies": movies_data
+            }
+
+        except Exception as e:
+            raise Exception(f"비슷한 영화 조회 중 오류: {str(e)}")
+
     def log_mcp_interaction(self, interaction_type: str, data: Dict):
         """MCP 상호작용 로깅"""
         logger.info(f"📝 MCP {interaction_type}: {json.dumps(data, ensure_ascii=False)[:100]}...")
@@ -291,6 +410,7 @@ class RealMCPMovieSearch:
             "session_id": self.session_id,
             "tools_available": len(self.tools),
             "tool_names": list(self.tools.keys()),
+            "candidates": self.candidates.summary(),
             "protocol": "JSON-RPC 2.0",
             "implementation": "Real MCP"
         }
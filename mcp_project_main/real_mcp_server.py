@@ -8,7 +8,10 @@ import asyncio
 import json
 import logging
 from typing import Any, Sequence
-import pandas as pd
+
+from catalog_schema import display_value, format_count, format_runtime, movie_records
+from movie_data_manager import MovieDataManager
+from neighbor_graph import DEFAULT_NEIGHBORS
 
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
@@ -29,13 +32,18 @@ class MovieMCPServer:
         # MCP 서버 초기화
         self.server = Server("movie-search-server")
         
-        # 영화 데이터 로드
+        # 영화 데이터 및 검색 인덱스 로드 (검색은 MovieDataManager 에 위임, MOVIE_SEARCH_BACKEND=sqlite 이면 공유 SQLite 색인)
         try:
-            self.movie_df = pd.read_csv('dataset/imdb_top_1000.csv')
-            logger.info(f"✅ IMDb 데이터 로드 완료: {len(self.movie_df)}개 영화")
+            self.movie_manager = MovieDataManager()
+            if self.movie_manager.store is not None:
+                logger.info(f"✅ SQLite 색인 연결: {len(self.movie_manager)}개 영화 ({self.movie_manager.store.db_path})")
+            else:
+                stats = self.movie_manager.load_stats
+                logger.info(f"✅ IMDb 데이터 로드 완료: {len(self.movie_manager)}개 영화 "
+                            f"({stats['source']} {stats['load_ms']}ms, 색인은 처음 사용할 때 구축)")
         except Exception as e:
             logger.error(f"❌ 데이터 로드 실패: {e}")
-            self.movie_df = pd.DataFrame()  # 빈 데이터프레임
+            self.movie_manager = None
         
         self.setup_handlers()
     
@@ -77,10 +85,25 @@ class MovieMCPServer:
                                 "type": "number",
                                 "description": "최대 IMDb 평점" 
                             },
+                            "rank_by": {
+                                "type": "string",
+                                "enum": ["rating", "relevance"],
+                                "description": "정렬 기준: IMDb 평점 또는 키워드와 제목/줄거리의 BM25 관련도",
+                                "default": "rating"
+                            },
                             "max_results": {
                                 "type": "integer",
                                 "description": "최대 결과 수",
                                 "default": 5
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "이전 검색 결과의 next_cursor (다음 페이지, 다른 조건은 무시)"
+                            },
+                            "include_facets": {
+                                "type": "boolean",
+                                "description": "매칭 영화 전체의 장르/연대/감독/관람등급/평점 구간별 개수도 반환",
+                                "default": False
                             }
                         }
                     }
@@ -117,6 +140,27 @@ class MovieMCPServer:
                         },
                         "required": ["genre"]
                     }
+                ),
+                Tool(
+                    name="similar_movies",
+                    description="특정 영화와 비슷한 영화 (장르/감독/출연진/줄거리 유사도) 를 조회합니다",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "movie_title": {
+                                "type": "string",
+                                "description": "기준 영화 제목 (오타 허용)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": f"결과 수 제한 ({DEFAULT_NEIGHBORS}개까지는 미리 계산된 이웃 그래프에서 바로, "
+                                               "더 많으면 전체 영화와 직접 비교해 느림)",
+                                "minimum": 1,
+                                "default": 5
+                            }
+                        },
+                        "required": ["movie_title"]
+                    }
                 )
             ]
         
@@ -131,70 +175,55 @@ class MovieMCPServer:
                 return await self._get_movie_details(**arguments)
             elif name == "get_top_movies_by_genre":
                 return await self._get_top_movies_by_genre(**arguments)
+            elif name == "similar_movies":
+                return await self._similar_movies(**arguments)
             else:
                 raise ValueError(f"Unknown tool: {name}")
     
     async def _search_movies(self, keywords=None, genre=None, director=None, 
-                           actor=None, min_rating=None, max_rating=None, max_results=5):
+                           actor=None, min_rating=None, max_rating=None, max_results=5,
+                           rank_by='rating', cursor=None, include_facets=False):
         """영화 검색 실행"""
         try:
-            if self.movie_df.empty:
+            if self.movie_manager is None:
                 return [TextContent(
                     type="text",
                     text="❌ 영화 데이터가 로드되지 않았습니다."
                 )]
             
-            results = self.movie_df.copy()
             applied_filters = []
-            
-            # 키워드 검색
             if keywords and len(keywords) > 0:
-                keyword_pattern = '|'.join([str(k) for k in keywords])
-                mask = (
-                    results['Series_Title'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Overview'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Genre'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Director'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star1'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star2'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star3'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star4'].str.contains(keyword_pattern, case=False, na=False)
-                )
-                results = results[mask]
                 applied_filters.append(f"키워드: {keywords}")
-            
-            # 장르 필터
             if genre:
-                results = results[results['Genre'].str.contains(genre, case=False, na=False)]
                 applied_filters.append(f"장르: {genre}")
-            
-            # 감독 필터  
             if director:
-                results = results[results['Director'].str.contains(director, case=False, na=False)]
                 applied_filters.append(f"감독: {director}")
-            
-            # 배우 필터
             if actor:
-                actor_mask = (
-                    results['Star1'].str.contains(actor, case=False, na=False) |
-                    results['Star2'].str.contains(actor, case=False, na=False) |
-                    results['Star3'].str.contains(actor, case=False, na=False) |
-                    results['Star4'].str.contains(actor, case=False, na=False)
-                )
-                results = results[actor_mask]
                 applied_filters.append(f"배우: {actor}")
-            
-            # 평점 필터
             if min_rating is not None:
-                results = results[results['IMDB_Rating'] >= min_rating]
                 applied_filters.append(f"최소평점: {min_rating}")
-            
             if max_rating is not None:
-                results = results[results['IMDB_Rating'] <= max_rating]
                 applied_filters.append(f"최대평점: {max_rating}")
+            if rank_by == 'relevance':
+                applied_filters.append("정렬: 관련도(BM25)")
+            if cursor:
+                applied_filters = ["다음 페이지 (커서)"]
             
-            # 결과 정렬 및 제한
-            results = results.sort_values('IMDB_Rating', ascending=False).head(max_results)
+            # 키워드는 부분 문자열 색인 (접미사 배열), 감독/배우는 인물 색인으로 검색 (정규식 스캔 없음)
+            results = self.movie_manager.search_movies(
+                keywords=[str(k) for k in keywords] if keywords else None,
+                genre=genre,
+                director=director,
+                actor=actor,
+                min_rating=min_rating,
+                max_rating=max_rating,
+                top_n=max_results,
+                rank_by=rank_by,
+                cursor=cursor or None,
+                facets=include_facets
+            )
+            next_cursor = results.attrs.get('next_cursor')
+            facets = results.attrs.get('facets')
             
             # 결과 포맷팅
             if results.empty:
@@ -208,15 +237,23 @@ class MovieMCPServer:
             response_text += f"📋 적용된 필터: {', '.join(applied_filters) if applied_filters else '없음'}\n\n"
             
             for i, (_, movie) in enumerate(results.iterrows(), 1):
-                response_text += f"{i}. **{movie['Series_Title']}** ({movie['Released_Year']})\n"
+                response_text += f"{i}. **{movie['Series_Title']}** ({display_value(movie['Released_Year'])})\n"
                 response_text += f"   ⭐ 평점: {movie['IMDB_Rating']}/10\n"  
                 response_text += f"   🎭 장르: {movie['Genre']}\n"
                 response_text += f"   🎬 감독: {movie['Director']}\n"
                 response_text += f"   🌟 주연: {movie['Star1']}, {movie['Star2']}\n"
                 response_text += f"   📝 줄거리: {movie['Overview'][:100]}...\n\n"
             
+            if facets:
+                response_text += f"📊 전체 {facets['total']}편 분포\n"
+                for name, label in (('genre', '장르'), ('decade', '연대'), ('director', '감독')):
+                    top = ', '.join(f"{value} {count}" for value, count in list(facets[name].items())[:5])
+                    response_text += f"   {label}: {top}\n"
+            if next_cursor:
+                response_text += f"➡️ 다음 페이지 cursor: {next_cursor}\n"
+            
             # JSON 데이터도 함께 반환
-            movies_json = results.to_dict('records')
+            movies_json = movie_records(results)
             
             return [
                 TextContent(
@@ -239,12 +276,11 @@ class MovieMCPServer:
     async def _get_movie_details(self, movie_title: str):
         """영화 상세 정보 조회"""
         try:
-            if self.movie_df.empty:
+            if self.movie_manager is None:
                 return [TextContent(type="text", text="❌ 영화 데이터가 로드되지 않았습니다.")]
             
-            # 영화 찾기
-            movie_mask = self.movie_df['Series_Title'].str.contains(movie_title, case=False, na=False)
-            matching_movies = self.movie_df[movie_mask]
+            # 트라이그램 색인으로 제목 찾기 (오타 허용, 유사도 순)
+            matching_movies = self.movie_manager.find_titles(movie_title, limit=5)
             
             if matching_movies.empty:
                 return [TextContent(
@@ -252,21 +288,22 @@ class MovieMCPServer:
                     text=f"❌ '{movie_title}'와 일치하는 영화를 찾을 수 없습니다."
                 )]
             
-            # 첫 번째 매치 사용
+            # 가장 유사한 제목 사용, 나머지는 후보로 제안
             movie = matching_movies.iloc[0]
+            suggestions = ', '.join(matching_movies['Series_Title'].iloc[1:]) or '없음'
             
             details_text = f"""
 🎬 **영화 상세 정보**
 
 **제목**: {movie['Series_Title']}
-**개봉연도**: {movie['Released_Year']}
-**관람등급**: {movie.get('Certificate', 'N/A')}
-**러닝타임**: {movie['Runtime']}
+**개봉연도**: {display_value(movie['Released_Year'])}
+**관람등급**: {display_value(movie.get('Certificate'))}
+**러닝타임**: {format_runtime(movie['Runtime'])}
 **장르**: {movie['Genre']}
 
 **평점 정보**
-- IMDb 평점: {movie['IMDB_Rating']}/10 ({movie['No_of_Votes']:,}표)
-- 메타스코어: {movie.get('Meta_score', 'N/A')}/100
+- IMDb 평점: {movie['IMDB_Rating']}/10 ({format_count(movie['No_of_Votes'])}표)
+- 메타스코어: {display_value(movie.get('Meta_score'))}/100
 
 **제작진**
 - 감독: {movie['Director']}
@@ -276,9 +313,11 @@ class MovieMCPServer:
 {movie['Overview']}
 
 **박스오피스**
-- 총 수익: ${movie.get('Gross', 'N/A')}
+- 총 수익: ${format_count(movie.get('Gross'))}
+
+**포스터**: {display_value(movie.get('Poster_Link'))}
 
-**포스터**: {movie.get('Poster_Link', 'N/A')}
+**비슷한 제목**: {suggestions}
 """
             
             return [TextContent(type="text", text=details_text)]
@@ -293,27 +332,22 @@ class MovieMCPServer:
     async def _get_top_movies_by_genre(self, genre: str, limit: int = 10):
         """장르별 최고 평점 영화 조회"""
         try:
-            if self.movie_df.empty:
+            if self.movie_manager is None:
                 return [TextContent(type="text", text="❌ 영화 데이터가 로드되지 않았습니다.")]
             
-            # 장르 필터링
-            genre_movies = self.movie_df[
-                self.movie_df['Genre'].str.contains(genre, case=False, na=False)
-            ]
+            # 장르 비트맵 + 평점순 순열에서 상위 limit 개만 선택 (전체 정렬 없음)
+            top_movies = self.movie_manager.search_movies(genre=genre, top_n=limit)
             
-            if genre_movies.empty:
+            if top_movies.empty:
                 return [TextContent(
                     type="text",
                     text=f"❌ '{genre}' 장르의 영화를 찾을 수 없습니다."
                 )]
             
-            # 평점순 정렬
-            top_movies = genre_movies.sort_values('IMDB_Rating', ascending=False).head(limit)
-            
             response_text = f"🏆 **{genre} 장르 최고 평점 영화 Top {len(top_movies)}**\n\n"
             
             for i, (_, movie) in enumerate(top_movies.iterrows(), 1):
-                response_text += f"{i}. **{movie['Series_Title']}** ({movie['Released_Year']})\n"
+                response_text += f"{i}. **{movie['Series_Title']}** ({display_value(movie['Released_Year'])})\n"
                 response_text += f"   ⭐ {movie['IMDB_Rating']}/10\n"
                 response_text += f"   🎬 {movie['Director']}\n\n"
             
@@ -326,6 +360,35 @@ class MovieMCPServer:
                 text=f"❌ 장르별 영화 조회 중 오류가 발생했습니다: {str(e)}"
             )]
 
+    async def _similar_movies(self, movie_title: str, limit: int = 5):
+        """비슷한 영화 조회 (미리 계산된 이웃 그래프에서 O(k))"""
+        try:
+            if self.movie_manager is None:
+                return [TextContent(type="text", text="❌ 영화 데이터가 로드되지 않았습니다.")]
+
+            similar = self.movie_manager.similar_movies(movie_title, k=limit)
+            source_title = similar.attrs.get("source_title")
+            if source_title is None:
+                return [TextContent(
+                    type="text",
+                    text=f"❌ '{movie_title}'와 일치하는 영화를 찾을 수 없습니다."
+                )]
+
+            response_text = f"🎞️ **'{source_title}' 와 비슷한 영화 {len(similar)}편**\n\n"
+            for i, (_, movie) in enumerate(similar.iterrows(), 1):
+                response_text += f"{i}. **{movie['Series_Title']}** ({display_value(movie['Released_Year'])})\n"
+                response_text += f"   ⭐ {movie['IMDB_Rating']}/10 | 유사도 {movie['Similarity']:.2f}\n"
+                response_text += f"   🎬 {movie['Director']} | 🎭 {movie['Genre']}\n\n"
+
+            return [TextContent(type="text", text=response_text)]
+
+        except Exception as e:
+            logger.error(f"❌ 비슷한 영화 조회 오류: {e}")
+            return [TextContent(
+                type="text",
+                text=f"❌ 비슷한 영화 조회 중 오류가 발생했습니다: {str(e)}"
+            )]
+
 async def main():
     """MCP 서버 실행"""
     logger.info("🚀 실제 MCP 영화 서버 시작...")
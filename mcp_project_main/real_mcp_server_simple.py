@@ -7,9 +7,11 @@ MCP (Model Context Protocol) 표준을 준수하는 실제 서버 (간소화 버
 import asyncio
 import json
 import logging
-import pandas as pd
 from typing import Any, Sequence
 
+from catalog_schema import display_value, format_count, format_runtime, json_value
+from movie_data_manager import MovieDataManager
+
 # MCP SDK 임포트
 from mcp import types
 from mcp.server import Server, NotificationOptions
@@ -21,74 +23,56 @@ logger = logging.getLogger("simple-movie-mcp-server")
 
 class SimpleMovieMCPServer:
     def __init__(self):
-        # 영화 데이터 로드
+        # 영화 데이터 및 검색 인덱스 로드 (검색은 MovieDataManager 에 위임, MOVIE_SEARCH_BACKEND=sqlite 이면 공유 SQLite 색인)
         try:
-            self.movie_df = pd.read_csv('dataset/imdb_top_1000.csv')
-            logger.info(f"✅ IMDb 데이터 로드 완료: {len(self.movie_df)}개 영화")
+            self.movie_manager = MovieDataManager()
+            if self.movie_manager.store is not None:
+                logger.info(f"✅ SQLite 색인 연결: {len(self.movie_manager)}개 영화 ({self.movie_manager.store.db_path})")
+            else:
+                stats = self.movie_manager.load_stats
+                logger.info(f"✅ IMDb 데이터 로드 완료: {len(self.movie_manager)}개 영화 "
+                            f"({stats['source']} {stats['load_ms']}ms, 색인은 처음 사용할 때 구축)")
         except Exception as e:
             logger.error(f"❌ 데이터 로드 실패: {e}")
-            self.movie_df = pd.DataFrame()  # 빈 데이터프레임
+            self.movie_manager = None
     
     async def search_movies(self, keywords=None, genre=None, director=None, 
-                           actor=None, min_rating=None, max_rating=None, max_results=5):
+                           actor=None, min_rating=None, max_rating=None, max_results=5,
+                           rank_by='rating'):
         """영화 검색 실행"""
         try:
-            if self.movie_df.empty:
+            if self.movie_manager is None:
                 return {
                     "error": "영화 데이터가 로드되지 않았습니다."
                 }
             
-            results = self.movie_df.copy()
             applied_filters = []
-            
-            # 키워드 검색
             if keywords and len(keywords) > 0:
-                keyword_pattern = '|'.join([str(k) for k in keywords])
-                mask = (
-                    results['Series_Title'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Overview'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Genre'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Director'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star1'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star2'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star3'].str.contains(keyword_pattern, case=False, na=False) |
-                    results['Star4'].str.contains(keyword_pattern, case=False, na=False)
-                )
-                results = results[mask]
                 applied_filters.append(f"키워드: {keywords}")
-            
-            # 장르 필터
             if genre:
-                results = results[results['Genre'].str.contains(genre, case=False, na=False)]
                 applied_filters.append(f"장르: {genre}")
-            
-            # 감독 필터  
             if director:
-                results = results[results['Director'].str.contains(director, case=False, na=False)]
                 applied_filters.append(f"감독: {director}")
-            
-            # 배우 필터
             if actor:
-                actor_mask = (
-                    results['Star1'].str.contains(actor, case=False, na=False) |
-                    results['Star2'].str.contains(actor, case=False, na=False) |
-                    results['Star3'].str.contains(actor, case=False, na=False) |
-                    results['Star4'].str.contains(actor, case=False, na=False)
-                )
-                results = results[actor_mask]
                 applied_filters.append(f"배우: {actor}")
-            
-            # 평점 필터
             if min_rating is not None:
-                results = results[results['IMDB_Rating'] >= min_rating]
                 applied_filters.append(f"최소평점: {min_rating}")
-            
             if max_rating is not None:
-                results = results[results['IMDB_Rating'] <= max_rating]
                 applied_filters.append(f"최대평점: {max_rating}")
-            
-            # 결과 정렬 및 제한
-            results = results.sort_values('IMDB_Rating', ascending=False).head(max_results)
+            if rank_by == 'relevance':
+                applied_filters.append("정렬: 관련도(BM25)")
+            
+            # 키워드는 부분 문자열 색인 (접미사 배열), 감독/배우는 인물 색인으로 검색 (정규식 스캔 없음)
+            results = self.movie_manager.search_movies(
+                keywords=[str(k) for k in keywords] if keywords else None,
+                genre=genre,
+                director=director,
+                actor=actor,
+                min_rating=min_rating,
+                max_rating=max_rating,
+                top_n=max_results,
+                rank_by=rank_by
+            )
             
             # 결과 포맷팅
             if results.empty:
@@ -102,11 +86,11 @@ class SimpleMovieMCPServer:
             for _, movie in results.iterrows():
                 movies_data.append({
                     "title": movie['Series_Title'],
-                    "year": movie['Released_Year'],
-                    "rating": movie['IMDB_Rating'],
+                    "year": json_value(movie['Released_Year']),
+                    "rating": json_value(movie['IMDB_Rating']),
                     "genre": movie['Genre'],
                     "director": movie['Director'],
-                    "stars": [movie['Star1'], movie['Star2'], movie['Star3'], movie['Star4']],
+                    "stars": json_value([movie['Star1'], movie['Star2'], movie['Star3'], movie['Star4']]),
                     "overview": movie['Overview']
                 })
             
@@ -126,35 +110,36 @@ class SimpleMovieMCPServer:
     async def get_movie_details(self, movie_title: str):
         """영화 상세 정보 조회"""
         try:
-            if self.movie_df.empty:
+            if self.movie_manager is None:
                 return {"error": "영화 데이터가 로드되지 않았습니다."}
             
-            # 영화 찾기
-            movie_mask = self.movie_df['Series_Title'].str.contains(movie_title, case=False, na=False)
-            matching_movies = self.movie_df[movie_mask]
+            # 트라이그램 색인으로 제목 찾기 (오타 허용, 유사도 순)
+            matching_movies = self.movie_manager.find_titles(movie_title, limit=5)
             
             if matching_movies.empty:
                 return {"error": f"'{movie_title}'와 일치하는 영화를 찾을 수 없습니다."}
             
-            # 첫 번째 매치 사용
+            # 가장 유사한 제목 사용, 나머지는 후보로 제안
             movie = matching_movies.iloc[0]
             
             return {
                 "success": True,
+                "similarity": float(movie['Similarity']),
+                "suggestions": matching_movies['Series_Title'].iloc[1:].tolist(),
                 "movie": {
                     "title": movie['Series_Title'],
-                    "year": movie['Released_Year'],
-                    "certificate": movie.get('Certificate', 'N/A'),
-                    "runtime": movie['Runtime'],
+                    "year": json_value(movie['Released_Year']),
+                    "certificate": display_value(movie.get('Certificate')),
+                    "runtime": format_runtime(movie['Runtime']),
                     "genre": movie['Genre'],
-                    "rating": movie['IMDB_Rating'],
-                    "votes": movie['No_of_Votes'],
-                    "metascore": movie.get('Meta_score', 'N/A'),
+                    "rating": json_value(movie['IMDB_Rating']),
+                    "votes": json_value(movie['No_of_Votes']),
+                    "metascore": display_value(movie.get('Meta_score')),
                     "director": movie['Director'],
-                    "stars": [movie['Star1'], movie['Star2'], movie['Star3'], movie['Star4']],
+                    "stars": json_value([movie['Star1'], movie['Star2'], movie['Star3'], movie['Star4']]),
                     "overview": movie['Overview'],
-                    "gross": movie.get('Gross', 'N/A'),
-                    "poster": movie.get('Poster_Link', 'N/A')
+                    "gross": format_count(movie.get('Gross')),
+                    "poster": display_value(movie.get('Poster_Link'))
                 }
             }
             
@@ -203,6 +188,12 @@ async def handle_list_tools() -> list[types.Tool]:
                         "type": "number",
                         "description": "최대 IMDb 평점" 
                     },
+                    "rank_by": {
+                        "type": "string",
+                        "enum": ["rating", "relevance"],
+                        "description": "정렬 기준: IMDb 평점 또는 키워드와 제목/줄거리의 BM25 관련도",
+                        "default": "rating"
+                    },
                     "max_results": {
                         "type": "integer",
                         "description": "최대 결과 수",
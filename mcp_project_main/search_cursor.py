@@ -0,0 +1,51 @@
+"""
+검색 결과 페이지 커서
+커서 토큰 하나에 검색 파라미터, 백엔드, 카탈로그 버전 (내용 해시), 마지막으로 반환한 행의 정렬 위치를 담아
+다음 페이지는 그 위치 다음부터 이어서 찾는다 (더 큰 top_n 으로 다시 검색해 자르지 않음)
+"""
+
+import base64
+import json
+from typing import Dict, Optional
+
+CURSOR_VERSION = 1
+# 커서에는 내용 해시 앞부분만 담음 (카탈로그 버전 구분용)
+HASH_PREFIX_LENGTH = 16
+
+
+class SearchCursor:
+    """
+    다음 페이지 위치
+    after_id: 마지막으로 반환한 행 번호 (평점순이면 평점 내림차순 + 행 번호 순서에서 그 다음부터)
+    after_score: 관련도순일 때 그 행의 원래 점수 (점수 내림차순, 동점은 평점순)
+    """
+
+    def __init__(self, query: Dict, backend: str, content_hash: str, after_id: int,
+                 after_score: Optional[float] = None):
+        self.query = {name: value for name, value in query.items() if value is not None}
+        self.backend = backend
+        self.content_hash = (content_hash or '')[:HASH_PREFIX_LENGTH]
+        self.after_id = int(after_id)
+        self.after_score = None if after_score is None else float(after_score)
+
+    def matches(self, content_hash: str) -> bool:
+        """커서를 만든 카탈로그 버전과 같은지"""
+        return self.content_hash == (content_hash or '')[:HASH_PREFIX_LENGTH]
+
+    def encode(self) -> str:
+        payload = {'v': CURSOR_VERSION, 'q': self.query, 'b': self.backend, 'h': self.content_hash,
+                   'id': self.after_id, 's': self.after_score}
+        text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), sort_keys=True, default=list)
+        return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> SearchCursor:
+    """커서 토큰 -> SearchCursor (형식이 잘못되었으면 ValueError)"""
+    try:
+        text = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+        payload = json.loads(text)
+        if payload['v'] != CURSOR_VERSION:
+            raise ValueError(f"지원하지 않는 커서 버전 {payload['v']}")
+        return SearchCursor(dict(payload['q']), payload['b'], payload['h'], payload['id'], payload['s'])
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"잘못된 검색 커서입니다: {e}") from e
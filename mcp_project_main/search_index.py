@@ -0,0 +1,466 @@
+"""
+영화 카탈로그 검색 인덱스 모듈
+데이터셋 로드 시 한 번만 구축하고, 검색 시에는 포스팅 리스트 연산만 수행
+"""
+
+import bisect
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 토큰 단위: 유니코드 단어 문자 (한글 포함)
+TOKEN_PATTERN = re.compile(r"\w+")
+
+EMPTY_IDS = np.empty(0, dtype=np.int32)
+
+
+def tokenize(text) -> List[str]:
+    """텍스트를 소문자 토큰 리스트로 분리"""
+    if text is None:
+        return []
+    return TOKEN_PATTERN.findall(str(text).casefold())
+
+
+def union_ids(id_arrays: Iterable[np.ndarray]) -> np.ndarray:
+    """정렬된 행 번호 배열들의 합집합"""
+    id_arrays = [ids for ids in id_arrays if len(ids)]
+    if not id_arrays:
+        return EMPTY_IDS
+    if len(id_arrays) == 1:
+        return id_arrays[0]
+    return np.unique(np.concatenate(id_arrays))
+
+
+def intersect_ids(id_arrays: Iterable[np.ndarray]) -> np.ndarray:
+    """정렬된 행 번호 배열들의 교집합 (짧은 리스트부터 교차)"""
+    id_arrays = sorted(id_arrays, key=len)
+    if not id_arrays:
+        return EMPTY_IDS
+    result = id_arrays[0]
+    for ids in id_arrays[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, ids, assume_unique=True)
+    return result
+
+
+def contains_sorted(sorted_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """ids 각각이 정렬된 배열 sorted_ids 에 있는지 (이진 탐색, 합집합을 만들지 않음)"""
+    if not len(sorted_ids):
+        return np.zeros(len(ids), dtype=bool)
+    pos = np.searchsorted(sorted_ids, ids)
+    pos[pos == len(sorted_ids)] = 0
+    return sorted_ids[pos] == ids
+
+
+def csr_codes(offsets: np.ndarray) -> np.ndarray:
+    """CSR 오프셋 -> 포스팅마다의 키 번호"""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+
+def remap_csr(offsets: np.ndarray, rows: np.ndarray, id_map: np.ndarray):
+    """
+    CSR 포스팅을 새 행 번호로 옮긴다 (카탈로그 재로드용)
+    id_map[이전 행 번호] = 새 행 번호 (삭제된 행은 -1) -> (키 번호, 새 행 번호, 남은 포스팅 마스크)
+    """
+    codes = csr_codes(offsets)
+    new_rows = id_map[rows]
+    keep = new_rows >= 0
+    return codes[keep], new_rows[keep], keep
+
+
+def extend_vocabulary(key_ids: Dict, keys) -> np.ndarray:
+    """keys 각각의 번호 (사전에 없는 키는 끝 번호로 추가, key_ids 를 직접 수정하므로 복사본을 넘길 것)"""
+    return np.array([key_ids.setdefault(key, len(key_ids)) for key in keys], dtype=np.int64)
+
+
+def sort_csr(codes: np.ndarray, rows: np.ndarray, num_keys: int):
+    """
+    중복 없는 (키 번호, 행 번호) 쌍 -> (키/행 순 정렬 순서, 오프셋)
+    재로드 시에는 이미 정렬된 기존 포스팅 뒤에 적은 수의 새 포스팅이 붙은 형태라 안정 정렬이 거의 선형
+    """
+    stride = int(rows.max(initial=0)) + 1
+    order = np.argsort(codes.astype(np.int64) * stride + rows, kind='stable')
+    offsets = np.zeros(num_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=num_keys), out=offsets[1:])
+    return order, offsets
+
+
+class CsrPostings:
+    """
+    키 -> 정렬된 행 번호 배열 (CSR 형식)
+    모든 포스팅을 하나의 int32 배열에 모아 두고 오프셋으로 잘라서 반환 (복사 없음)
+    """
+
+    def __init__(self, keys: np.ndarray, row_ids: np.ndarray):
+        codes, vocab = pd.factorize(keys)
+        # (키, 행) 쌍 중복 제거 + 키/행 순 정렬을 한 번에 수행
+        stride = int(row_ids.max(initial=0)) + 1
+        pairs = np.unique(codes.astype(np.int64) * stride + row_ids.astype(np.int64))
+        sorted_codes = pairs // stride
+        self.rows = (pairs % stride).astype(np.int32)
+        self.offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sorted_codes, minlength=len(vocab)), out=self.offsets[1:])
+        self.key_ids = {key: i for i, key in enumerate(vocab)}
+
+    def updated(self, id_map: np.ndarray, added: 'CsrPostings', added_ids: np.ndarray) -> 'CsrPostings':
+        """
+        재로드된 카탈로그용 새 포스팅 (self 는 수정하지 않음)
+        기존 포스팅은 행 번호만 옮기고, 바뀐/추가된 행은 그 행들만으로 만든 added 를 합친다
+        합친 포스팅은 전체를 (키, 행) 순으로 다시 정렬하므로 비용은 바뀐 행 수가 아니라 전체 포스팅 수에 비례
+        포스팅이 모두 사라진 키는 사전에 남지만 길이 0 으로 취급
+        """
+        codes, rows, _ = remap_csr(self.offsets, self.rows, id_map)
+        key_ids = dict(self.key_ids)
+        added_codes = extend_vocabulary(key_ids, added.key_ids)[csr_codes(added.offsets)]
+        codes = np.concatenate([codes, added_codes])
+        rows = np.concatenate([rows, added_ids[added.rows]])
+        order, offsets = sort_csr(codes, rows, len(key_ids))
+        postings = CsrPostings.__new__(CsrPostings)
+        postings.rows = rows[order].astype(np.int32)
+        postings.offsets = offsets
+        postings.key_ids = key_ids
+        return postings
+
+    def __len__(self):
+        return len(self.key_ids)
+
+    def __contains__(self, key):
+        return self.count(key) > 0
+
+    def keys(self):
+        counts = np.diff(self.offsets)
+        return [key for key, key_id in self.key_ids.items() if counts[key_id]]
+
+    def get(self, key) -> np.ndarray:
+        """키의 포스팅 리스트 (없으면 빈 배열)"""
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            return EMPTY_IDS
+        return self.rows[self.offsets[key_id]:self.offsets[key_id + 1]]
+
+    def count(self, key) -> int:
+        """키의 포스팅 길이"""
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            return 0
+        return int(self.offsets[key_id + 1] - self.offsets[key_id])
+
+
+# 바이트 값별 1비트 개수 (비트맵 popcount 용)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def normalize_key(value):
+    """범주형 값을 색인 키로 정규화 (문자열은 소문자)"""
+    if isinstance(value, str):
+        return value.strip().casefold()
+    return value
+
+
+class BitmapIndex:
+    """
+    범주형 값 -> 비트맵 (np.packbits 로 압축한 uint8 배열)
+    여러 조건의 AND/OR 는 비트맵 단위의 벡터 연산 한 번으로 처리
+    """
+
+    def __init__(self, values: pd.Series, num_rows: int):
+        """values: 인덱스가 행 번호인 Series (한 행에 여러 값이면 explode 된 형태)"""
+        values = values.dropna()
+        keys = np.array([normalize_key(v) for v in values.to_numpy()], dtype=object)
+        self.num_rows = num_rows
+        self.postings = CsrPostings(keys, values.index.to_numpy(dtype=np.int64))
+        self._build_bitmaps()
+
+    def _build_bitmaps(self):
+        self.bitmaps = {}
+        for key in self.postings.keys():
+            mask = np.zeros(self.num_rows, dtype=bool)
+            mask[self.postings.get(key)] = True
+            self.bitmaps[key] = np.packbits(mask)
+        self.empty = np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+
+    def updated(self, diff, added_values: pd.Series) -> 'BitmapIndex':
+        """
+        재로드된 카탈로그용 새 색인 (added_values: 바뀐/추가된 행의 값, 인덱스는 diff.added_ids 안의 위치)
+        값 -> 행 비트맵은 키마다 전체 행 길이로 다시 만듦 (키 수 x 행 수 / 8 바이트)
+        """
+        added = BitmapIndex(added_values, len(diff.added_ids))
+        index = BitmapIndex.__new__(BitmapIndex)
+        index.num_rows = diff.num_rows
+        index.postings = self.postings.updated(diff.id_map, added.postings, diff.added_ids)
+        index._build_bitmaps()
+        return index
+
+    def keys(self):
+        return self.bitmaps.keys()
+
+    def get(self, key) -> np.ndarray:
+        """키의 비트맵 (없는 값이면 전부 0)"""
+        return self.bitmaps.get(normalize_key(key), self.empty)
+
+    def all_of(self, keys) -> np.ndarray:
+        """모든 키를 만족하는 행의 비트맵 (AND)"""
+        return np.bitwise_and.reduce([self.get(key) for key in keys])
+
+    def any_of(self, keys) -> np.ndarray:
+        """키 중 하나라도 만족하는 행의 비트맵 (OR)"""
+        return np.bitwise_or.reduce([self.get(key) for key in keys])
+
+    def to_mask(self, bitmap: np.ndarray) -> np.ndarray:
+        """비트맵을 행 길이의 bool 마스크로 변환"""
+        return np.unpackbits(bitmap, count=self.num_rows).astype(bool)
+
+    @staticmethod
+    def test(bitmap: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """행 번호 배열의 비트 값 (bool) - 전체 마스크를 풀지 않고 해당 비트만 읽음"""
+        return ((bitmap[ids >> 3] >> (7 - (ids & 7))) & 1).astype(bool)
+
+    @staticmethod
+    def count(bitmap: np.ndarray) -> int:
+        """비트맵의 1비트 개수"""
+        return int(_POPCOUNT_TABLE[bitmap].sum())
+
+
+GENRE_SEPARATOR = re.compile(r"\s*(?:,|/|&|\+|\band\b|그리고)\s*", re.IGNORECASE)
+DECADE_PATTERN = re.compile(r"(\d{2,4})")
+
+
+def parse_genres(genre) -> List[str]:
+    """'Crime and Drama', 'Crime, Drama', ['Crime', 'Drama'] 형태를 장르 리스트로 분리"""
+    if isinstance(genre, (list, tuple, set)):
+        parts = [str(g) for g in genre]
+    else:
+        parts = GENRE_SEPARATOR.split(str(genre))
+    return [p.strip() for p in parts if p and p.strip()]
+
+
+def parse_decade(decade) -> Optional[int]:
+    """1994, '1990s', '90s', '90년대' -> 1990"""
+    if isinstance(decade, (int, np.integer)):
+        year = int(decade)
+    else:
+        match = DECADE_PATTERN.search(str(decade))
+        if not match:
+            return None
+        year = int(match.group(1))
+        if len(match.group(1)) == 2:
+            # 두 자리 표기: 30년대 이상은 1900년대, 그 밖은 2000년대로 해석
+            year += 1900 if year >= 30 else 2000
+    return year // 10 * 10
+
+
+def release_decades(released_year: pd.Series) -> pd.Series:
+    """개봉 연도 컬럼을 연대 값으로 변환 (잘못된 연도는 NaN)"""
+    years = pd.to_numeric(released_year, errors='coerce')
+    return (years // 10 * 10).astype('Int64')
+
+
+class RatingOrder:
+    """
+    평점 내림차순으로 미리 정렬한 행 번호 순열
+    상위 k개는 정렬 순서를 앞에서부터 훑다가 k개를 채우면 멈추거나,
+    후보가 적으면 순위 값에 대한 부분 선택(argpartition)으로 구한다
+    """
+
+    def __init__(self, ratings):
+        ratings = np.asarray(ratings, dtype=np.float64)
+        # 동점은 원래 행 순서 유지 (stable)
+        self.order = np.argsort(-ratings, kind='stable').astype(np.int32)
+        self.sorted_ratings = ratings[self.order]
+        self.rank = np.empty(len(ratings), dtype=np.int32)
+        self.rank[self.order] = np.arange(len(ratings), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.order)
+
+    def rating_range(self, min_rating=None, max_rating=None):
+        """평점 조건을 만족하는 정렬 순서상의 구간 [start, end)"""
+        descending = -self.sorted_ratings
+        start = 0 if max_rating is None else int(np.searchsorted(descending, -max_rating, side='left'))
+        end = len(self.order) if min_rating is None else int(np.searchsorted(descending, -min_rating, side='right'))
+        return start, max(start, end)
+
+    def top_k(self, k, test=None, start=0, end=None, chunk_size=64) -> np.ndarray:
+        """
+        정렬 순서 [start, end) 를 앞에서부터 훑으며 test(행 번호 배열) 를 통과한 행을 k개까지 수집
+        청크 크기를 두 배씩 늘려가므로 흔한 조건은 몇 번의 청크 안에 끝난다
+        """
+        end = len(self.order) if end is None else end
+        if test is None:
+            return self.order[start:min(end, start + k)]
+        found = []
+        remaining = k
+        pos = start
+        while pos < end and remaining > 0:
+            chunk = self.order[pos:min(end, pos + chunk_size)]
+            hits = chunk[test(chunk)][:remaining]
+            if len(hits):
+                found.append(hits)
+                remaining -= len(hits)
+            pos += len(chunk)
+            chunk_size *= 2
+        return np.concatenate(found) if found else EMPTY_IDS
+
+    def top_k_of(self, ids, k, start=0, end=None) -> np.ndarray:
+        """후보 행 번호 중 평점 상위 k개 (순위 구간 [start, end) 로 제한 가능)"""
+        ids = np.asarray(ids)
+        ranks = self.rank[ids]
+        if start > 0 or end is not None:
+            inside = (ranks >= start) & (ranks < (len(self.order) if end is None else end))
+            ids, ranks = ids[inside], ranks[inside]
+        if len(ids) > k:
+            part = np.argpartition(ranks, k - 1)[:k]
+            ids, ranks = ids[part], ranks[part]
+        return ids[np.argsort(ranks, kind='stable')]
+
+
+# 인물 역할 코드: 0 = 감독, 1~4 = 주연 순번 (Star1~Star4)
+ROLE_DIRECTOR = 0
+STAR_ROLES = (1, 2, 3, 4)
+PERSON_ROLE_COLUMNS = {'Director': ROLE_DIRECTOR, 'Star1': 1, 'Star2': 2, 'Star3': 3, 'Star4': 4}
+
+
+def person_key(name) -> str:
+    """
+    인물 색인/검색 키: 소문자만 (기존 str.lower().str.contains 필터와 같은 결과가 되도록 악센트/공백은 그대로)
+    """
+    return str(name).lower()
+
+
+def normalize_name(name) -> str:
+    """인물 이름 정규화: 악센트 제거, 소문자, 공백 정리 ('Penélope Cruz' -> 'penelope cruz')"""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+class PersonIndex:
+    """
+    인물 -> (영화 행 번호, 역할) 포스팅 리스트
+    이름은 정규화 후 정렬된 테이블 하나에 저장하고, 모든 이름을 이은 블롭에서 부분 문자열로 찾는다
+    (기존 str.contains 필터와 같은 의미: 'nolan' -> 'christopher nolan', 'son' -> 'emma thompson')
+    """
+
+    def __init__(self, df: pd.DataFrame, role_columns: Dict[str, int] = None):
+        self.role_columns = role_columns or PERSON_ROLE_COLUMNS
+        frames = []
+        for column, role in self.role_columns.items():
+            values = df[column].dropna()
+            frames.append(pd.DataFrame({
+                'name': [person_key(v) for v in values.to_numpy()],
+                'row': np.flatnonzero(df[column].notna().to_numpy()),
+                'role': role,
+            }))
+        people = pd.concat(frames, ignore_index=True)
+        people = people[people['name'] != ''].sort_values(['name', 'row', 'role'], kind='stable')
+
+        # 정렬된 이름 테이블 + 이름별 CSR 포스팅 (행 번호, 역할)
+        names, name_ids = np.unique(people['name'].to_numpy(dtype=object), return_inverse=True)
+        self.names = names.tolist()
+        self.rows = people['row'].to_numpy(dtype=np.int32)
+        self.roles = people['role'].to_numpy(dtype=np.int8)
+        self.offsets = np.zeros(len(self.names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(name_ids, minlength=len(self.names)), out=self.offsets[1:])
+
+        # 부분 문자열 검색용 이름 블롭 (처음 검색할 때 만듦)
+        self._name_blob = None
+
+    def updated(self, diff, added_df: pd.DataFrame) -> 'PersonIndex':
+        """
+        재로드된 카탈로그용 새 색인 (self 는 수정하지 않음)
+        바뀐/추가된 행의 이름만 정규화하고, 처음 보는 이름은 정렬된 이름 테이블의 제자리에 끼워 넣는다
+        출연작이 모두 사라진 이름은 테이블에 남지만 검색에서는 제외
+        """
+        added = PersonIndex(added_df, self.role_columns)
+        positions = [bisect.bisect_left(self.names, name) for name in added.names]
+        is_new = [pos == len(self.names) or self.names[pos] != name for pos, name in zip(positions, added.names)]
+        new_names = [name for name, new in zip(added.names, is_new) if new]
+        new_positions = np.array([pos for pos, new in zip(positions, is_new) if new], dtype=np.int64)
+
+        # 기존 이름 번호는 앞쪽에 끼워진 새 이름 수만큼 밀림, j 번째 새 이름은 (삽입 위치 + j)
+        old_ids = np.arange(len(self.names), dtype=np.int64)
+        old_to_new = old_ids + np.searchsorted(new_positions, old_ids, side='right')
+        new_ids = new_positions + np.arange(len(new_names), dtype=np.int64)
+        names = list(self.names)
+        for name_id, name in zip(new_ids.tolist(), new_names):
+            names.insert(name_id, name)
+        new_id_of = dict(zip(new_names, new_ids.tolist()))
+        added_to_new = np.array([new_id_of[name] if name in new_id_of else old_to_new[pos]
+                                 for name, pos in zip(added.names, positions)], dtype=np.int64)
+
+        codes, rows, keep = remap_csr(self.offsets, self.rows, diff.id_map)
+        codes = np.concatenate([old_to_new[codes], added_to_new[csr_codes(added.offsets)]])
+        rows = np.concatenate([rows, diff.added_ids[added.rows]])
+        roles = np.concatenate([self.roles[keep], added.roles])
+        order = np.lexsort((roles, rows, codes))
+
+        index = PersonIndex.__new__(PersonIndex)
+        index.role_columns = self.role_columns
+        index.names = names
+        index.rows = rows[order].astype(np.int32)
+        index.roles = roles[order].astype(np.int8)
+        index.offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(names)), out=index.offsets[1:])
+
+        index._name_blob = None
+        return index
+
+    def __len__(self):
+        return len(self.names)
+
+    def _alive(self, name_ids: np.ndarray) -> np.ndarray:
+        """출연작이 남아 있는 이름 번호만"""
+        return name_ids[self.offsets[name_ids + 1] > self.offsets[name_ids]]
+
+    def _blob(self):
+        """(모든 이름을 줄바꿈으로 이은 문자열, 이름별 시작 위치)"""
+        if self._name_blob is None:
+            starts = np.zeros(len(self.names), dtype=np.int64)
+            if self.names:
+                np.cumsum([len(name) + 1 for name in self.names[:-1]], out=starts[1:])
+            self._name_blob = ('\n'.join(self.names), starts)
+        return self._name_blob
+
+    def find_names(self, query) -> np.ndarray:
+        """쿼리를 부분 문자열로 포함하는 이름 번호 (이름 사이는 줄바꿈이라 두 이름에 걸친 매칭은 없음)"""
+        query = person_key(query)
+        if not query:
+            return EMPTY_IDS
+        blob, starts = self._blob()
+        positions = [match.start() for match in re.finditer(re.escape(query), blob)]
+        if not positions:
+            return EMPTY_IDS
+        return self._alive(np.unique(np.searchsorted(starts, positions, side='right') - 1))
+
+    def postings(self, name_id: int):
+        """이름 번호의 (행 번호 배열, 역할 배열)"""
+        start, end = self.offsets[name_id], self.offsets[name_id + 1]
+        return self.rows[start:end], self.roles[start:end]
+
+    def movies_of(self, query) -> Dict[str, List[tuple]]:
+        """쿼리에 매칭되는 인물별 (행 번호, 역할) 목록"""
+        result = {}
+        for name_id in self.find_names(query):
+            rows, roles = self.postings(name_id)
+            result[self.names[name_id]] = list(zip(rows.tolist(), roles.tolist()))
+        return result
+
+    def match_rows(self, query, roles: Optional[Iterable[int]] = None) -> np.ndarray:
+        """쿼리 인물이 주어진 역할로 참여한 영화 행 번호 (정렬됨)"""
+        name_ids = self.find_names(query)
+        if not len(name_ids):
+            return EMPTY_IDS
+        row_parts = []
+        role_parts = []
+        for name_id in name_ids:
+            rows, person_roles = self.postings(name_id)
+            row_parts.append(rows)
+            role_parts.append(person_roles)
+        rows = np.concatenate(row_parts)
+        if roles is not None:
+            rows = rows[np.isin(np.concatenate(role_parts), list(roles))]
+        return np.unique(rows)
@@ -0,0 +1,153 @@
+"""
+대화 세션의 후보 영화 집합
+턴마다 카탈로그 전체를 다시 검색하지 않고, 앞선 턴의 단서로 좁혀 둔 행 번호 집합 안에서만 찾는다
+새 단서가 지금 집합과 맞지 않으면 (매칭 0편) 최근에 좁힌 단계부터 되돌려 넓힌 뒤 다시 좁힌다
+대화가 한 영화로 수렴할수록 턴당 검색 비용이 후보 수에 비례해 줄어든다
+검색 커서에는 행 번호 대신 서버에 보관한 후보 집합의 키 ('세션 id.내용 해시') 만 담는다
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 되돌릴 수 있도록 보관하는 이전 후보 집합 수 (넘으면 가장 오래된 것부터 버림, 마지막 수단은 항상 전체 카탈로그)
+MAX_HISTORY = 8
+# 후보 집합을 좁히는 검색 조건
+NARROWING_FILTERS = ('keywords', 'genre', 'director', 'actor', 'min_rating', 'max_rating', 'certificate', 'decade')
+# 커서가 참조하는 후보 집합 보관 수 (넘으면 가장 오래 쓰지 않은 것부터 버리고, 그 커서는 만료)
+MAX_STORED_SETS = 256
+
+
+class CandidateScope:
+    """
+    검색 범위로 넘기는 후보 행 번호 (정렬된 int64 배열)
+    filters: 그 행들이 이미 모두 만족하는 조건 (검색 조건 중 값이 같은 것은 다시 평가하지 않음)
+    """
+
+    def __init__(self, ids, filters: Optional[Dict] = None, session_id: Optional[str] = None):
+        self.ids = np.unique(np.asarray(ids, dtype=np.int64))
+        self.filters = dict(filters or {})
+        self.session_id = session_id
+
+    def applied(self, query: Dict) -> Dict:
+        """query 의 조건 중 이 범위가 이미 만족하는 것 (이름 -> 값)"""
+        return {name: value for name, value in self.filters.items() if query.get(name) == value}
+
+    def key(self, filters: Dict) -> str:
+        """세션 id + (행 번호, 조건) 내용 해시 ('세션 id.해시')"""
+        digest = hashlib.blake2b(self.ids.tobytes(), digest_size=8)
+        digest.update(json.dumps(filters, sort_keys=True, default=str).encode('utf-8'))
+        return f"{self.session_id or '-'}.{digest.hexdigest()}"
+
+
+_stored: 'OrderedDict[str, CandidateScope]' = OrderedDict()
+_stored_lock = threading.Lock()
+
+
+def store_candidates(scope: CandidateScope, filters: Optional[Dict] = None) -> str:
+    """
+    후보 범위를 서버에 보관하고 커서에 담을 키를 반환 (filters: 다음 페이지에서도 다시 평가하지 않을 조건)
+    같은 세션의 같은 집합은 같은 키 하나로 보관
+    """
+    filters = dict(filters or {})
+    key = scope.key(filters)
+    with _stored_lock:
+        _stored[key] = CandidateScope(scope.ids, filters, scope.session_id)
+        _stored.move_to_end(key)
+        while len(_stored) > MAX_STORED_SETS:
+            _stored.popitem(last=False)
+    return key
+
+
+def stored_candidates(key: str) -> Optional[CandidateScope]:
+    """보관된 후보 범위 (버려졌거나 없는 키면 None)"""
+    with _stored_lock:
+        scope = _stored.get(key)
+        if scope is not None:
+            _stored.move_to_end(key)
+    return scope
+
+
+class CandidateSet:
+    """
+    세션 하나의 후보 행 번호 (정렬된 int32 배열, None 이면 카탈로그 전체)
+    filters: 지금 행들이 모두 만족하는 마지막 턴의 조건 (같은 조건의 검색은 다시 평가하지 않음)
+    행 번호는 카탈로그 버전에 묶이므로 카탈로그 내용 해시가 바뀌면 전체로 되돌린다
+    """
+
+    def __init__(self, session_id: Optional[str] = None, max_history: int = MAX_HISTORY):
+        self.session_id = session_id
+        self.max_history = max_history
+        self.ids: Optional[np.ndarray] = None
+        self.filters: Dict = {}
+        self.content_hash = None
+        self._history: List[np.ndarray] = []   # 좁히기 전 집합들 (오래된 것부터)
+
+    def __len__(self):
+        return 0 if self.ids is None else len(self.ids)
+
+    @property
+    def is_narrowed(self) -> bool:
+        return self.ids is not None
+
+    @property
+    def turns(self) -> int:
+        """지금 집합까지 좁힌 단계 수 (보관 중인 이전 집합 기준)"""
+        return len(self._history) + 1 if self.ids is not None else 0
+
+    def reset(self) -> None:
+        """카탈로그 전체로 되돌림 (새 영화를 찾기 시작할 때)"""
+        self.ids = None
+        self.filters = {}
+        self._history = []
+
+    def widen(self) -> None:
+        """마지막으로 좁힌 단계 하나를 되돌림"""
+        if self.ids is None:
+            return
+        self.ids = self._history.pop() if self._history else None
+        self.filters = {}  # 되돌린 집합을 좁힌 조건은 보관하지 않음
+
+    def _bind(self, content_hash) -> None:
+        if content_hash != self.content_hash:
+            self.reset()
+            self.content_hash = content_hash
+
+    def narrow(self, movie_manager, filters: Dict) -> Optional[int]:
+        """
+        이번 턴 조건으로 후보를 좁힘 (지금 집합 안에서만 매칭하므로 비용은 후보 수에 비례)
+        반환: 되돌린 단계 수 (0 이면 지금 집합 안에서 좁힘), 조건이 없거나 카탈로그 전체에서도 매칭이 없으면 None
+        (None 이면 후보 집합은 그대로)
+        """
+        self._bind(movie_manager.catalog.content_hash)
+        filters = {name: filters[name] for name in NARROWING_FILTERS if filters.get(name)}
+        if not filters:
+            return None
+        # 지금 집합 -> 이전 집합들 (최근 것부터) -> 카탈로그 전체 순으로 매칭이 있는 첫 집합 안에서 좁힘
+        levels = ([self.ids] + self._history[::-1] if self.ids is not None else []) + [None]
+        for widened, base in enumerate(levels):
+            matched = movie_manager.match_ids(within=base, **filters)
+            if not len(matched):
+                continue
+            kept = levels[widened:-1][::-1]  # base 와 그보다 오래된 집합 (오래된 것부터)
+            self._history = kept[-self.max_history:] if self.max_history else []
+            self.ids = matched.astype(np.int32)
+            self.filters = filters
+            return widened
+        return None
+
+    def scope(self) -> Optional[CandidateScope]:
+        """검색 범위 (좁히지 않았으면 None - 카탈로그 전체)"""
+        return None if self.ids is None else CandidateScope(self.ids, self.filters, self.session_id)
+
+    def summary(self) -> Dict:
+        return {
+            "count": len(self) if self.is_narrowed else None,
+            "narrowed": self.is_narrowed,
+            "turns": self.turns,
+            "history": [len(ids) for ids in self._history],
+        }
@@ -0,0 +1,384 @@
+"""
+SQLite 저장소 백엔드 (MovieDataManager(backend='sqlite'))
+카탈로그를 로컬 SQLite 파일 하나에 저장해 여러 MCP 서버 프로세스가 같은 디스크 색인을 공유
+- FTS5 trigram 테이블: 제목/줄거리/장르/감독/배우 값 (키워드 부분 문자열 검색)
+- FTS5 토큰 테이블: 같은 필드 (rank_by='relevance' 의 bm25 점수)
+- B-tree 색인: 평점, 개봉 연도, 투표 수, 관람등급, 연대, 장르, 인물
+
+검색 의미는 pandas 백엔드와 같다:
+키워드는 한 필드 값의 부분 문자열 (대소문자 무시, 특수 문자는 그대로), 키워드끼리는 OR, 장르는 AND, 관람등급/연대는 OR,
+인물은 소문자 이름의 부분 문자열 매칭, 결과는 평점 내림차순 (동점은 원래 행 순서)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from catalog_schema import as_text, normalize_catalog
+from catalog_snapshot import add_genre_list, default_snapshot_dir, file_sha256, load_catalog
+from facets import DEFAULT_FACET_LIMIT, FACET_FIELDS, empty_facets, rating_buckets, top_counts
+from search_index import (PERSON_ROLE_COLUMNS, ROLE_DIRECTOR, STAR_ROLES, normalize_key, person_key,
+                          parse_decade, parse_genres, release_decades, tokenize)
+from substring_index import SEPARATOR, normalize_keyword
+
+SCHEMA_VERSION = 3
+FTS_FIELDS = ['Series_Title', 'Overview', 'Genre', 'Director', 'Star1', 'Star2', 'Star3', 'Star4']
+# 번들 CSV 원본 컬럼 (결과 데이터프레임 재구성용, 값은 CSV 문자열 그대로 저장)
+RAW_COLUMNS = ['Poster_Link', 'Series_Title', 'Released_Year', 'Certificate', 'Runtime', 'Genre', 'IMDB_Rating',
+               'Overview', 'Meta_score', 'Director', 'Star1', 'Star2', 'Star3', 'Star4', 'No_of_Votes', 'Gross']
+# 필드 가중치 (rank_by='relevance' 의 FTS5 bm25, 제목 가중치는 BM25Index 와 같게)
+FTS_WEIGHTS = [2.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+# trigram 색인은 3글자 이상 키워드만 사용 가능 (더 짧은 키워드는 instr 로 전체 행 검사)
+TRIGRAM_LENGTH = 3
+
+
+def default_db_path(csv_path) -> str:
+    return default_snapshot_dir(csv_path) + '.sqlite'
+
+
+def _raw_value(value):
+    """정규화된 값 -> CSV 문자열 형태 (결과 재구성 시 normalize_catalog 로 다시 같은 타입이 됨)"""
+    if value is None or value is pd.NA or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    return value
+
+
+def build_database(csv_path, db_path: Optional[str] = None) -> str:
+    """CSV -> SQLite 파일 (임시 파일에 만든 뒤 교체, 실행 중인 다른 프로세스는 이전 파일을 계속 읽음)"""
+    db_path = db_path or default_db_path(csv_path)
+    df, _ = load_catalog(csv_path)
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    staging = f"{db_path}.building-{os.getpid()}"
+    if os.path.exists(staging):
+        os.remove(staging)
+    connection = sqlite3.connect(staging)
+    try:
+        _create_schema(connection)
+        _insert_catalog(connection, df)
+        connection.execute("INSERT INTO meta VALUES ('schema_version', ?), ('csv_sha256', ?), ('num_rows', ?)",
+                           (str(SCHEMA_VERSION), file_sha256(csv_path), str(len(df))))
+        connection.commit()
+        connection.execute("ANALYZE")
+        connection.commit()
+    except BaseException:
+        connection.close()
+        os.remove(staging)
+        raise
+    connection.close()
+    os.replace(staging, db_path)
+    return db_path
+
+
+def _create_schema(connection) -> None:
+    raw_columns = ', '.join(f'"{c}"' for c in RAW_COLUMNS)
+    fts_columns = ', '.join(FTS_FIELDS)
+    connection.executescript(f"""
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE movies (
+            id INTEGER PRIMARY KEY,
+            {raw_columns},
+            rating REAL, year INTEGER, votes INTEGER, certificate_key TEXT, decade INTEGER
+        );
+        CREATE INDEX movies_rating ON movies (rating DESC, id);
+        CREATE INDEX movies_year ON movies (year);
+        CREATE INDEX movies_votes ON movies (votes);
+        CREATE INDEX movies_certificate ON movies (certificate_key);
+        CREATE INDEX movies_decade ON movies (decade);
+        CREATE TABLE movie_genres (genre TEXT, movie_id INTEGER, PRIMARY KEY (genre, movie_id)) WITHOUT ROWID;
+        CREATE TABLE people (name_id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+        CREATE TABLE credits (name_id INTEGER, role INTEGER, movie_id INTEGER,
+                              PRIMARY KEY (name_id, role, movie_id)) WITHOUT ROWID;
+        -- 토큰화는 파이썬 tokenize() 로 미리 해서 저장 (pandas 백엔드와 같은 토큰), 원문은 movies 에만 보관
+        CREATE VIRTUAL TABLE movies_fts USING fts5(
+            {fts_columns}, content='', tokenize="unicode61 remove_diacritics 0 tokenchars '_'"
+        );
+        -- (영화, 필드 값) 마다 casefold 한 값 한 행 (SubstringIndex 와 같은 값, 필드를 넘는 매칭 없음)
+        CREATE VIRTUAL TABLE movies_text USING fts5(movie_id UNINDEXED, text, tokenize="trigram case_sensitive 1");
+    """)
+
+
+def _insert_catalog(connection, df: pd.DataFrame) -> None:
+    ids = np.arange(len(df))
+    ratings = df['IMDB_Rating'].to_numpy(dtype=np.float64)
+    decades = release_decades(df['Released_Year'])
+    raw_rows = zip(*[df[column].astype(object).tolist() for column in RAW_COLUMNS])
+    connection.executemany(
+        f"INSERT INTO movies VALUES ({', '.join('?' * (len(RAW_COLUMNS) + 6))})",
+        ([int(i), *[_raw_value(v) for v in raw], float(rating), _raw_value(year), _raw_value(votes),
+          None if pd.isna(certificate) else normalize_key(certificate), _raw_value(decade)]
+         for i, raw, rating, year, votes, certificate, decade in zip(
+             ids, raw_rows, ratings, df['Released_Year'].astype(object), df['No_of_Votes'].astype(object),
+             df['Certificate'].astype(object), decades.astype(object))))
+
+    connection.executemany("INSERT OR IGNORE INTO movie_genres VALUES (?, ?)",
+                           ((normalize_key(genre), int(row)) for row, genres in enumerate(df['Genre_List'])
+                            for genre in genres))
+
+    names: Dict[str, int] = {}
+    credits = []
+    for column, role in PERSON_ROLE_COLUMNS.items():
+        for row, value in enumerate(df[column].astype(object)):
+            if pd.isna(value):
+                continue
+            name = person_key(value)
+            if name:
+                credits.append((names.setdefault(name, len(names)), role, row))
+    connection.executemany("INSERT INTO people VALUES (?, ?)", ((i, name) for name, i in names.items()))
+    connection.executemany("INSERT OR IGNORE INTO credits VALUES (?, ?, ?)", credits)
+
+    fields = [df[field].astype(object).tolist() for field in FTS_FIELDS]
+    connection.executemany(
+        f"INSERT INTO movies_fts (rowid, {', '.join(FTS_FIELDS)}) VALUES (?{', ?' * len(FTS_FIELDS)})",
+        ([int(row), *[' '.join(tokenize(v)) if not pd.isna(v) else '' for v in values]]
+         for row, values in enumerate(zip(*fields))))
+    connection.executemany(
+        "INSERT INTO movies_text (movie_id, text) VALUES (?, ?)",
+        ((int(row), normalize_keyword(value).replace(SEPARATOR, ' '))
+         for row, values in enumerate(zip(*fields)) for value in values if not pd.isna(value)))
+
+
+def keyword_substring_clause(keywords):
+    """
+    키워드 OR 조건 (WHERE 절, 파라미터) - 매칭될 수 없으면 None
+    3글자 이상은 trigram MATCH (따옴표로 감싼 구문이라 특수 문자도 그대로), 짧은 키워드는 instr
+    """
+    conditions, params = [], []
+    for keyword in keywords:
+        pattern = normalize_keyword(keyword)
+        if not pattern or SEPARATOR in pattern:
+            continue
+        if len(pattern) >= TRIGRAM_LENGTH:
+            conditions.append("m.id IN (SELECT movie_id FROM movies_text WHERE movies_text MATCH ?)")
+            params.append('"' + pattern.replace('"', '""') + '"')
+        else:
+            conditions.append("m.id IN (SELECT movie_id FROM movies_text WHERE instr(text, ?) > 0)")
+            params.append(pattern)
+    if not conditions:
+        return None
+    return f"({' OR '.join(conditions)})", params
+
+
+def keyword_match_expression(keywords) -> Optional[str]:
+    """FTS5 MATCH 식 (관련도 점수용): 키워드마다 (필드: 단어 AND ...) 를 모든 필드에 대해 OR"""
+    clauses = []
+    for keyword in keywords:
+        terms = tokenize(keyword)
+        if not terms:
+            continue
+        conjunction = ' AND '.join(f'"{term}"' for term in terms)
+        clauses.extend(f'{field} : ({conjunction})' for field in FTS_FIELDS)
+    return ' OR '.join(clauses) if clauses else None
+
+
+class SqliteMovieStore:
+    """SQLite 파일 위의 읽기 전용 검색 (스레드마다 별도 연결)"""
+
+    def __init__(self, csv_path, db_path: Optional[str] = None, rebuild_if_stale: bool = True):
+        self.csv_path = csv_path
+        self.db_path = db_path or default_db_path(csv_path)
+        if rebuild_if_stale and not self.is_fresh():
+            build_database(csv_path, self.db_path)
+        self._local = threading.local()
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        self.num_rows = int(meta['num_rows'])
+        self.content_hash = meta['csv_sha256']
+
+    def is_fresh(self) -> bool:
+        if not os.path.exists(self.db_path):
+            return False
+        try:
+            connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+            finally:
+                connection.close()
+        except sqlite3.DatabaseError:
+            return False
+        return (meta.get('schema_version') == str(SCHEMA_VERSION)
+                and meta.get('csv_sha256') == file_sha256(self.csv_path))
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return connection
+
+    def _query(self, sql, params=()):
+        return self._connection().execute(sql, list(params)).fetchall()
+
+    def __len__(self):
+        return self.num_rows
+
+    def _name_ids(self, query) -> List[int]:
+        """PersonIndex.find_names 와 같은 규칙: 소문자 이름의 부분 문자열"""
+        query = person_key(query)
+        if not query:
+            return []
+        rows = self._query("SELECT name_id FROM people WHERE instr(name, ?) > 0", (query,))
+        return [row[0] for row in rows]
+
+    def _where(self, keywords, genre, director, actor, min_rating, max_rating, certificate, decade, within=None):
+        """(WHERE 절 목록, 파라미터, 관련도용 FTS MATCH 식 또는 None) - 결과가 비어야 하면 None"""
+        clauses, params = [], []
+        match = None
+        if within is not None:
+            if not len(within):
+                return None
+            # 행 번호 목록은 JSON 배열 파라미터 하나로 (SQL 변수 개수 제한 없음)
+            clauses.append("m.id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps([int(i) for i in within]))
+        if keywords:
+            keyword_clause = keyword_substring_clause(keywords)
+            if keyword_clause is None:
+                return None
+            clauses.append(keyword_clause[0])
+            params.extend(keyword_clause[1])
+            match = keyword_match_expression(keywords)
+        for query, roles in ((director, [ROLE_DIRECTOR]), (actor, list(STAR_ROLES))):
+            if not query:
+                continue
+            name_ids = self._name_ids(query)
+            if not name_ids:
+                return None
+            clauses.append(f"m.id IN (SELECT movie_id FROM credits WHERE name_id IN ({', '.join('?' * len(name_ids))})"
+                           f" AND role IN ({', '.join('?' * len(roles))}))")
+            params.extend(name_ids + roles)
+        for genre_name in (parse_genres(genre) if genre else []):
+            clauses.append("m.id IN (SELECT movie_id FROM movie_genres WHERE genre = ?)")
+            params.append(normalize_key(genre_name))
+        if certificate:
+            certificates = certificate if isinstance(certificate, (list, tuple, set)) else [certificate]
+            keys = [normalize_key(c) for c in certificates]
+            clauses.append(f"m.certificate_key IN ({', '.join('?' * len(keys))})")
+            params.extend(keys)
+        if decade:
+            decades = decade if isinstance(decade, (list, tuple, set)) else [decade]
+            keys = [parse_decade(d) for d in decades]
+            clauses.append(f"m.decade IN ({', '.join('?' * len(keys))})")
+            params.extend(keys)
+        if min_rating:
+            clauses.append("m.rating >= ?")
+            params.append(float(min_rating))
+        if max_rating:
+            clauses.append("m.rating <= ?")
+            params.append(float(max_rating))
+        return clauses, params, match
+
+    def search_movies(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None,
+                      top_n=10, certificate=None, decade=None, rank_by='rating') -> pd.DataFrame:
+        """MovieDataManager.search_movies 와 같은 시그니처/결과 (인덱스는 카탈로그 행 번호)"""
+        return self.search_page(keywords, genre, director, actor, min_rating, max_rating, top_n,
+                                certificate, decade, rank_by)[0]
+
+    def search_page(self, keywords=None, genre=None, director=None, actor=None, min_rating=None, max_rating=None,
+                    top_n=10, certificate=None, decade=None, rank_by='rating', after=None, facets=False, within=None):
+        """
+        (결과, 관련도 원래 점수 또는 None)
+        after=(행 번호, 관련도 점수 또는 None): 정렬 순서에서 그 행 다음부터 (다음 페이지)
+        facets=True 이면 매칭 행 전체의 패싯 개수를 results.attrs['facets'] 에
+        within: 이 행 번호들 안에서만 검색
+        """
+        where = self._where(keywords, genre, director, actor, min_rating, max_rating, certificate, decade, within)
+        if where is None:
+            results = self._frame([])
+            if facets:
+                results.attrs['facets'] = empty_facets()
+            return results, None
+        clauses, params, match = where
+        relevance = rank_by == 'relevance' and bool(keywords)
+        results, scores = self._page(clauses, params, match, top_n, relevance, after)
+        if facets:
+            results.attrs['facets'] = self.facet_counts(clauses, params)
+        return results, scores
+
+    def facet_counts(self, clauses, params, limit=DEFAULT_FACET_LIMIT) -> Dict:
+        """매칭 행의 패싯 개수 (FacetIndex.counts 와 같은 형태) - 패싯마다 GROUP BY 한 번"""
+        condition = f"FROM movies m WHERE {' AND '.join(clauses)}" if clauses else "FROM movies m"
+        facets = {'total': self._query(f"SELECT COUNT(*) {condition}", params)[0][0]}
+        # 장르 문자열 조합별 개수 -> 조합 (행이 아닌 서로 다른 조합) 만 분리해 장르별로 합산
+        combos = pd.DataFrame(self._query(f'SELECT m."Genre", COUNT(*) {condition} GROUP BY m."Genre"', params),
+                              columns=['Genre', 'count'])
+        genres = add_genre_list(combos.dropna()).explode('Genre_List').groupby('Genre_List')['count'].sum()
+        facets['genre'] = top_counts(genres.index.to_numpy(dtype=object), genres.to_numpy(), limit)
+        for name, expression in (('decade', 'm.decade'), ('director', 'm."Director"'),
+                                 ('certificate', 'm."Certificate"')):
+            rows = [row for row in self._query(f"SELECT {expression}, COUNT(*) {condition} GROUP BY 1", params)
+                    if row[0] is not None]
+            labels = np.array([row[0] for row in rows], dtype=object)
+            facets[name] = top_counts(labels, np.array([row[1] for row in rows], dtype=np.int64), limit)
+        rows = self._query(f"SELECT m.rating, COUNT(*) {condition} GROUP BY 1", params)
+        buckets, inverse = np.unique(rating_buckets([row[0] for row in rows]), return_inverse=True)
+        counts = np.bincount(inverse, weights=[row[1] for row in rows], minlength=len(buckets)).astype(np.int64)
+        facets['rating'] = top_counts(buckets.astype(object), counts, limit)
+        return {name: facets[name] for name in ('total',) + FACET_FIELDS}
+
+    def _page(self, clauses, params, match, top_n, relevance, after):
+        """정렬된 결과 한 페이지 (결과, 관련도 원래 점수 또는 None)"""
+        after_rating = None
+        if after is not None:
+            rating = self._query("SELECT rating FROM movies WHERE id = ?", (int(after[0]),))
+            if not rating:
+                return self._frame([]), None
+            after_rating = rating[0][0]
+        columns = ', '.join(f'm."{c}"' for c in RAW_COLUMNS)
+        if relevance:
+            # FTS5 bm25 (작을수록 관련도 높음) - 점수 식은 BM25Index 와 다르므로 순서가 완전히 같지는 않음
+            # 부분 문자열로만 매칭되고 토큰은 겹치지 않는 행은 점수 0
+            score, scored = "0.0", ""
+            if match is not None:
+                weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+                score = "COALESCE(f.score, 0.0)"
+                scored = (f"LEFT JOIN (SELECT rowid, -bm25(movies_fts, {weights}) AS score FROM movies_fts "
+                          f"WHERE movies_fts MATCH ?) f ON f.rowid = m.id ")
+                params = [match] + params
+            sql = (f"SELECT m.id, {columns}, {score} AS relevance, m.rating AS sort_rating "
+                   f"FROM movies m {scored}WHERE {' AND '.join(clauses)}")
+            if after is not None:
+                # 이전 페이지 마지막 행 (점수, 평점, 행 번호) 다음부터
+                sql = (f"SELECT * FROM ({sql}) WHERE relevance < ? OR (relevance = ? AND "
+                       f"(sort_rating < ? OR (sort_rating = ? AND id > ?)))")
+                params += [after[1], after[1], after_rating, after_rating, int(after[0])]
+            rows = self._query(f"{sql} ORDER BY relevance DESC, sort_rating DESC, id LIMIT ?", params + [int(top_n)])
+            results = self._frame([row[:-2] for row in rows])
+            scores = np.array([row[-2] for row in rows], dtype=np.float64)
+            results['Relevance'] = np.round(scores, 4)
+            return results, scores
+        if after is not None:
+            clauses = clauses + ["(m.rating < ? OR (m.rating = ? AND m.id > ?))"]
+            params = params + [after_rating, after_rating, int(after[0])]
+        condition = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT m.id, {columns} FROM movies m {condition} ORDER BY m.rating DESC, m.id LIMIT ?"
+        return self._frame(self._query(sql, params + [int(top_n)])), None
+
+    @staticmethod
+    def _frame(rows) -> pd.DataFrame:
+        """SQL 행 -> pandas 백엔드와 같은 타입의 데이터프레임"""
+        ids = [row[0] for row in rows]
+        raw = pd.DataFrame([row[1:] for row in rows], columns=RAW_COLUMNS, index=ids)
+        for column in RAW_COLUMNS:
+            if raw[column].dtype == object:
+                raw[column] = as_text(raw[column])
+        return add_genre_list(normalize_catalog(raw))
+
+
+_stores: Dict[str, SqliteMovieStore] = {}
+_lock = threading.Lock()
+
+
+def get_sqlite_store(csv_path) -> SqliteMovieStore:
+    """경로별 공용 저장소 (첫 사용 시 DB 가 없거나 CSV 와 다르면 생성)"""
+    key = os.path.realpath(csv_path)
+    store = _stores.get(key)
+    if store is None:
+        with _lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = SqliteMovieStore(csv_path)
+    return store
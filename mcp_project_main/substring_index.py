@@ -0,0 +1,202 @@
+"""
+키워드 부분 문자열 검색 색인 (접미사 배열)
+검색 필드 값 (casefold) 중 서로 다른 값들을 구분자로 이어 붙인 텍스트의 접미사 배열을 만들어 두고,
+'Nolan' -> 'Christopher Nolan', 'dark kni' -> 'The Dark Knight', '(500) Days' 같은 임의의 부분 문자열을
+O(m log n) 이분 탐색으로 찾는다 (pandas str.contains(regex=False, case=False) 와 같은 의미, 특수 문자는 그대로)
+"""
+
+import bisect
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from search_index import EMPTY_IDS, CsrPostings, csr_codes, union_ids
+
+# 값 사이 구분자 (값 안의 같은 글자는 공백으로 바꿔 저장)
+SEPARATOR = '\x00'
+# 재로드로 쌓인 세그먼트가 이 수를 넘으면 하나로 합침
+MAX_SEGMENTS = 4
+
+
+def normalize_keyword(keyword) -> str:
+    """키워드 비교용 정규화 (대소문자만 무시, 공백/특수 문자는 그대로)"""
+    return str(keyword).casefold()
+
+
+def suffix_array(codes: np.ndarray) -> np.ndarray:
+    """
+    정수 코드 배열의 접미사 배열 (prefix doubling)
+    순위를 2배 길이 접두사 기준으로 다시 매기는 것을 모든 순위가 달라질 때까지 반복 (정렬은 numpy)
+    """
+    n = len(codes)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64)
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:max(n - k, 0)] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.concatenate([[0], np.cumsum(sorted_key[1:] != sorted_key[:-1])])
+        if rank[order[-1]] == n - 1:
+            return order
+        k *= 2
+
+
+class SuffixSegment:
+    """
+    값 목록 하나의 접미사 배열
+    text = 값0 + 구분자 + 값1 + 구분자 + ..., starts[i] = 값 i 의 시작 위치 (문서 경계표)
+    """
+
+    def __init__(self, values: List[str], first_id: int = 0):
+        self.first_id = first_id
+        self.num_values = len(values)
+        self.text = ''.join(value + SEPARATOR for value in values)
+        lengths = np.fromiter((len(value) + 1 for value in values), dtype=np.int64, count=len(values))
+        self.starts = np.zeros(len(values), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=self.starts[1:])
+        codes = np.frombuffer(self.text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        # 구분자마다 서로 다른 가장 작은 코드를 줘서 (파이썬 문자열 비교처럼 '\x00' 이 가장 앞)
+        # 같은 접두사를 가진 두 값의 접미사 비교가 구분자를 넘어가지 않게 함
+        separators = codes == 0
+        codes += self.num_values
+        codes[separators] = np.arange(self.num_values)
+        self.suffixes = suffix_array(codes)
+
+    def find(self, pattern: str) -> np.ndarray:
+        """pattern 을 포함하는 값 번호 (정렬됨, 세그먼트 밖 번호 기준)"""
+        text, m = self.text, len(pattern)
+
+        def prefix(position):
+            return text[position:position + m]
+
+        lo = bisect.bisect_left(self.suffixes, pattern, key=prefix)
+        hi = bisect.bisect_right(self.suffixes, pattern, lo=lo, key=prefix)
+        if lo == hi:
+            return EMPTY_IDS
+        value_ids = np.searchsorted(self.starts, self.suffixes[lo:hi], side='right') - 1
+        return np.unique(value_ids) + self.first_id
+
+
+class SubstringIndex:
+    """
+    필드 값 (casefold) -> 행 번호 CSR + 값 목록의 접미사 배열 세그먼트
+    같은 값 (장르 'Drama', 자주 나오는 배우 등) 은 한 번만 색인하고, 찾은 값의 포스팅을 합쳐 행 번호를 얻는다
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: List[str]):
+        self.fields = list(fields)
+        self.num_rows = len(df)
+        self.postings = self._value_postings(df, self.fields)
+        self.values = list(self.postings.key_ids)
+        self.segments = [SuffixSegment(self.values)]
+        self._build_row_values()
+
+    def _build_row_values(self):
+        """행 -> 값 번호 CSR (후보 행이 적을 때 접미사 배열 대신 행의 값을 직접 검사)"""
+        value_ids = csr_codes(self.postings.offsets)
+        order = np.argsort(self.postings.rows, kind='stable')
+        self.row_values = value_ids[order]
+        self.row_offsets = np.zeros(self.num_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.postings.rows, minlength=self.num_rows), out=self.row_offsets[1:])
+
+    @staticmethod
+    def _value_postings(df: pd.DataFrame, fields: List[str]) -> CsrPostings:
+        """모든 검색 필드의 (casefold 한 값, 행 번호) 쌍 -> 값별 포스팅"""
+        values, rows = [], []
+        for field in fields:
+            column = pd.Series(df[field].to_numpy(dtype=object))
+            present = column.notna().to_numpy()
+            text = column[present].astype(str).str.casefold().str.replace(SEPARATOR, ' ', regex=False)
+            values.append(text.to_numpy(dtype=object))
+            rows.append(np.flatnonzero(present))
+        return CsrPostings(np.concatenate(values), np.concatenate(rows).astype(np.int64))
+
+    def updated(self, diff, added_df: pd.DataFrame) -> 'SubstringIndex':
+        """
+        재로드된 카탈로그용 새 색인 (self 는 수정하지 않음)
+        포스팅은 행 번호만 옮기고, 처음 보는 값만 새 접미사 배열 세그먼트로 추가
+        세그먼트가 MAX_SEGMENTS 를 넘으면 전체 값으로 하나를 다시 만든다
+        """
+        index = SubstringIndex.__new__(SubstringIndex)
+        index.fields = self.fields
+        index.num_rows = diff.num_rows
+        added = self._value_postings(added_df, self.fields)
+        index.postings = self.postings.updated(diff.id_map, added, diff.added_ids)
+        known = len(self.values)
+        index.values = self.values + list(index.postings.key_ids)[known:]
+        if len(index.values) == known:
+            index.segments = self.segments
+        elif len(self.segments) < MAX_SEGMENTS:
+            index.segments = self.segments + [SuffixSegment(index.values[known:], known)]
+        else:
+            index.segments = [SuffixSegment(index.values)]
+        index._build_row_values()
+        return index
+
+    def _find_values(self, pattern: str) -> np.ndarray:
+        """pattern 을 포함하는 값 번호 (모든 세그먼트)"""
+        return np.concatenate([segment.find(pattern) for segment in self.segments])
+
+    def match_keyword(self, keyword) -> np.ndarray:
+        """키워드를 부분 문자열로 포함하는 행 번호 (정렬됨, 빈 키워드는 매칭 없음)"""
+        pattern = normalize_keyword(keyword)
+        if not pattern or SEPARATOR in pattern:
+            return EMPTY_IDS
+        value_ids = self._find_values(pattern)
+        if not len(value_ids):
+            return EMPTY_IDS
+        offsets, rows = self.postings.offsets, self.postings.rows
+        starts = offsets[value_ids]
+        lengths = offsets[value_ids + 1] - starts
+        ends = np.cumsum(lengths)
+        if not len(ends) or not ends[-1]:
+            return EMPTY_IDS
+        positions = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1])
+        return np.unique(rows[positions])
+
+    def match_any(self, keywords) -> np.ndarray:
+        """키워드 중 하나라도 포함하는 행 번호 (정렬됨)"""
+        return union_ids([self.match_keyword(keyword) for keyword in keywords])
+
+    def estimate_any(self, keywords) -> int:
+        """매칭 행 수 상한: 키워드를 포함하는 값들의 포스팅 길이 합 (행 번호 합집합은 만들지 않음)"""
+        offsets = self.postings.offsets
+        total = 0
+        for keyword in keywords:
+            pattern = normalize_keyword(keyword)
+            if pattern and SEPARATOR not in pattern:
+                value_ids = self._find_values(pattern)
+                total += int((offsets[value_ids + 1] - offsets[value_ids]).sum())
+        return min(total, self.num_rows)
+
+    def test_any(self, keywords, ids: np.ndarray) -> np.ndarray:
+        """
+        후보 행 번호 각각이 키워드 중 하나를 포함하는지 (bool)
+        후보 행의 필드 값만 직접 검사하므로 비용이 카탈로그 크기가 아니라 후보 수에 비례
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = self.row_offsets[ids]
+        lengths = self.row_offsets[ids + 1] - starts
+        ends = np.cumsum(lengths)
+        positions = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if len(ends) else 0)
+        patterns = [normalize_keyword(k) for k in keywords]
+        patterns = [p for p in patterns if p and SEPARATOR not in p]
+        values = self.values
+        hit = np.fromiter((any(p in values[v] for p in patterns) for v in self.row_values[positions].tolist()),
+                          dtype=bool, count=len(positions))
+        matched = np.zeros(len(ids), dtype=bool)
+        matched[np.repeat(np.arange(len(ids)), lengths)[hit]] = True
+        return matched
+
+    def summary(self):
+        return {
+            "values": len(self.postings),
+            "text_length": sum(len(segment.text) for segment in self.segments),
+            "segments": len(self.segments),
+        }
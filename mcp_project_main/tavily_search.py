@@ -7,10 +7,13 @@ from typing import List, Dict, Any
 from tavily import TavilyClient
 from dotenv import load_dotenv
 
+from clue_matcher import get_clue_matchers
+
 load_dotenv()
 
 class TavilyMovieSearcher:
     def __init__(self):
+        self.clue_matchers = get_clue_matchers()  # 한국어 단서 오토마톤 (프로세스당 한 번 구축)
         api_key = os.getenv('TAVILY_API_KEY')
         if not api_key:
             print("⚠️ TAVILY_API_KEY가 설정되지 않았습니다.")
@@ -73,15 +76,10 @@ class TavilyMovieSearcher:
         # 영화 검색에 최적화된 쿼리 생성
         search_query = f"movie film {current_query}"
         
-        # 특정 키워드가 포함된 경우 추가
-        if "감옥" in context_text or "탈출" in context_text:
-            search_query += " prison escape"
-        if "액션" in context_text:
-            search_query += " action"
-        if "드라마" in context_text:
-            search_query += " drama"
-        if "코미디" in context_text:
-            search_query += " comedy"
+        # 대화에 나온 단서의 영어 검색어 추가 (dataset/korean_clues.json 의 web_query_terms, 같은 검색어는 한 번만)
+        terms = self.clue_matchers["web_query_terms"].lookup(context_text)
+        for term in dict.fromkeys(term for group in terms for term in group):
+            search_query += f" {term}"
         
         return search_query
     
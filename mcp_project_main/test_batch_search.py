@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+배치 검색 (search_movies_many) 테스트: 개별 호출과 같은 결과, 배치 안에서 같은 조건은 한 번만 매칭
+(처리량은 python benchmarks.py batch)
+"""
+
+import itertools
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from movie_data_manager import MovieDataManager
+from search_index import PersonIndex
+from substring_index import SubstringIndex
+from test_sqlite_backend import QUERY_CORPUS
+
+# 배치 자체의 동작을 보기 위해 결과 캐시는 끔
+manager = MovieDataManager(use_cache=False)
+
+# 질의 확장처럼 키워드 세트와 장르/평점 조건이 겹치는 100개 쿼리
+EXPANSION_KEYWORDS = [['prison'], ['prison', 'escape'], ['escape', 'jail'], ['war'], ['space', 'galaxy'],
+                      ['love'], ['family'], ['crime', 'mafia'], ['batman'], ['dream']]
+EXPANSION_FILTERS = [{}, {'genre': 'Drama'}, {'min_rating': 8.0}, {'genre': 'Crime', 'min_rating': 8.0},
+                     {'decade': '90s'}, {'actor': 'hanks'}, {'director': 'nolan'}, {'certificate': 'R'},
+                     {'rank_by': 'relevance'}, {'genre': 'Drama', 'rank_by': 'relevance', 'top_n': 5}]
+EXPANSION_QUERIES = [{'keywords': keywords, **filters}
+                     for keywords, filters in itertools.product(EXPANSION_KEYWORDS, EXPANSION_FILTERS)]
+
+
+def test_batch_matches_individual_calls():
+    queries = QUERY_CORPUS + EXPANSION_QUERIES + [{'keywords': ['prison'], 'rank_by': 'relevance', 'max_rating': 8.5}]
+    for query, actual in zip(queries, manager.search_movies_many(queries)):
+        expected = manager.search_movies(**query)
+        assert actual.index.tolist() == expected.index.tolist(), query
+        pd.testing.assert_frame_equal(actual, expected)
+    print(f"✅ {len(queries)}개 쿼리 배치 결과가 개별 호출과 일치")
+
+
+def test_batch_validates_parameters():
+    assert manager.search_movies_many([]) == []
+    with pytest.raises(TypeError):
+        manager.search_movies_many([{'keyword': ['prison']}])
+    results = manager.search_movies_many([{'genre': 'Drama'}, {'genre': 'Drama', 'top_n': 3}], top_n=5)
+    assert [len(r) for r in results] == [5, 3]
+
+
+def test_batch_matches_each_condition_once():
+    assert len(EXPANSION_QUERIES) == 100
+    keyword_calls, person_calls = [], []
+    match_keyword, match_rows = SubstringIndex.match_keyword, PersonIndex.match_rows
+
+    def counted_keyword(index, keyword):
+        keyword_calls.append(keyword)
+        return match_keyword(index, keyword)
+
+    def counted_person(index, name, *args, **kwargs):
+        person_calls.append(name)
+        return match_rows(index, name, *args, **kwargs)
+
+    with mock.patch.object(SubstringIndex, 'match_keyword', counted_keyword), \
+            mock.patch.object(PersonIndex, 'match_rows', counted_person):
+        manager.search_movies_many(EXPANSION_QUERIES)
+    # 100개 쿼리에 키워드는 서로 다른 12개, 인물은 2명 - 조건마다 한 번씩만 매칭
+    assert sorted(keyword_calls) == sorted({k for keywords in EXPANSION_KEYWORDS for k in keywords})
+    assert sorted(person_calls) == ['hanks', 'nolan']
+
+
+if __name__ == "__main__":
+    test_batch_matches_individual_calls()
+    test_batch_validates_parameters()
+    test_batch_matches_each_condition_once()
+    print("🎉 배치 검색 테스트 완료!")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+영화별 확률 (믿음 상태) 테스트: 단서 추출 (부정, 연대, 영어 단어 경계), 갱신 결과가 단서별 가능도비의 합과 같은지,
+잘못 기억한 단서에도 정답이 남는지, 카탈로그가 바뀌면 다시 시작, 줄거리 단서를 한 쿼리로 묶는지
+(갱신 시간은 python benchmarks.py belief)
+"""
+
+import types
+from unittest import mock
+
+import numpy as np
+
+from belief_state import CLUE_WEIGHTS, BeliefState, extract_clues, prior_log_belief
+from movie_data_manager import MovieDataManager
+from search_index import release_decades
+
+manager = MovieDataManager(use_cache=False)
+
+
+def _titles(belief, k=5):
+    rows, _ = belief.top(k)
+    return manager.catalog.df['Series_Title'].iloc[rows].tolist()
+
+
+def test_extract_clues():
+    assert extract_clues("크리스토퍼 놀란 감독 영화인데 공포는 아니고 90년대였던 것 같아") == [
+        ('person', 'Christopher Nolan', False), ('genre', 'Horror', True), ('decade', 1990, False)]
+    # 부정은 가장 가까운 단서에만, 절이 바뀌면 부정하지 않음
+    assert extract_clues("액션 말고 SF, 1994년 개봉") == [
+        ('genre', 'Action', True), ('genre', 'Sci-Fi', False), ('decade', 1990, False)]
+    assert extract_clues("not a horror, dream heist with DiCaprio") == [
+        ('genre', 'Horror', True), ('plot', 'dream', False), ('plot', 'heist', False),
+        ('plot', 'with', False), ('plot', 'dicaprio', False)]
+    # 영어 단서는 단어 경계에서만 ('award' 안의 'war' 는 장르가 아님)
+    assert ('genre', 'War', False) not in extract_clues("an award winning film")
+    assert extract_clues("감옥에서 탈출") == [('plot', 'prison jail shawshank', False),
+                                          ('plot', 'escape break breakout', False)]
+    assert extract_clues("") == []
+
+
+def test_update_adds_clue_log_likelihoods():
+    catalog = manager.catalog
+    belief = BeliefState()
+    clues = [('genre', 'Drama', False), ('genre', 'Horror', True), ('decade', 1990, False),
+             ('person', 'Morgan Freeman', False), ('plot', 'prison escape', False), ('plot', 'zombie', True)]
+    assert belief.update(catalog, clues) == len(clues)
+
+    expected = prior_log_belief(catalog).astype(np.float64)
+    df = catalog.df
+    expected += CLUE_WEIGHTS['genre'] * df['Genre_List'].apply(lambda genres: 'Drama' in genres).to_numpy()
+    expected -= CLUE_WEIGHTS['genre'] * df['Genre_List'].apply(lambda genres: 'Horror' in genres).to_numpy()
+    expected += CLUE_WEIGHTS['decade'] * (release_decades(df['Released_Year']) == 1990).fillna(False).to_numpy()
+    stars = df[['Director', 'Star1', 'Star2', 'Star3', 'Star4']].eq('Morgan Freeman').any(axis=1).to_numpy()
+    expected += CLUE_WEIGHTS['person'] * stars
+    expected += CLUE_WEIGHTS['plot'] * catalog.tfidf.scores('prison escape')
+    expected -= CLUE_WEIGHTS['plot'] * catalog.tfidf.scores('zombie')
+    expected = np.exp(expected - expected.max())
+    expected /= expected.sum()
+
+    probabilities = belief.probabilities()
+    assert abs(probabilities.sum() - 1) < 1e-4
+    assert np.allclose(probabilities, expected, rtol=1e-3, atol=1e-7)
+    rows, top = belief.top(5)
+    assert rows.tolist() == np.argsort(-expected, kind='stable')[:5].tolist()
+    assert np.all(np.diff(top) <= 0)
+    assert _titles(belief, 1) == ['The Shawshank Redemption']
+    summary = belief.summary()
+    assert summary['turns'] == 1 and len(summary['clues']) == len(clues)
+    assert 1 <= summary['effective_candidates'] < len(catalog.df)
+
+
+def test_turns_accumulate_and_tolerate_wrong_clue():
+    belief = BeliefState()
+    for text in ("감옥에서 탈출하는 영화", "모건 프리먼 나왔어", "2000년대 영화였나"):
+        belief.update(manager.catalog, extract_clues(text))
+    # 연대를 잘못 기억해도 (1994년 개봉) 잘라내지 않으므로 상위에 남음
+    assert 'The Shawshank Redemption' in _titles(belief)
+    assert belief.turns == 3
+    before = belief.log_belief.copy()
+    # 맞는 영화가 없는 단서는 반영하지 않음
+    assert belief.update(manager.catalog, [('person', 'Nobody Zzzz', False), ('plot', 'xyzzy', False)]) == 0
+    assert np.array_equal(belief.log_belief, before) and belief.turns == 3
+    # 부정된 장르는 그 장르 영화의 확률을 낮춤
+    drama = manager.catalog.genre_bitmaps.postings.get('drama')
+    belief.update(manager.catalog, extract_clues("드라마는 아니야"))
+    assert np.all(belief.log_belief[drama] < before[drama])
+    belief.reset()
+    assert belief.turns == 0 and not len(belief.top()[0])
+
+
+def test_catalog_change_restarts_from_prior():
+    belief = BeliefState()
+    belief.update(manager.catalog, [('genre', 'Drama', False)])
+    changed = types.SimpleNamespace(**vars(manager.catalog))
+    changed.content_hash = 'other-hash'
+    belief.update(changed, [('genre', 'Horror', False)])
+    assert belief.clues == [('genre', 'Horror', False)] and belief.turns == 1
+    assert belief.content_hash == 'other-hash'
+
+
+def test_update_batches_plot_clues():
+    catalog = types.SimpleNamespace(**vars(manager.catalog))
+    catalog.tfidf = mock.Mock(wraps=manager.catalog.tfidf)
+    belief = BeliefState()
+    belief.update(catalog, [])
+    # 사전 확률을 만든 뒤에는 데이터프레임을 다시 보지 않고 색인만 조회
+    catalog.df = None
+    clues = extract_clues("not a comedy, dream heist with DiCaprio, 90년대, 좀비는 아니고")
+    assert sum(kind == 'plot' for kind, _, _ in clues) >= 3
+    belief.update(catalog, clues)
+    # 줄거리 단서는 긍정/부정별로 TF-IDF 쿼리 한 번씩
+    queries = [call.args[0] for call in catalog.tfidf.scores.call_args_list]
+    assert len(queries) == len({negated for kind, _, negated in clues if kind == 'plot'})
+    assert queries[0] == 'dream heist with dicaprio'
+
+
+if __name__ == "__main__":
+    test_extract_clues()
+    test_update_adds_clue_log_likelihoods()
+    test_turns_accumulate_and_tolerate_wrong_clue()
+    test_catalog_change_restarts_from_prior()
+    test_update_batches_plot_clues()
+    print("🎉 영화별 확률 테스트 완료!")
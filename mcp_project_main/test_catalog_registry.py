@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+공용 카탈로그 레지스트리 테스트
+"""
+
+import threading
+import tracemalloc
+from unittest import mock
+
+import catalog_registry
+from catalog_registry import INDEX_NAMES, Catalog, get_catalog
+from movie_data_manager import MovieDataManager
+
+
+def test_handles_share_one_catalog():
+    first, second = MovieDataManager(), MovieDataManager()
+    assert first.catalog is second.catalog
+    assert first.df is second.df and first.planner is second.planner
+    assert first.search_movies(director='Christopher Nolan').equals(second.search_movies(director='Christopher Nolan'))
+
+
+def test_concurrent_first_access_loads_once():
+    catalog_registry.clear_catalogs()
+    builds = []
+    original = catalog_registry.Catalog.__init__
+
+    def counting_init(self, csv_path):
+        builds.append(csv_path)
+        original(self, csv_path)
+
+    results = []
+    with mock.patch.object(catalog_registry.Catalog, '__init__', counting_init):
+        threads = [threading.Thread(target=lambda: results.append(get_catalog())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(builds) == 1
+    assert all(catalog is results[0] for catalog in results)
+
+
+def test_indexes_are_built_on_first_use():
+    catalog = Catalog()
+    assert catalog.built_indexes() == [] and catalog.load_stats['index_build_ms'] == {}
+    assert catalog.load_stats['cold_start_ms'] == catalog.load_stats['load_ms']
+    manager = MovieDataManager(catalog=catalog, use_cache=False)
+    manager.search_movies(director='Christopher Nolan')
+    assert 'person_index' in catalog.built_indexes()
+    assert not {'substring_index', 'bm25', 'tfidf', 'title_index', 'neighbor_graph'} & set(catalog.built_indexes())
+    manager.search_movies(keywords=['dream'], rank_by='relevance')
+    assert {'substring_index', 'bm25'} <= set(catalog.built_indexes())
+    assert set(catalog.load_stats['index_build_ms']) == set(catalog.built_indexes())
+    assert catalog.build_indexes().built_indexes() == INDEX_NAMES
+
+
+def test_concurrent_first_use_builds_index_once():
+    catalog = Catalog()
+    builds = []
+    original = catalog_registry.BM25Index
+
+    def counting_bm25(df):
+        builds.append(len(df))
+        return original(df)
+
+    with mock.patch.object(catalog_registry, 'BM25Index', counting_bm25):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(catalog.bm25)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(builds) == 1
+    assert all(index is results[0] for index in results)
+
+
+def test_memory_stays_flat_as_handles_grow():
+    MovieDataManager().catalog.build_indexes()  # 카탈로그 로드 + 색인 구축을 측정 전에 끝냄
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    handles = [MovieDataManager() for _ in range(200)]
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"✅ 핸들 {len(handles)}개 추가 메모리: {grown / 1024:.1f}KB")
+    assert grown < 200 * 1024
+
+
+if __name__ == "__main__":
+    test_handles_share_one_catalog()
+    test_concurrent_first_access_loads_once()
+    test_indexes_are_built_on_first_use()
+    test_concurrent_first_use_builds_index_once()
+    test_memory_stays_flat_as_handles_grow()
+    print("🎉 공용 카탈로그 레지스트리 테스트 완료!")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+카탈로그 핫 리로드 테스트: CSV 레코드 분할, 바뀐 레코드만 파싱, 증분 갱신 결과가 전체 재구축과 같은지,
+색인 병합은 처음 쓸 때, 이전 버전 유지, 백그라운드 갱신 스레드의 교체 (요청은 재로드를 기다리지 않음)
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import catalog_registry
+from catalog_diff import CsvRecords
+from catalog_registry import DEFAULT_CSV_PATH, Catalog, get_catalog, refresh_catalogs
+from movie_data_manager import MovieDataManager
+from test_sqlite_backend import QUERY_CORPUS
+
+MERGED_INDEXES = {'substring_index', 'genre_bitmaps', 'certificate_bitmaps', 'decade_bitmaps', 'person_index',
+                  'bm25', 'title_index', 'tfidf'}
+
+RELOAD_QUERIES = QUERY_CORPUS + [
+    {'keywords': ['zyxquux']},
+    {'keywords': ['zyxquux', 'hobbit'], 'rank_by': 'relevance'},
+    {'keywords': ['ring', 'empire'], 'rank_by': 'relevance', 'top_n': 20},
+    {'genre': 'Zombieland'},
+    {'director': 'kershner'},
+    {'director': 'newdirector'},
+    {'actor': 'unknown actorname'},
+    {'actor': 'mark hamill'},
+]
+
+
+def _copy_catalog(directory):
+    path = os.path.join(directory, 'imdb_top_1000.csv')
+    shutil.copy(DEFAULT_CSV_PATH, path)
+    return path
+
+
+def _edit_catalog(path):
+    """한 행 수정, 한 행 삭제, 새 인물/장르/단어가 있는 행 하나 추가"""
+    raw = pd.read_csv(path, dtype=str)
+    raw.loc[5, 'Overview'] = 'A retired hacker named Zyxquux returns for one last ring.'
+    raw.loc[5, 'Director'] = 'Newdirector Person'
+    raw = raw.drop(index=16)  # Irvin Kershner 의 유일한 작품
+    new_row = raw.iloc[0].copy()
+    new_row['Series_Title'] = 'Brand New Zyxfilm'
+    new_row['Genre'] = 'Drama, Zombieland'
+    new_row['Star1'] = 'Unknown Actorname'
+    new_row['IMDB_Rating'] = '9.9'
+    raw = pd.concat([raw, new_row.to_frame().T], ignore_index=True)
+    raw.to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _assert_same_search(updated, rebuilt):
+    left = MovieDataManager(updated.csv_path, catalog=updated, use_cache=False)
+    right = MovieDataManager(rebuilt.csv_path, catalog=rebuilt, use_cache=False)
+    for query in RELOAD_QUERIES:
+        pd.testing.assert_frame_equal(left.search_movies(**query), right.search_movies(**query), obj=str(query))
+    pd.testing.assert_frame_equal(left.find_titles('Brand New Zyxflim'), right.find_titles('Brand New Zyxflim'))
+    expected = right.search_by_description('hacker ring return', top_n=10)
+    actual = left.search_by_description('hacker ring return', top_n=10)
+    assert actual.index.tolist() == expected.index.tolist()
+    assert np.allclose(actual['Similarity'], expected['Similarity'], atol=1e-4)
+    assert left.person_index.movies_of('jackson') == right.person_index.movies_of('jackson')
+    assert updated.stats.frequencies == rebuilt.stats.frequencies
+
+
+def test_csv_records_match_read_csv():
+    data = (b'Title,Overview,Rating\r\n'
+            b'A,"two\nlines, with ""quotes""",7.5\r\n'
+            b'\r\n'
+            b'B,plain,8\n'
+            b'C,"",9')
+    records = CsvRecords(data)
+    assert records.header == b'Title,Overview,Rating'
+    assert records.records() == [b'A,"two\nlines, with ""quotes""",7.5', b'B,plain,8', b'C,"",9']
+    assert len(records) == len(pd.read_csv(io.BytesIO(data)))
+    assert records.parse([2, 0])['Title'].tolist() == ['C', 'A']
+    bundled = CsvRecords.read(DEFAULT_CSV_PATH)
+    assert len(bundled) == len(pd.read_csv(DEFAULT_CSV_PATH))
+    # 같은 내용이면 같은 해시 (프로세스와 무관한 pandas 해시)
+    assert np.array_equal(CsvRecords(bundled.data).hashes, bundled.hashes)
+
+
+def test_incremental_reload_matches_full_rebuild():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        catalog = Catalog(path).build_indexes()
+        assert catalog.record_hashes is not None
+        _edit_catalog(path)
+        with mock.patch.object(catalog_registry, 'normalize_catalog',
+                               side_effect=catalog_registry.normalize_catalog) as normalize:
+            updated = catalog.reloaded()
+        reload_stats = updated.load_stats['reload']
+        assert reload_stats['mode'] == 'incremental'
+        assert (reload_stats['added'], reload_stats['removed']) == (2, 2)
+        assert updated.version == 2 and updated.content_hash != catalog.content_hash
+        # 바뀐/추가된 두 레코드만 파싱/정규화
+        assert [len(call.args[0]) for call in normalize.call_args_list] == [2]
+        # 색인은 재로드 때 만들지 않고 병합만 걸어 둠
+        assert updated.built_indexes() == [] and set(updated.pending_merges()) == MERGED_INDEXES
+        rebuilt = Catalog(path)
+        pd.testing.assert_frame_equal(updated.df, rebuilt.df)
+        assert np.array_equal(updated.record_hashes, rebuilt.record_hashes)
+        _assert_same_search(updated, rebuilt)
+        assert set(updated.load_stats['index_merge_ms']) == MERGED_INDEXES and not updated.pending_merges()
+        print(f"✅ 증분 재로드 {reload_stats['reload_ms']}ms (색인 병합 "
+              f"{sum(updated.load_stats['index_merge_ms'].values()):.0f}ms), "
+              f"전체 색인 구축 {sum(rebuilt.load_stats['index_build_ms'].values()):.0f}ms")
+
+
+def test_reload_updates_only_built_indexes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        catalog = Catalog(path)
+        MovieDataManager(path, catalog=catalog, use_cache=False).search_movies(director='kershner')
+        built = catalog.built_indexes()
+        assert 'person_index' in built and 'bm25' not in built
+        _edit_catalog(path)
+        updated = catalog.reloaded()
+        # 재로드는 쓰던 색인만 병합하고, 나머지는 새 버전에서 처음 쓸 때 구축
+        assert set(updated.pending_merges()) == set(built) & MERGED_INDEXES
+        _edit_catalog(path)  # 병합하기 전에 한 번 더 바뀌면 병합 대기가 이어짐
+        newer = updated.reloaded()
+        assert newer.version == 3 and newer.pending_merges() == updated.pending_merges()
+        _assert_same_search(newer, Catalog(path))
+        assert 'person_index' in newer.load_stats['index_merge_ms']
+        assert 'bm25' in newer.load_stats['index_build_ms']
+
+
+def test_changed_columns_fall_back_to_full_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        catalog = Catalog(path)
+        raw = pd.read_csv(path, dtype=str).rename(columns={'Poster_Link': 'Poster'})
+        raw.to_csv(path, index=False)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        updated = catalog.reloaded()
+        assert updated.load_stats['reload']['mode'] == 'full'
+        assert 'Poster' in updated.df.columns
+
+
+def test_previous_version_stays_usable():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        catalog = Catalog(path)
+        before = MovieDataManager(path, catalog=catalog, use_cache=False).search_movies(director='kershner')
+        _edit_catalog(path)
+        updated = catalog.reloaded()
+        assert updated is not catalog and catalog.version == 1
+        # 진행 중인 검색이 쥐고 있는 이전 버전은 그대로
+        pd.testing.assert_frame_equal(
+            MovieDataManager(path, catalog=catalog, use_cache=False).search_movies(director='kershner'), before)
+        assert len(before) == 1
+        assert MovieDataManager(path, catalog=updated, use_cache=False).search_movies(director='kershner').empty
+        # 내용이 같으면 (수정 시각만 바뀜) 새 버전을 만들지 않음
+        os.utime(path)
+        assert updated.reloaded() is updated
+
+
+def test_registry_swaps_in_new_version():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        manager = MovieDataManager(path)
+        first = manager.catalog
+        assert manager.search_movies(genre='Zombieland').empty
+        _edit_catalog(path)
+        # 요청 경로는 변경을 확인하지 않음 (갱신 스레드가 교체할 때까지 이전 버전)
+        with mock.patch.object(catalog_registry, 'RELOAD_CHECK_SECONDS', -1):
+            assert get_catalog(path) is first
+            refresh_catalogs()
+        assert len(manager.search_movies(genre='Zombieland')) == 1
+        assert manager.catalog is get_catalog(path) and manager.catalog.version == first.version + 1
+        assert manager.query_cache.invalidations > 0
+        # 이전 버전에서 쓰던 색인은 교체 후 미리 병합됨
+        assert not manager.catalog.pending_merges()
+        assert set(first.built_indexes()) <= set(manager.catalog.built_indexes())
+
+
+def test_requests_do_not_wait_for_reload():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        first = get_catalog(path)
+        _edit_catalog(path)
+        started, release = threading.Event(), threading.Event()
+        original = Catalog.reloaded
+
+        def slow_reloaded(catalog):
+            started.set()
+            release.wait(10)
+            return original(catalog)
+
+        with mock.patch.object(Catalog, 'reloaded', slow_reloaded), \
+                mock.patch.object(catalog_registry, 'RELOAD_CHECK_SECONDS', -1):
+            refresher = threading.Thread(target=refresh_catalogs)
+            refresher.start()
+            assert started.wait(10)
+            # 재로드 중에도 현재 버전을 바로 받음
+            begin = time.perf_counter()
+            assert get_catalog(path) is first
+            assert time.perf_counter() - begin < 0.5
+            release.set()
+            refresher.join(10)
+        assert get_catalog(path).version == first.version + 1
+
+
+def test_background_refresher_picks_up_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = _copy_catalog(directory)
+        with mock.patch.object(catalog_registry, 'RELOAD_CHECK_SECONDS', 0.05):
+            first = get_catalog(path)
+            _edit_catalog(path)
+            deadline = time.monotonic() + 30
+            while get_catalog(path) is first and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert get_catalog(path).version == first.version + 1
+
+
+if __name__ == "__main__":
+    test_csv_records_match_read_csv()
+    test_incremental_reload_matches_full_rebuild()
+    test_reload_updates_only_built_indexes()
+    test_changed_columns_fall_back_to_full_reload()
+    test_previous_version_stays_usable()
+    test_registry_swaps_in_new_version()
+    test_requests_do_not_wait_for_reload()
+    test_background_refresher_picks_up_changes()
+    print("🎉 카탈로그 핫 리로드 테스트 완료!")
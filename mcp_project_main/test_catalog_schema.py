@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+카탈로그 컬럼 타입 정규화 테스트
+"""
+
+import json
+
+import pandas as pd
+
+from catalog_schema import format_count, format_runtime, movie_records, normalize_catalog
+from movie_data_manager import MovieDataManager
+
+manager = MovieDataManager()
+raw = pd.read_csv('dataset/imdb_top_1000.csv')
+
+
+def test_numeric_strings_become_nullable_integers():
+    df = manager.df
+    shawshank = df[df['Series_Title'] == 'The Shawshank Redemption'].iloc[0]
+    assert shawshank['Runtime'] == 142 and shawshank['Gross'] == 28341469 and shawshank['Released_Year'] == 1994
+    assert str(df['Runtime'].dtype) == 'Int16' and str(df['Gross'].dtype) == 'Int64'
+    # 잘못된 연도 ('PG') 와 결측 수익/메타스코어는 결측 마스크로
+    assert df['Released_Year'].isna().sum() == (pd.to_numeric(raw['Released_Year'], errors='coerce').isna()).sum()
+    assert df['Gross'].isna().sum() == raw['Gross'].isna().sum()
+    assert df['Meta_score'].isna().sum() == raw['Meta_score'].isna().sum()
+    assert format_runtime(shawshank['Runtime']) == raw.loc[shawshank.name, 'Runtime']
+    assert format_count(shawshank['Gross']) == raw.loc[shawshank.name, 'Gross']
+    # 숫자 필터/정렬은 네이티브 배열에서 바로
+    long_movies = df[df['Runtime'] >= 200].sort_values('Runtime', ascending=False)
+    assert long_movies['Runtime'].is_monotonic_decreasing and len(long_movies) > 0
+
+
+def test_repeated_strings_are_dictionary_encoded():
+    df = manager.df
+    for column in ['Certificate', 'Director', 'Star1']:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        assert (df[column].astype(object).fillna('') == raw[column].fillna('')).all()
+    stats = manager.load_stats
+    print(f"✅ 메모리: 원본 {stats['raw_bytes'] / 1024:.0f}KB -> 정규화 {stats['normalized_bytes'] / 1024:.0f}KB")
+    assert stats['normalized_bytes'] < stats['raw_bytes']
+
+
+def test_missing_strings_stay_missing():
+    df = normalize_catalog(raw)
+    for column in ['Certificate', 'Star4', 'Overview', 'Series_Title']:
+        assert (df[column].isna() == raw[column].isna()).all(), column
+    assert 'nan' not in df['Certificate'].cat.categories
+    # 전부 비어 있는 컬럼 (None) 도 'None' 문자열이 되지 않음
+    empty = normalize_catalog(pd.DataFrame({'Certificate': [None, 'PG'], 'Overview': [None, None],
+                                            'Gross': [None, '1,000']}))
+    assert empty['Certificate'].isna().tolist() == [True, False]
+    assert empty['Overview'].tolist() == ['', '']
+    assert empty['Gross'].isna().tolist() == [True, False]
+
+
+def test_records_are_json_serializable():
+    records = movie_records(normalize_catalog(raw))
+    text = json.dumps(records, ensure_ascii=False)
+    assert 'NaN' not in text
+    assert any(record['Released_Year'] is None for record in records)
+
+
+if __name__ == "__main__":
+    test_numeric_strings_become_nullable_integers()
+    test_repeated_strings_are_dictionary_encoded()
+    test_missing_strings_stay_missing()
+    test_records_are_json_serializable()
+    print("🎉 컬럼 타입 정규화 테스트 완료!")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+카탈로그 바이너리 스냅샷 테스트
+"""
+
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from catalog_schema import normalize_catalog
+from catalog_snapshot import build_snapshot, load_catalog, read_manifest
+
+CSV_PATH = 'dataset/imdb_top_1000.csv'
+
+
+def _temp_catalog():
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'movies.csv')
+    shutil.copy(CSV_PATH, csv_path)
+    return directory, csv_path
+
+
+def test_snapshot_round_trip_matches_csv():
+    directory, csv_path = _temp_catalog()
+    try:
+        snapshot_dir = os.path.join(directory, 'snapshot')
+        build_snapshot(csv_path, snapshot_dir)
+        df, stats = load_catalog(csv_path, snapshot_dir)
+        assert stats['source'] == 'snapshot'
+        expected = normalize_catalog(pd.read_csv(csv_path))
+        pd.testing.assert_frame_equal(df.drop(columns='Genre_List'), expected)
+        assert df['Genre_List'].iloc[0] == [g.strip() for g in expected['Genre'].iloc[0].split(',')]
+        # 숫자 컬럼은 복사 없이 메모리 매핑된 파일을 가리킴
+        assert not df['IMDB_Rating'].to_numpy().flags.writeable
+        print(f"✅ 스냅샷 로드 {stats['load_ms']}ms")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_stale_snapshot_falls_back_to_csv_and_rebuilds():
+    directory, csv_path = _temp_catalog()
+    try:
+        snapshot_dir = os.path.join(directory, 'snapshot')
+        _, first = load_catalog(csv_path, snapshot_dir)
+        assert first['source'] == 'csv' and first['snapshot_built']
+        old_hash = read_manifest(snapshot_dir)['csv_sha256']
+
+        # CSV 내용이 바뀌면 스냅샷은 무효
+        df = pd.read_csv(csv_path)
+        df.loc[0, 'IMDB_Rating'] = 1.0
+        df.to_csv(csv_path, index=False)
+        stale, second = load_catalog(csv_path, snapshot_dir)
+        assert second['source'] == 'csv'
+        assert stale.loc[0, 'IMDB_Rating'] == 1.0
+        assert read_manifest(snapshot_dir)['csv_sha256'] != old_hash
+
+        fresh, third = load_catalog(csv_path, snapshot_dir)
+        assert third['source'] == 'snapshot'
+        assert fresh.loc[0, 'IMDB_Rating'] == 1.0
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_cold_start_is_reported():
+    from movie_data_manager import MovieDataManager
+    stats = MovieDataManager().load_stats
+    assert stats['source'] in ('snapshot', 'csv')
+    assert stats['cold_start_ms'] >= stats['load_ms'] > 0
+    print(f"✅ 콜드 스타트 {stats['cold_start_ms']}ms (로드 {stats['load_ms']}ms, {stats['source']})")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip_matches_csv()
+    test_stale_snapshot_falls_back_to_csv_and_rebuilds()
+    test_cold_start_is_reported()
+    print("🎉 카탈로그 스냅샷 테스트 완료!")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+한국어 단서 매처 테스트: 겹치는 패턴, 부분 문자열 검사와 같은 결과 (사전 크기별 매칭 시간은 python benchmarks.py clues)
+"""
+
+import random
+
+from clue_matcher import ClueMatcher, get_clue_matchers
+
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 40)] + list('ab ')
+
+
+def _random_text(rng, length):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(length))
+
+
+def test_overlapping_patterns():
+    matcher = ClueMatcher({'he': 1, 'she': 2, 'his': 3, 'hers': 4, '반지': 5, '반지의 제왕': 6})
+    assert [(end, matcher.patterns[i]) for end, i in matcher.finditer('ushers')] == [(4, 'she'), (4, 'he'), (6, 'hers')]
+    assert matcher.lookup('반지의 제왕 같은 HIS 영화') == [3, 5, 6]
+    assert matcher.first('ahishers') == 'his'
+    assert matcher.first('없음') is None
+
+
+def test_matches_substring_scan():
+    rng = random.Random(7)
+    patterns = {_random_text(rng, rng.randint(1, 4)).strip() or 'a': i for i in range(500)}
+    matcher = ClueMatcher(patterns)
+    for _ in range(200):
+        text = _random_text(rng, rng.randint(0, 60))
+        expected = [pattern for pattern in matcher.patterns if pattern.casefold() in text.casefold()]
+        assert matcher.find(text) == expected, text
+
+
+def test_bundled_clues():
+    matchers = get_clue_matchers()
+    assert get_clue_matchers() is matchers  # 한 번만 구축
+    keywords = matchers['keywords'].lookup('크리스토퍼 놀란 감독의 감옥 탈출 sf 영화')
+    assert keywords == [['prison', 'jail', 'shawshank'], ['escape', 'break', 'breakout'],
+                        ['sci-fi', 'science fiction'], ['Christopher Nolan', 'Nolan']]
+    assert matchers['modern_indicators'].first('2024년 넷플릭스 좀비 영화') == '2024'
+    assert matchers['web_query_terms'].lookup('감옥에서 탈출하는 액션') == [['prison escape'], ['prison escape'], ['action']]
+
+
+if __name__ == "__main__":
+    test_overlapping_patterns()
+    test_matches_substring_scan()
+    test_bundled_clues()
+    print("🎉 한국어 단서 매처 테스트 완료!")
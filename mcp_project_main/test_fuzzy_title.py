@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+트라이그램 제목 검색 테스트 (조회 시간은 python benchmarks.py titles)
+"""
+
+import pandas as pd
+
+from fuzzy_title import TitleTrigramIndex
+from movie_data_manager import MovieDataManager
+
+manager = MovieDataManager()
+
+
+def test_misspelled_titles_resolve():
+    cases = {
+        'Shawshenk': 'The Shawshank Redemption',
+        'interstelar': 'Interstellar',
+        'godfather': 'The Godfather',
+        'Amelie': 'Amélie',
+        'the dark knight': 'The Dark Knight',
+    }
+    for query, expected in cases.items():
+        results = manager.find_titles(query)
+        assert results.iloc[0]['Series_Title'] == expected, (query, results['Series_Title'].tolist())
+        print(f"✅ '{query}' -> {expected} (유사도 {results.iloc[0]['Similarity']})")
+    assert manager.find_titles('xyzzy qwerty').empty
+
+
+def test_trigram_lookup_at_scale():
+    titles = manager.df['Series_Title'].to_numpy()
+    repeats = 100
+    large = pd.Series([f"{title} {i}" for i in range(repeats) for title in titles])
+    index = TitleTrigramIndex(large)
+    row_ids, similarities = index.search('Shawshenk Redemtion', limit=5)
+    assert len(row_ids) == 5 and all(large[row_id].startswith('The Shawshank Redemption') for row_id in row_ids)
+    assert list(similarities) == sorted(similarities, reverse=True)
+
+
+if __name__ == "__main__":
+    test_misspelled_titles_resolve()
+    test_trigram_lookup_at_scale()
+    print("🎉 트라이그램 제목 검색 테스트 완료!")
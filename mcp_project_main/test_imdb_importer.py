@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+IMDb TSV 덤프 가져오기 테스트 (합성 덤프 사용, 네트워크 불필요)
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from imdb_importer import generate_synthetic_dumps, import_catalog, write_catalog
+from movie_data_manager import MovieDataManager
+
+MIN_VOTES = 50
+
+
+def _read_full(path):
+    return pd.read_csv(path, sep='\t', dtype=str, na_values=['\\N'], keep_default_na=False, quoting=csv.QUOTE_NONE)
+
+
+def _reference_catalog(paths):
+    """청크 없이 전체를 읽어 pandas merge 로 만든 기대값 (제목 -> 행)"""
+    basics, ratings = _read_full(paths['basics']), _read_full(paths['ratings'])
+    principals, names = _read_full(paths['principals']), _read_full(paths['names'])
+    ratings = ratings[ratings['numVotes'].astype(int) >= MIN_VOTES]
+    movies = basics[(basics['titleType'] == 'movie') & (basics['isAdult'] != '1')].merge(ratings, on='tconst')
+    credits = principals[principals['tconst'].isin(movies['tconst'])].merge(names, on='nconst')
+    credits = credits.assign(ordering=credits['ordering'].astype(int)).sort_values(['tconst', 'ordering'])
+    directors = credits[credits['category'] == 'director'].groupby('tconst')['primaryName'].first()
+    stars = credits[credits['category'].isin(['actor', 'actress'])].groupby('tconst')['primaryName'].agg(list)
+    movies = movies.set_index('tconst')
+    return {
+        row['primaryTitle']: {
+            'rating': float(row['averageRating']),
+            'votes': int(row['numVotes']),
+            'director': directors.get(tconst),
+            'stars': stars.get(tconst, [])[:4],
+        }
+        for tconst, row in movies.iterrows()
+    }
+
+
+def test_streaming_import_matches_full_join():
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generate_synthetic_dumps(directory, num_titles=3000, seed=7)
+        catalog = import_catalog(directory, min_votes=MIN_VOTES, chunk_size=700)
+        expected = _reference_catalog(paths)
+        assert len(catalog) == len(expected)
+        for _, movie in catalog.iterrows():
+            reference = expected[movie['Series_Title']]
+            assert movie['IMDB_Rating'] == reference['rating'] and movie['No_of_Votes'] == reference['votes']
+            assert (movie['Director'] if pd.notna(movie['Director']) else None) == reference['director']
+            stars = [movie[f'Star{i}'] for i in range(1, 5) if pd.notna(movie[f'Star{i}'])]
+            assert stars == reference['stars'], movie['Series_Title']
+        ratings = catalog['IMDB_Rating'].tolist()
+        assert ratings == sorted(ratings, reverse=True)
+        print(f"✅ {len(catalog):,}개 영화 조인 일치")
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_imported_catalog_is_searchable():
+    directory = tempfile.mkdtemp()
+    try:
+        generate_synthetic_dumps(directory, num_titles=2000, seed=3)
+        output = os.path.join(directory, 'catalog.csv')
+        write_catalog(import_catalog(directory, min_votes=MIN_VOTES), output)
+        manager = MovieDataManager(output)
+        assert str(manager.df['Runtime'].dtype) == 'Int16' and manager.df['Overview'].notna().all()
+
+        director = manager.df['Director'].dropna().iloc[0]
+        results = manager.search_movies(director=director, top_n=50)
+        assert len(results) > 0 and (results['Director'] == director).all()
+        title = manager.df['Series_Title'].iloc[5]
+        assert manager.find_titles(title).iloc[0]['Series_Title'] == title
+        genre_results = manager.search_movies(keywords=['prison'], genre='Drama', top_n=5)
+        assert genre_results['Genre_List'].apply(lambda g: 'Drama' in g).all()
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_peak_memory_is_bounded_by_chunk_size():
+    directory = tempfile.mkdtemp()
+    try:
+        paths = generate_synthetic_dumps(directory, num_titles=20000, seed=1)
+        tracemalloc.start()
+        _read_full(paths['principals'])
+        full_read_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        catalog = import_catalog(directory, min_votes=1000, chunk_size=2000)
+        import_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"✅ principals 전체 읽기 {full_read_peak / 2**20:.1f}MB vs 청크 가져오기 {import_peak / 2**20:.1f}MB "
+              f"({len(catalog):,}개 영화)")
+        assert import_peak < full_read_peak / 2
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    test_streaming_import_matches_full_join()
+    test_imported_catalog_is_searchable()
+    test_peak_memory_is_bounded_by_chunk_size()
+    print("🎉 IMDb 덤프 가져오기 테스트 완료!")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+MovieDataManager 검색 인덱스 테스트
+인덱스 기반 검색 결과가 전체 스캔 결과와 같은지 확인
+"""
+
+import pandas as pd
+
+from catalog_registry import SEARCH_FIELDS
+from movie_data_manager import MovieDataManager
+from query_planner import QueryPlan, RatingRangePredicate
+
+manager = MovieDataManager()
+
+
+def _scan_keyword_titles(keywords):
+    """인덱스 없이 전체 행을 훑어서 키워드 부분 문자열 매칭 결과 계산"""
+    titles = set()
+    for _, movie in manager.df.iterrows():
+        for keyword in keywords:
+            pattern = keyword.casefold()
+            if pattern and any(not pd.isna(movie[field]) and pattern in str(movie[field]).casefold()
+                               for field in SEARCH_FIELDS):
+                titles.add(movie['Series_Title'])
+    return titles
+
+
+def test_keyword_index_matches_scan():
+    keyword_sets = [
+        ['prison'], ['Nolan'], ['dark knight'], ['mafia', 'godfather'],
+        ['space', 'galaxy'], ['tom hanks'], ['zzzznotaword'], ['dark kni', '(500) Days'],
+    ]
+    for keywords in keyword_sets:
+        results = manager.search_movies(keywords=keywords, top_n=len(manager.df))
+        assert set(results['Series_Title']) == _scan_keyword_titles(keywords), keywords
+        print(f"✅ {keywords}: {len(results)}개")
+
+
+def test_keyword_results_sorted_by_rating():
+    results = manager.search_movies(keywords=['war'], top_n=20)
+    ratings = results['IMDB_Rating'].tolist()
+    assert ratings == sorted(ratings, reverse=True)
+    assert len(results) == 20
+
+
+def test_categorical_bitmap_filters():
+    df = manager.df
+    all_rows = len(df)
+    genres = df['Genre_List'].apply(lambda x: [g.lower() for g in x])
+
+    drama = manager.search_movies(genre='drama', top_n=all_rows)
+    assert len(drama) == genres.apply(lambda x: 'drama' in x).sum()
+
+    crime_drama = manager.search_movies(genre='Crime and Drama', top_n=all_rows)
+    expected = genres.apply(lambda x: 'crime' in x and 'drama' in x).sum()
+    assert len(crime_drama) == expected
+    assert len(manager.search_movies(genre='Crime, Drama', top_n=all_rows)) == expected
+
+    pg13 = manager.search_movies(certificate='PG-13', top_n=all_rows)
+    assert len(pg13) == (df['Certificate'] == 'PG-13').sum()
+
+    nineties = manager.search_movies(decade='1990s', top_n=all_rows)
+    years = nineties['Released_Year'].astype(int)
+    assert len(nineties) > 0 and years.between(1990, 1999).all()
+    assert len(manager.search_movies(decade='90년대', top_n=all_rows)) == len(nineties)
+
+    assert manager.search_movies(genre='NotAGenre').empty
+    print(f"✅ Drama {len(drama)}개, Crime+Drama {len(crime_drama)}개, 1990년대 {len(nineties)}개")
+
+
+def test_person_index_lookups():
+    df = manager.df
+    all_rows = len(df)
+    stars = ['Star1', 'Star2', 'Star3', 'Star4']
+
+    nolan = manager.search_movies(director='Nolan', top_n=all_rows)
+    assert len(nolan) == df['Director'].str.contains('Nolan').sum()
+
+    hanks = manager.search_movies(actor='tom hanks', top_n=all_rows)
+    expected = df[stars].apply(lambda col: col.str.lower() == 'tom hanks').any(axis=1).sum()
+    assert len(hanks) == expected
+
+    # 배우로 검색할 때 감독 역할은 포함하지 않음
+    assert manager.search_movies(actor='Christopher Nolan').empty
+
+    roles = manager.person_index.movies_of('Christopher Nolan')['christopher nolan']
+    assert {role for _, role in roles} == {0}
+    print(f"✅ Nolan 감독 {len(nolan)}개, Tom Hanks 출연 {len(hanks)}개")
+
+
+def test_person_filters_match_substring_filter():
+    # 기존 필터 (소문자 이름의 부분 문자열, Star1~4 중 하나) 와 같은 행 집합
+    df = pd.read_csv('dataset/imdb_top_1000.csv')
+    stars = ['Star1', 'Star2', 'Star3', 'Star4']
+    for query in ['son', 'an', 'de', 'e', 'Nolan', 'tom hanks', 'Penélope', 'é', ' de ', 'jr.', 'zzz']:
+        director = df['Director'].str.lower().str.contains(query.lower(), na=False, regex=False)
+        actor = df[stars].apply(lambda col: col.str.lower().str.contains(query.lower(), na=False, regex=False))
+        assert set(manager.search_movies(director=query, top_n=len(df)).index) == set(df.index[director]), query
+        assert set(manager.search_movies(actor=query, top_n=len(df)).index) == set(df.index[actor.any(axis=1)]), query
+
+
+def test_top_k_matches_full_sort():
+    df = manager.df
+    queries = [
+        dict(), dict(min_rating=8.5), dict(max_rating=8.0, min_rating=7.9),
+        dict(genre='Drama'), dict(keywords=['love'], max_rating=8.0), dict(actor='Robert De Niro'),
+    ]
+    for params in queries:
+        for top_n in (1, 5, 30):
+            results = manager.search_movies(top_n=top_n, **params)
+            full = manager.search_movies(top_n=len(df), **params)
+            # 동점은 원래 행 순서를 유지한 전체 정렬과 같아야 함
+            expected = full.sort_values('IMDB_Rating', ascending=False, kind='stable').head(top_n)
+            assert list(results.index) == list(expected.index), (params, top_n)
+    assert manager.search_movies(min_rating=9.5).empty
+
+
+def test_search_does_not_copy_catalog():
+    import tracemalloc
+    catalog_bytes = manager.df.memory_usage(deep=True).sum()
+    manager.search_movies(genre='Drama')  # 첫 호출 시 지연 초기화 제외
+    for params in (dict(), dict(genre='Crime and Drama'), dict(keywords=['war']), dict(actor='Tom Hanks', min_rating=8)):
+        tracemalloc.start()
+        manager.search_movies(top_n=5, **params)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < catalog_bytes * 0.05, (params, peak)
+        print(f"✅ {params}: 최대 할당 {peak:,} bytes (카탈로그 {catalog_bytes:,} bytes)")
+
+
+def test_query_planner_order():
+    plan = manager.plan_query(keywords=['war', 'love'], director='Nolan', genre='Drama')
+    assert plan.strategy == 'candidates'
+    assert plan.driver.name == 'director'
+    # 키워드 매칭 행은 미리 계산되므로 검사 비용이 같고, 더 선택적인 조건부터 적용
+    assert [p.name for p in plan.filters] == ['keywords', 'genre']
+    assert plan.filters[0].estimate < plan.filters[1].estimate
+    print(plan.explain())
+
+    plan = manager.plan_query(genre='Drama')
+    assert plan.strategy == 'rating_walk'
+
+    # 전략과 관계없이 결과는 같아야 함
+    predicates = manager._predicates(keywords=['war'], genre='Drama')
+    rating_range = manager.rating_order.rating_range(8.0, None)
+    walk = QueryPlan('rating_walk', None, predicates, rating_range, manager.rating_order, {})
+    candidates = QueryPlan('candidates', predicates[0], predicates[1:] + [RatingRangePredicate(manager.rating_order, rating_range)],
+                           rating_range, manager.rating_order, {})
+    assert list(walk.execute(5)) == list(candidates.execute(5))
+    assert list(walk.execute(5)) == list(manager.search_movies(keywords=['war'], genre='Drama', min_rating=8.0, top_n=5).index)
+
+
+if __name__ == "__main__":
+    test_keyword_index_matches_scan()
+    test_keyword_results_sorted_by_rating()
+    test_categorical_bitmap_filters()
+    test_person_index_lookups()
+    test_person_filters_match_substring_filter()
+    test_top_k_matches_full_sort()
+    test_search_does_not_copy_catalog()
+    test_query_planner_order()
+    print("🎉 MovieDataManager 검색 인덱스 테스트 완료!")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+줄거리 벡터 ANN (IVF) 색인 테스트: 모든 목록을 검사하면 잠재 공간 정확 검색과 같음,
+정확한 TF-IDF 검색 대비 recall@10 (재점수화 전후, nprobe 맞춤), 저장 후 메모리 매핑 로드,
+recall 목표를 넘을 때만 묘사 검색이 자동 전환, 대규모 합성 벡터에서 점수화하는 후보 수
+(지연 시간은 python benchmarks.py ann)
+"""
+
+from unittest import mock
+
+import numpy as np
+
+from movie_data_manager import MovieDataManager
+import movie_data_manager
+import plot_ann
+from plot_ann import IvfIndex, PlotAnnIndex, benchmark, description_queries, lsa_components, synthetic_vectors
+
+manager = MovieDataManager()
+
+
+def _queries(count=100, seed=0):
+    return description_queries(manager.df['Overview'].to_numpy(dtype=object), count, seed)
+
+
+def test_full_probe_matches_exact_search():
+    _, vectors = lsa_components(manager.tfidf)
+    assert np.allclose(np.linalg.norm(vectors[vectors.any(axis=1)], axis=1), 1.0, atol=1e-5)
+    index = IvfIndex.build(vectors, nlist=40)
+    assert index.nlist == 40 and sorted(index.list_ids.tolist()) == list(range(len(vectors)))
+    for row in (0, 17, 512):
+        ids, scores = index.search(vectors[row], k=10, nprobe=index.nlist)
+        expected = np.argsort(-(vectors @ vectors[row]), kind='stable')[:10]
+        assert ids[0] == row and set(ids.tolist()) == set(expected.tolist())
+        assert np.all(np.diff(scores) <= 1e-6)
+        assert ids.tolist() == index.exact_search(vectors[row], k=10)[0].tolist()
+
+
+def test_recall_is_measured_against_tfidf_search():
+    tfidf = manager.tfidf
+    index = PlotAnnIndex.build(tfidf, nlist=30)
+    queries = _queries(seed=1)
+    report = benchmark(index, queries, nprobes=(1, 4, 30))
+    recalls = [row['recall@10'] for row in report[:-1]]
+    print(f"✅ TF-IDF 검색 대비 recall@10 (nprobe 1/4/30): {recalls}")
+    assert recalls[0] < recalls[-1] and recalls[-1] >= plot_ann.ANN_RECALL_TARGET
+    assert report[-1]['nprobe'] == 'exact'
+    # 결과 유사도는 정확한 TF-IDF 코사인 (같은 행이면 정확 검색과 같은 값)
+    ids, scores = index.search(queries[0], 10, nprobe=30)
+    assert np.array_equal(scores, tfidf.scores(queries[0])[ids])
+    # 잠재 공간 유사도만으로 고르면 (재점수화 후보 = k) 모든 목록을 검사해도 정확 검색 상위 10개를 절반 정도만 찾음
+    latent_only = PlotAnnIndex(tfidf, index.ivf, index.components, tfidf.terms(), rerank=10)
+    assert latent_only.measure_recall(queries, nprobe=30) < 0.6
+
+
+def test_calibrate_picks_smallest_nprobe_meeting_target():
+    index = PlotAnnIndex.build(manager.tfidf, nlist=30, queries=_queries())
+    assert index.recall >= plot_ann.ANN_RECALL_TARGET and index.meets_target
+    nprobe = index.ivf.nprobe
+    if nprobe > 1:
+        # 바로 앞 단계 (두 배씩 늘리므로 nprobe 미만의 가장 큰 2의 거듭제곱) 는 목표 미달
+        previous = 1 << ((nprobe - 1).bit_length() - 1)
+        assert index.measure_recall(_queries(), previous) < plot_ann.ANN_RECALL_TARGET
+    # 목표를 넘지 못하면 모든 목록을 검사하고 측정값만 기록
+    assert index.calibrate(_queries(), target=1.01) == index.recall < 1.01
+    assert index.ivf.nprobe == index.ivf.nlist
+    with mock.patch.object(plot_ann, 'ANN_RECALL_TARGET', 1.01):
+        assert not index.meets_target
+
+
+def test_saved_index_is_memory_mapped(tmp_path):
+    catalog = manager.catalog
+    index = PlotAnnIndex.build(catalog.tfidf, nlist=30)
+    index.save(str(tmp_path / 'ivf'), catalog.content_hash)
+    loaded = PlotAnnIndex.load(catalog.tfidf, str(tmp_path / 'ivf'), catalog.content_hash)
+    assert isinstance(loaded.ivf.vectors, np.memmap)
+    assert (loaded.rerank, loaded.recall) == (index.rerank, index.recall)
+    for text in ('two men in prison become friends', 'space war young pilot', 'xyzzy'):
+        expected, loaded_result = index.search(text, 10, nprobe=8), loaded.search(text, 10, nprobe=8)
+        assert expected[0].tolist() == loaded_result[0].tolist()
+        assert np.allclose(expected[1], loaded_result[1])
+    try:
+        PlotAnnIndex.load(catalog.tfidf, str(tmp_path / 'ivf'), 'other-hash')
+        assert False, "내용 해시가 다른 색인을 읽으면 안 됨"
+    except ValueError:
+        pass
+
+
+def test_description_search_uses_ann():
+    description = 'two men in prison become friends over many years'
+    exact = manager.search_by_description(description, top_n=5, approximate=False)
+    approximate = manager.search_by_description(description, top_n=5, approximate=True,
+                                                nprobe=manager.catalog.plot_index.ivf.nlist)
+    assert approximate.index.tolist() == exact.index.tolist()
+    assert approximate['Similarity'].tolist() == exact['Similarity'].tolist()
+    # 작은 카탈로그는 기본으로 정확 검색
+    assert manager.search_by_description(description, top_n=5).index.tolist() == exact.index.tolist()
+    assert manager.search_by_description('xyzzy qwerty', approximate=True).empty
+
+
+def test_automatic_switch_requires_recall_target():
+    description = 'two men in prison become friends over many years'
+    plot_index = manager.catalog.plot_index
+    assert manager.catalog.load_stats['plot_index_recall'] == plot_index.recall
+    with mock.patch.object(movie_data_manager, 'ANN_MIN_ROWS', 0), \
+            mock.patch.object(PlotAnnIndex, 'search', autospec=True, side_effect=PlotAnnIndex.search) as search:
+        with mock.patch.object(plot_index, 'recall', plot_ann.ANN_RECALL_TARGET - 0.1):
+            manager.search_by_description(description)
+        assert search.call_count == 0
+        with mock.patch.object(plot_index, 'recall', plot_ann.ANN_RECALL_TARGET):
+            manager.search_by_description(description)
+        assert search.call_count == 1
+
+
+def test_search_scores_only_probed_lists():
+    vectors = synthetic_vectors(100000)
+    index = IvfIndex.build(vectors)
+    queries = vectors[np.random.default_rng(3).choice(len(vectors), 20, replace=False)]
+    sizes = np.diff(index.list_offsets)
+    largest = np.sort(sizes)[::-1][:index.nprobe].sum()
+    with mock.patch.object(IvfIndex, '_top_k', autospec=True, side_effect=IvfIndex._top_k) as top_k:
+        for query in queries:
+            index.search(query, k=10)
+    scored = [len(call.args[1]) for call in top_k.call_args_list]
+    # 점수화하는 벡터는 nprobe 개 목록 (가장 큰 목록들의 합 이하) 뿐, 전체의 일부
+    assert len(scored) == len(queries) and max(scored) <= largest
+    assert max(scored) * 5 < len(vectors)
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_full_probe_matches_exact_search()
+    test_recall_is_measured_against_tfidf_search()
+    test_calibrate_picks_smallest_nprobe_meeting_target()
+    with tempfile.TemporaryDirectory() as directory:
+        test_saved_index_is_memory_mapped(pathlib.Path(directory))
+    test_description_search_uses_ann()
+    test_automatic_switch_requires_recall_target()
+    test_search_scores_only_probed_lists()
+    print("🎉 줄거리 벡터 ANN 색인 테스트 완료!")
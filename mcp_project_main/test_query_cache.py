@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+검색 결과 캐시 테스트: 정규화 키, LRU/TTL 축출, 내용 해시 무효화, 히트는 검색을 실행하지 않음
+(히트 속도는 python benchmarks.py cache)
+"""
+
+from unittest import mock
+
+import pandas as pd
+
+from movie_data_manager import MovieDataManager
+from query_cache import QueryCache
+
+manager = MovieDataManager()
+
+
+def test_normalized_keys_share_entries():
+    cache = manager.query_cache
+    cache.clear()
+    first = manager.search_movies(keywords=['Prison', 'escape'], genre='Drama, Crime', director='Frank DARABONT')
+    hits = cache.hits
+    second = manager.search_movies(keywords=['ESCAPE', 'prison', 'prison'], genre='crime and drama',
+                                   director='frank darabont')
+    assert cache.hits == hits + 1
+    pd.testing.assert_frame_equal(first, second)
+    # 다른 결과를 내는 검색은 다른 키
+    manager.search_movies(keywords=['prison', 'escape'], top_n=3)
+    manager.search_movies(keywords=['prison', 'escape'], rank_by='relevance')
+    assert cache.hits == hits + 1
+
+
+def test_cached_results_are_not_shared_objects():
+    query = {'director': 'Christopher Nolan'}
+    expected = MovieDataManager(use_cache=False).search_movies(**query)
+    results = manager.search_movies(**query)
+    results['Series_Title'] = 'changed'
+    results['Extra'] = 1
+    pd.testing.assert_frame_equal(manager.search_movies(**query), expected)
+
+
+def test_lru_ttl_and_content_hash_invalidation():
+    now = [0.0]
+    cache = QueryCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.bind('v1')
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)  # 가장 오래 안 쓴 'b' 축출
+    assert cache.get('b') is None and cache.evictions == 1
+    now[0] = 11.0
+    assert cache.get('a') is None and cache.expirations == 1
+    cache.put('d', 4)
+    cache.bind('v2')
+    assert cache.get('d') is None and cache.invalidations == 2
+    assert cache.stats()['misses'] == 3 and cache.stats()['hits'] == 1
+
+
+def test_repeated_query_skips_search():
+    query = {'actor': 'Tom Hanks', 'genre': 'Drama'}
+    manager.query_cache.clear()
+    hits = manager.query_cache.hits
+    with mock.patch.object(MovieDataManager, '_search', autospec=True, side_effect=MovieDataManager._search) as search:
+        first = manager.search_movies(**query)
+        for _ in range(5):
+            again = manager.search_movies(**query)
+        uncached = MovieDataManager(use_cache=False)
+        for _ in range(2):
+            uncached.search_movies(**query)
+    # 캐시 사용 핸들은 처음 한 번만, 캐시 미사용 핸들은 매번 검색
+    assert search.call_count == 3
+    assert manager.query_cache.hits - hits == 5
+    pd.testing.assert_frame_equal(again, first)
+
+
+if __name__ == "__main__":
+    test_normalized_keys_share_entries()
+    test_cached_results_are_not_shared_objects()
+    test_lru_ttl_and_content_hash_invalidation()
+    test_repeated_query_skips_search()
+    print("🎉 검색 결과 캐시 테스트 완료!")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+검색 커서 테스트: 페이지를 이어 붙이면 한 번에 검색한 결과와 같은지 (두 백엔드), 만료/잘못된 커서,
+다음 페이지는 앞 페이지 행을 다시 훑지 않음 (시간 비교는 python benchmarks.py cursor)
+"""
+
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from movie_data_manager import MovieDataManager
+from search_cursor import decode_cursor
+
+PAGED_QUERIES = [
+    {'genre': 'Drama'},
+    {'genre': 'Drama', 'min_rating': 8.2, 'max_rating': 8.6},
+    {'keywords': ['war']},
+    {'keywords': ['war', 'love'], 'rank_by': 'relevance'},
+    {'keywords': ['police'], 'genre': 'Crime', 'rank_by': 'relevance'},
+    {'director': 'Nolan'},
+    {'actor': 'Tom Hanks', 'certificate': ['U', 'UA']},
+]
+
+managers = {backend: MovieDataManager(backend=backend) for backend in ('pandas', 'sqlite')}
+
+
+def _pages(manager, query, page_size):
+    page = manager.search_movies(top_n=page_size, **query)
+    pages = [page]
+    while page.attrs['next_cursor']:
+        page = manager.search_movies(cursor=page.attrs['next_cursor'])
+        assert len(page) <= page_size
+        pages.append(page)
+    return pages
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'sqlite'])
+def test_pages_match_single_query(backend):
+    manager = managers[backend]
+    for query in PAGED_QUERIES:
+        expected = manager.search_movies(top_n=1000, **query)
+        pages = _pages(manager, query, 7)
+        assert len(pages) == len(expected) // 7 + 1, query
+        # sqlite 결과의 범주형 컬럼은 페이지마다 범주 집합이 달라 이어 붙이면 문자열이 됨
+        pd.testing.assert_frame_equal(pd.concat(pages), expected, check_dtype=False, check_categorical=False,
+                                      obj=str(query))
+
+
+def test_expired_and_malformed_cursor():
+    manager = managers['pandas']
+    token = manager.search_movies(genre='Drama', top_n=5).attrs['next_cursor']
+    cursor = decode_cursor(token)
+    assert cursor.query['genre'] == 'Drama' and cursor.after_score is None
+
+    cursor.content_hash = 'stale-catalog'
+    with pytest.raises(ValueError, match='만료'):
+        manager.search_movies(cursor=cursor.encode())
+    with pytest.raises(ValueError, match='백엔드'):
+        managers['sqlite'].search_movies(cursor=token)
+    with pytest.raises(ValueError):
+        manager.search_movies(cursor='not-a-cursor')
+
+
+def test_deep_page_resumes_without_rescanning():
+    manager = MovieDataManager(use_cache=False)
+    query = {'genre': 'Drama'}
+    first = manager.search_movies(top_n=500, **query)
+    with mock.patch.object(MovieDataManager, '_plan', autospec=True, side_effect=MovieDataManager._plan) as plan:
+        page = manager.search_movies(cursor=first.attrs['next_cursor'])
+    # 평점순 순회를 마지막으로 반환한 행의 평점 순위 다음부터 시작 (앞의 500행은 다시 보지 않음)
+    rating_rank = manager.catalog.rating_order.rank
+    assert plan.call_count == 1
+    assert plan.call_args.kwargs['start_rank'] == rating_rank[first.index[-1]] + 1 >= 500
+    assert (rating_rank[page.index] > rating_rank[first.index[-1]]).all()
+    sliced = manager.search_movies(top_n=1000, **query).iloc[500:1000]
+    pd.testing.assert_frame_equal(page, sliced)
+
+
+if __name__ == "__main__":
+    test_pages_match_single_query('pandas')
+    test_pages_match_single_query('sqlite')
+    test_expired_and_malformed_cursor()
+    test_deep_page_resumes_without_rescanning()
+    print("🎉 검색 커서 테스트 완료!")
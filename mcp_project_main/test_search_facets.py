@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+검색 결과 패싯 테스트: 전체 매칭 행에 대한 개수가 직접 센 값과 같은지, 두 백엔드/배치 결과 일치, 검색당 한 번만 세는지
+(지연 시간은 python benchmarks.py facets)
+"""
+
+from unittest import mock
+
+from facets import rating_buckets
+from movie_data_manager import MovieDataManager
+from search_index import release_decades
+from test_sqlite_backend import QUERY_CORPUS
+
+manager = MovieDataManager(use_cache=False)
+
+
+def _expected_facets(matches):
+    """매칭 행 전체를 value_counts 로 직접 센 개수"""
+    counts = {
+        'genre': matches['Genre_List'].explode().value_counts(),
+        'decade': release_decades(matches['Released_Year']).value_counts(),
+        'director': matches['Director'].astype(object).value_counts(),
+        'certificate': matches['Certificate'].astype(object).value_counts(),
+        'rating': matches['IMDB_Rating'].groupby(rating_buckets(matches['IMDB_Rating'])).size(),
+    }
+    return {name: {value: int(count) for value, count in series.items()} for name, series in counts.items()}
+
+
+def test_facets_match_full_result_counts():
+    for query in QUERY_CORPUS:
+        results = manager.search_movies(facets=True, **query)
+        facets = results.attrs['facets']
+        matches = manager.search_movies(**{**query, 'top_n': len(manager)})
+        assert facets['total'] == len(matches), query
+        expected = _expected_facets(matches)
+        for name, counts in expected.items():
+            top = facets[name]
+            assert len(top) == min(10, len(counts)), (query, name)
+            # 반환된 값은 개수 내림차순 상위 값이고 개수가 정확함
+            assert all(counts[value] == count for value, count in top.items()), (query, name)
+            assert list(top.values()) == sorted(counts.values(), reverse=True)[:len(top)], (query, name)
+        # 패싯을 요청해도 결과 행은 같음
+        assert list(results.index) == list(matches.index[:len(results)])
+
+
+def test_backends_and_batch_agree():
+    sqlite = MovieDataManager(backend='sqlite', use_cache=False)
+    queries = [{**query, 'facets': True} for query in QUERY_CORPUS]
+    for query, batched in zip(queries, manager.search_movies_many(queries)):
+        single = manager.search_movies(**query).attrs['facets']
+        assert batched.attrs['facets'] == single, query
+        assert sqlite.search_movies(**query).attrs['facets'] == single, query
+    assert 'facets' not in manager.search_movies(genre='Drama').attrs
+
+
+def test_facets_counted_once_per_search():
+    facets = manager.catalog.facets
+    with mock.patch.object(facets, 'counts', wraps=facets.counts) as counts:
+        manager.search_movies(genre='Drama', top_n=5)
+        assert counts.call_count == 0
+        results = manager.search_movies(genre='Drama', top_n=5, facets=True)
+    # 화면에 보일 5개가 아니라 매칭된 전체 행을 한 번만 셈
+    assert counts.call_count == 1
+    assert len(counts.call_args.args[0]) == results.attrs['facets']['total'] > 5
+
+
+if __name__ == "__main__":
+    test_facets_match_full_result_counts()
+    test_backends_and_batch_agree()
+    test_facets_counted_once_per_search()
+    print("🎉 검색 결과 패싯 테스트 완료!")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+세션 후보 집합 테스트: 턴마다 좁힌 집합이 조건 매칭의 교집합인지, 모순된 단서에서 넓히기,
+후보 집합 안 검색이 전체 검색 필터링과 같은지 (두 백엔드, 커서 포함), 커서에는 보관한 후보 집합의 키만,
+좁힐 때 평가한 조건은 결과 페이지에서 다시 평가하지 않음, 흔한 키워드도 후보 행만 검사
+(시간 비교는 python benchmarks.py candidates)
+"""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from movie_data_manager import MovieDataManager
+from search_index import intersect_ids
+from search_cursor import decode_cursor
+from session_candidates import MAX_STORED_SETS, CandidateScope, CandidateSet, store_candidates
+from substring_index import SubstringIndex
+
+manager = MovieDataManager(use_cache=False)
+sqlite_manager = MovieDataManager(backend='sqlite', use_cache=False)
+
+TURNS = [{'keywords': ['war', 'love']}, {'genre': 'Drama'}, {'decade': '1990s'}]
+
+
+def test_narrowing_intersects_turns():
+    candidates = CandidateSet()
+    expected = []
+    for turn in TURNS:
+        assert candidates.narrow(manager, turn) == 0
+        expected.append(manager.match_ids(**turn))
+        assert np.array_equal(candidates.ids, intersect_ids(expected)), turn
+    assert candidates.turns == len(TURNS)
+    assert 0 < len(candidates) < len(manager.match_ids(**TURNS[0]))
+    # 조건이 없으면 그대로
+    before = candidates.ids
+    assert candidates.narrow(manager, {'keywords': []}) is None
+    assert candidates.ids is before
+
+
+def test_contradicting_clue_widens():
+    candidates = CandidateSet()
+    candidates.narrow(manager, {'director': 'Nolan'})
+    candidates.narrow(manager, {'genre': 'Sci-Fi'})
+    narrowed = candidates.ids
+    # 놀란 감독의 SF 중에는 없지만 놀란 감독 영화 중에는 있는 배우 -> 한 단계 되돌림
+    assert candidates.narrow(manager, {'actor': 'Heath Ledger'}) == 1
+    assert np.array_equal(candidates.ids, manager.match_ids(director='Nolan', actor='Heath Ledger'))
+    assert not np.isin(candidates.ids, narrowed).all()
+    assert candidates.turns == 2
+    # 어느 집합과도 맞지 않는 배우 -> 전체 카탈로그에서 다시 좁힘
+    assert candidates.narrow(manager, {'actor': 'Tom Hanks'}) == 2
+    assert np.array_equal(candidates.ids, manager.match_ids(actor='Tom Hanks'))
+    assert candidates.turns == 1
+    # 카탈로그 전체에서도 매칭이 없으면 그대로
+    before = candidates.ids
+    assert candidates.narrow(manager, {'keywords': ['zzzznotaword']}) is None
+    assert candidates.ids is before
+    candidates.widen()
+    assert not candidates.is_narrowed and len(candidates) == 0
+
+
+def test_history_is_bounded():
+    candidates = CandidateSet(max_history=2)
+    for turn in TURNS + [{'min_rating': 7.5}]:
+        candidates.narrow(manager, turn)
+    assert candidates.turns == 3
+    # 보관하지 않은 오래된 단계를 건너뛰어 전체 카탈로그에서 다시 좁힘
+    assert candidates.narrow(manager, {'keywords': ['zzzz', 'batman']}) == 3
+    assert np.array_equal(candidates.ids, manager.match_ids(keywords=['batman']))
+
+
+def test_search_within_matches_filtered_search():
+    within = manager.match_ids(genre='Drama', decade='1990s')
+    queries = [{'keywords': ['love']}, {'keywords': ['war', 'family'], 'rank_by': 'relevance'},
+               {'min_rating': 8.0}, {}, {'actor': 'hanks'}]
+    for query in queries:
+        for current in (manager, sqlite_manager):
+            actual = current.search_movies(top_n=5, within=within, facets=True, **query)
+            expected = current.search_movies(top_n=5, genre='Drama', decade='1990s', facets=True, **query)
+            assert actual.index.tolist() == expected.index.tolist(), (current.backend, query)
+            assert actual.attrs['facets'] == expected.attrs['facets'], (current.backend, query)
+    assert manager.search_movies(within=[]).empty and sqlite_manager.search_movies(within=[]).empty
+
+
+def test_cursor_and_batch_keep_within():
+    within = manager.match_ids(keywords=['war'])
+    pages = [manager.search_movies(top_n=4, within=within)]
+    while pages[-1].attrs['next_cursor']:
+        pages.append(manager.search_movies(cursor=pages[-1].attrs['next_cursor']))
+    combined = pd.concat(pages)
+    expected = manager.search_movies(top_n=len(within), keywords=['war'])
+    assert combined.index.tolist() == expected.index.tolist()
+
+    queries = [{'within': within, 'genre': 'Drama'}, {'within': within.tolist(), 'keywords': ['love']}]
+    for query, actual in zip(queries, manager.search_movies_many(queries)):
+        assert actual.index.tolist() == manager.search_movies(**query).index.tolist()
+
+
+def test_cursor_carries_only_candidate_key():
+    small, large = manager.match_ids(director='Nolan'), manager.match_ids(min_rating=7.0)
+    tokens = [manager.search_movies(top_n=3, within=ids).attrs['next_cursor'] for ids in (small, large)]
+    # 후보 수와 무관한 길이, 행 번호 대신 '세션 id.해시' 키
+    assert len(large) > 10 * len(small) and abs(len(tokens[0]) - len(tokens[1])) <= 4 and len(tokens[1]) < 200
+    assert decode_cursor(tokens[1]).query['within'].startswith('-.')
+
+    candidates = CandidateSet('session-1')
+    candidates.narrow(manager, {'genre': 'Drama'})
+    first = manager.search_movies(top_n=3, genre='Drama', within=candidates)
+    key = decode_cursor(first.attrs['next_cursor']).query['within']
+    assert key.startswith('session-1.')
+    # 보관 수를 넘겨 버려진 후보 집합의 커서는 만료
+    for i in range(MAX_STORED_SETS):
+        store_candidates(CandidateScope([i]))
+    try:
+        manager.search_movies(cursor=first.attrs['next_cursor'])
+        assert False, "만료된 커서가 통과됨"
+    except ValueError as e:
+        assert '만료' in str(e)
+
+
+def test_narrowed_ids_are_reused_for_results():
+    turn = {'keywords': ['love', 'war'], 'genre': 'Drama'}
+    calls = []
+    original = {name: getattr(SubstringIndex, name) for name in ('match_any', 'test_any')}
+
+    def counted(name):
+        def call(index, *args, **kwargs):
+            calls.append(name)
+            return original[name](index, *args, **kwargs)
+        return call
+
+    for rank_by in ('rating', 'relevance'):
+        candidates = CandidateSet()
+        with mock.patch.object(SubstringIndex, 'match_any', counted('match_any')), \
+                mock.patch.object(SubstringIndex, 'test_any', counted('test_any')):
+            calls.clear()
+            candidates.narrow(manager, turn)
+            narrowed = len(calls)
+            pages = [manager.search_movies(top_n=4, rank_by=rank_by, facets=True, within=candidates, **turn)]
+            pages.append(manager.search_movies(cursor=pages[0].attrs['next_cursor']))
+        # 키워드 조건은 좁힐 때 한 번만 평가 (결과 페이지와 다음 페이지는 좁힌 행 번호를 그대로 사용)
+        assert narrowed == 1 and len(calls) == 1, (rank_by, calls)
+        expected = manager.search_movies(top_n=8, rank_by=rank_by, facets=True, **turn)
+        assert pd.concat(pages).index.tolist() == expected.index.tolist(), rank_by
+        assert pages[0].attrs['facets'] == expected.attrs['facets']
+    # 조건이 다르면 후보 집합 안에서 평가
+    other = manager.search_movies(top_n=50, keywords=['family'], within=candidates)
+    assert other.index.isin(candidates.ids).all()
+    assert other.index.tolist() == manager.search_movies(
+        top_n=50, keywords=['family'], within=manager.match_ids(**turn)).index.tolist()
+
+
+def test_common_keywords_only_check_candidates():
+    candidates = CandidateSet()
+    candidates.narrow(manager, {'director': 'Nolan'})
+    tested = []
+    test_any = SubstringIndex.test_any
+
+    def recorded(index, keywords, ids):
+        tested.append(np.asarray(ids).copy())
+        return test_any(index, keywords, ids)
+
+    # 흔한 키워드도 전체 매칭 집합을 만들지 않고 후보 행의 필드 값만 검사 (비용이 후보 수에 비례)
+    with mock.patch.object(SubstringIndex, 'match_any', side_effect=AssertionError('전체 매칭')), \
+            mock.patch.object(SubstringIndex, 'test_any', recorded):
+        matched = manager.match_ids(keywords=['the', 'a'], within=candidates.ids)
+    assert len(tested) == 1 and np.isin(tested[0], candidates.ids).all()
+    assert np.array_equal(matched, intersect_ids([manager.match_ids(keywords=['the', 'a']), candidates.ids]))
+
+
+if __name__ == "__main__":
+    test_narrowing_intersects_turns()
+    test_contradicting_clue_widens()
+    test_history_is_bounded()
+    test_search_within_matches_filtered_search()
+    test_cursor_and_batch_keep_within()
+    test_cursor_carries_only_candidate_key()
+    test_narrowed_ids_are_reused_for_results()
+    test_common_keywords_only_check_candidates()
+    print("🎉 세션 후보 집합 테스트 완료!")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+'비슷한 영화' 이웃 그래프 테스트: 전체 쌍 직접 계산과 같은 이웃, 묶음 크기와 무관한 결과,
+흔한 특징 상한에서도 정확한 유사도, 5천 -> 2만 편 구축 비용이 선형 수준인지, 제목 조회,
+조회가 미리 계산된 행만 읽는지, 그래프의 k 보다 많이 요청하면 직접 계산, 저장 후 메모리 매핑 로드
+(조회 시간은 python benchmarks.py similar)
+"""
+
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from movie_data_manager import MovieDataManager
+from catalog_registry import Catalog
+from neighbor_graph import NeighborGraph
+
+manager = MovieDataManager()
+
+GENRES = ['Drama', 'Crime', 'Action', 'Adventure', 'Comedy', 'Romance', 'Thriller', 'Sci-Fi', 'Horror', 'Mystery']
+
+
+def _dense_similarities(graph):
+    """그래프의 특징 벡터를 밀집 행렬로 펼쳐 모든 쌍의 코사인 유사도를 직접 계산"""
+    vectors = np.zeros((graph.num_docs, len(graph.feature_offsets) - 1), dtype=np.float64)
+    rows = np.repeat(np.arange(graph.num_docs), np.diff(graph.doc_offsets))
+    vectors[rows, graph.doc_features] = graph.doc_values
+    similarities = vectors @ vectors.T
+    np.fill_diagonal(similarities, 0)
+    return similarities
+
+
+def test_graph_matches_brute_force():
+    graph = manager.catalog.neighbor_graph
+    similarities = _dense_similarities(graph)
+    k = graph.k
+    checked = 0
+    for row in range(graph.num_docs):
+        order = np.lexsort((graph.tie_rank, -similarities[row]))
+        expected = similarities[row, order[:k + 1]]
+        assert np.allclose(graph.similarities[row], expected[:k], atol=1e-5), row
+        # 경계에서 유사도가 거의 같은 이웃은 부동소수 오차로 순서가 바뀔 수 있으므로 뚜렷한 행만 순서 비교
+        if np.all(np.diff(expected) < -1e-5):
+            assert graph.neighbors[row].tolist() == order[:k].tolist(), row
+            checked += 1
+    print(f"✅ {graph.num_docs}편 중 {checked}편의 이웃 순서가 직접 계산과 같음")
+    assert checked > graph.num_docs // 2
+
+
+def test_chunking_does_not_change_graph():
+    catalog = manager.catalog
+    small = NeighborGraph(catalog.df, tie_rank=catalog.rating_order.rank, max_chunk_cells=20000)
+    assert len(list(small._chunks(20000))) > 10
+    assert np.array_equal(small.neighbors, catalog.neighbor_graph.neighbors)
+    assert np.allclose(small.similarities, catalog.neighbor_graph.similarities, atol=1e-6)
+
+
+def test_common_features_keep_exact_similarities():
+    # 상한을 낮춰 장르/자주 나오는 단어를 흔한 특징으로: 후보 쌍의 유사도는 여전히 전체 특징의 코사인
+    graph = NeighborGraph(manager.catalog.df, max_candidate_df=30)
+    assert graph.build_stats['common_features'] > 10
+    similarities = _dense_similarities(graph)
+    present = graph.neighbors >= 0
+    rows = np.nonzero(present)[0]
+    assert present.mean() > 0.95
+    assert np.allclose(graph.similarities[present], similarities[rows, graph.neighbors[present]], atol=1e-5)
+
+
+def _synthetic_catalog(num_docs, seed=0):
+    """영화 수에 비례하는 인물 수, Zipf 분포 줄거리 단어 (큰 카탈로그처럼 일부 특징이 매우 흔함)"""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f'word{i}' for i in range(num_docs)], dtype=object)
+    words = np.minimum(rng.zipf(1.3, (num_docs, 8)) - 1, num_docs - 1)
+    people = {column: [f'{column} {i}' for i in rng.integers(0, num_docs // pool, num_docs)]
+              for column, pool in (('Director', 5), ('Star1', 2), ('Star2', 2), ('Star3', 2), ('Star4', 2))}
+    return pd.DataFrame({
+        'Genre_List': [list(rng.choice(GENRES, 2, replace=False)) for _ in range(num_docs)],
+        'Overview': [' '.join(row) for row in vocab[words]],
+        **people,
+    })
+
+
+def test_build_cost_scales_linearly():
+    # 전체 쌍 계산이면 4배 많은 영화에서 곱/후보 쌍이 16배, 흔한 특징을 후보 생성에서 빼면 선형 수준
+    small = NeighborGraph(_synthetic_catalog(5000))
+    large = NeighborGraph(_synthetic_catalog(20000))
+    for stat in ('products', 'candidate_pairs'):
+        ratio = large.build_stats[stat] / small.build_stats[stat]
+        print(f"✅ 5천 -> 2만 편 {stat}: {small.build_stats[stat]:,} -> {large.build_stats[stat]:,} ({ratio:.1f}배)")
+        assert ratio < 6
+    assert large.build_stats['common_features'] > small.build_stats['common_features'] > 0
+    assert (large.neighbors[:, 0] >= 0).mean() > 0.99
+
+
+def test_similar_movies_by_title():
+    results = manager.similar_movies('Inceptoin', k=5)
+    assert results.attrs['source_title'] == 'Inception'
+    assert len(results) == 5 and 'Inception' not in results['Series_Title'].tolist()
+    assert results['Similarity'].is_monotonic_decreasing
+    # 같은 감독/출연진을 공유하는 영화가 이웃으로
+    assert (results['Director'] == 'Christopher Nolan').any()
+
+    toy_story = manager.similar_movies('Toy Story', k=3)
+    assert toy_story['Series_Title'].str.startswith('Toy Story').sum() >= 2
+
+    missing = manager.similar_movies('zzzz qqqq xxxx', k=5)
+    assert missing.empty and missing.attrs['source_title'] is None
+
+
+def test_lookup_reads_precomputed_rows():
+    graph = manager.catalog.neighbor_graph
+    rows = np.random.default_rng(0).integers(0, graph.num_docs, 200)
+    # 조회 중에는 유사도를 다시 계산하지 않음
+    with mock.patch.object(NeighborGraph, '_build_chunk', side_effect=AssertionError), \
+            mock.patch.object(NeighborGraph, '_common_scores', side_effect=AssertionError):
+        for row in rows:
+            ids, similarities = graph.neighbors_of(int(row), 10)
+            stored = graph.neighbors[row, :10]
+            assert ids.tolist() == stored[stored >= 0].tolist()
+            assert np.array_equal(similarities, graph.similarities[row, :10][stored >= 0])
+    assert not len(graph.neighbors_of(graph.num_docs)[0])
+
+
+def test_more_than_graph_k_falls_back_to_exact():
+    graph = manager.catalog.neighbor_graph
+    similarities = _dense_similarities(graph)
+    for row in np.random.default_rng(1).integers(0, graph.num_docs, 50):
+        ids, scores = graph.neighbors_of(int(row), graph.k + 30)
+        assert len(ids) == graph.k + 30 and int(row) not in ids.tolist()
+        assert np.allclose(scores, similarities[row, ids], atol=1e-5)
+        expected = np.sort(similarities[row])[::-1][:len(ids)]
+        assert np.allclose(scores, expected, atol=1e-5)
+        # 앞쪽 k 개는 그래프에 저장된 이웃과 같은 유사도
+        assert np.allclose(scores[:graph.k], graph.similarities[row], atol=1e-5)
+
+    results = manager.similar_movies('Inception', k=graph.k + 10)
+    assert len(results) == graph.k + 10 and results.attrs['exact']
+    assert results['Similarity'].is_monotonic_decreasing
+    assert not manager.similar_movies('Inception', k=graph.k).attrs['exact']
+    with pytest.raises(ValueError):
+        manager.similar_movies('Inception', k=0)
+
+
+def test_saved_graph_is_memory_mapped():
+    graph = manager.catalog.neighbor_graph
+    row_id = int(manager.df.index[manager.df['Series_Title'] == 'Inception'][0])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph')
+        graph.save(path, 'hash-a')
+        loaded = NeighborGraph.load(path, 'hash-a')
+        assert isinstance(loaded.neighbors, np.memmap) and loaded.k == graph.k
+        for k in (5, graph.k + 10):
+            for expected, actual in zip(graph.neighbors_of(row_id, k), loaded.neighbors_of(row_id, k)):
+                assert np.array_equal(expected, actual)
+        with pytest.raises(ValueError):
+            NeighborGraph.load(path, 'hash-b')
+        with pytest.raises(ValueError):
+            NeighborGraph.load(path, 'hash-a', {'genre': 2.0, 'director': 1.0, 'cast': 1.0, 'overview': 1.0})
+        with pytest.raises(ValueError):
+            NeighborGraph.load(os.path.join(directory, 'missing'), 'hash-a')
+
+
+def test_catalog_reuses_saved_graph():
+    manager.catalog.neighbor_graph  # 기본 카탈로그의 그래프를 저장 (이미 있으면 읽음)
+    catalog = Catalog()
+    with mock.patch('catalog_registry.NeighborGraph.__init__', side_effect=AssertionError('다시 구축함')):
+        graph = catalog.neighbor_graph
+    assert catalog.load_stats['neighbor_graph_source'] == 'saved'
+    assert np.array_equal(graph.neighbors, manager.catalog.neighbor_graph.neighbors)
+
+
+if __name__ == "__main__":
+    test_graph_matches_brute_force()
+    test_chunking_does_not_change_graph()
+    test_common_features_keep_exact_similarities()
+    test_build_cost_scales_linearly()
+    test_similar_movies_by_title()
+    test_lookup_reads_precomputed_rows()
+    test_more_than_graph_k_falls_back_to_exact()
+    test_saved_graph_is_memory_mapped()
+    test_catalog_reuses_saved_graph()
+    print("🎉 비슷한 영화 이웃 그래프 테스트 완료!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SQLite FTS5 백엔드 테스트: pandas 백엔드와 같은 결과를 반환하는지 (쿼리 코퍼스),
+검색/패싯/커서/배치는 메모리 카탈로그를 로드하지 않고 제목 검색은 처음 호출할 때 로드하는지
+"""
+
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+from catalog_registry import DEFAULT_CSV_PATH, loaded_catalogs
+from movie_data_manager import MovieDataManager
+
+pandas_manager = MovieDataManager(backend='pandas')
+sqlite_manager = MovieDataManager(backend='sqlite')
+
+QUERY_CORPUS = [
+    {},
+    {'top_n': 50},
+    {'keywords': ['prison']},
+    {'keywords': ['prison', 'escape'], 'top_n': 30},
+    {'keywords': ['dark knight']},
+    {'keywords': ['Nolan']},
+    {'keywords': ['space', 'galaxy'], 'top_n': 100},
+    {'keywords': ['tom hanks']},
+    {'keywords': ['zzzznotaword']},
+    {'keywords': ['!!!']},
+    {'keywords': ['love'], 'genre': 'Romance', 'min_rating': 8.0},
+    {'keywords': ['war'], 'max_rating': 7.8, 'top_n': 40},
+    {'genre': 'Drama'},
+    {'genre': 'Crime and Drama', 'min_rating': 8.5},
+    {'genre': ['Animation', 'Adventure'], 'top_n': 25},
+    {'genre': 'Western', 'decade': '60s'},
+    {'director': 'Christopher Nolan'},
+    {'director': 'nolan', 'min_rating': 8.5},
+    {'director': 'kubrick', 'top_n': 20},
+    {'director': 'Nobody Atall'},
+    {'actor': 'Tom Hanks'},
+    {'actor': 'penelope cruz'},
+    {'actor': 'Penélope', 'top_n': 20},
+    {'actor': 'son', 'top_n': 200},
+    {'director': 'an', 'top_n': 300},
+    {'actor': 'de niro', 'genre': 'Crime'},
+    {'actor': 'hanks', 'director': 'spielberg'},
+    {'certificate': 'R', 'top_n': 30},
+    {'certificate': ['PG-13', 'PG'], 'decade': 2000},
+    {'decade': '1990s', 'min_rating': 8.0, 'max_rating': 8.5, 'top_n': 100},
+    {'min_rating': 8.0, 'max_rating': 8.0, 'top_n': 200},
+    {'keywords': ['family'], 'genre': 'Comedy', 'actor': 'williams'},
+]
+
+
+def _comparable(results: pd.DataFrame) -> pd.DataFrame:
+    return results.astype(object)
+
+
+def test_backends_return_same_results():
+    for query in QUERY_CORPUS:
+        expected = pandas_manager.search_movies(**query)
+        actual = sqlite_manager.search_movies(**query)
+        assert actual.index.tolist() == expected.index.tolist(), (query, actual['Series_Title'].tolist(),
+                                                                  expected['Series_Title'].tolist())
+        pd.testing.assert_frame_equal(_comparable(actual), _comparable(expected), check_index_type=False)
+    print(f"✅ {len(QUERY_CORPUS)}개 쿼리 결과 일치")
+
+
+def test_sqlite_backend_does_not_load_catalog(tmp_path):
+    # 다른 테스트가 번들 CSV 의 카탈로그를 이미 로드했으므로 복사본 경로로 확인
+    csv_path = str(tmp_path / 'movies.csv')
+    shutil.copy(DEFAULT_CSV_PATH, csv_path)
+    key = os.path.realpath(csv_path)
+    manager = MovieDataManager(csv_path, backend='sqlite')
+    results = manager.search_movies(keywords=['prison'], genre='Drama', top_n=3, facets=True)
+    assert results.attrs['facets']['total'] > 3
+    manager.search_movies(cursor=results.attrs['next_cursor'])
+    manager.search_movies_many([{'actor': 'hanks'}, {'keywords': ['war'], 'rank_by': 'relevance', 'facets': True}])
+    assert len(manager) == len(pandas_manager.df)
+    assert key not in loaded_catalogs()
+    # 오타 허용 제목 검색 (get_movie_details 도구) 은 메모리 카탈로그의 트라이그램 색인을 쓰므로 그때 로드
+    assert manager.find_titles('Shawshenk Redemtion', limit=1)['Series_Title'].tolist() == ['The Shawshank Redemption']
+    assert key in loaded_catalogs()
+
+
+def test_relevance_ranking_uses_fts5_bm25():
+    results = sqlite_manager.search_movies(keywords=['prison', 'escape'], rank_by='relevance', top_n=10)
+    relevance = results['Relevance'].tolist()
+    assert relevance == sorted(relevance, reverse=True)
+    expected = set(pandas_manager.search_movies(keywords=['prison', 'escape'], top_n=1000).index)
+    assert set(results.index) <= expected
+
+
+def test_store_is_shared_across_threads():
+    results = []
+    query = {'genre': 'Drama', 'actor': 'hanks'}
+
+    def search():
+        results.append(MovieDataManager(backend='sqlite').search_movies(**query).index.tolist())
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(r == pandas_manager.search_movies(**query).index.tolist() for r in results)
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_backends_return_same_results()
+    with tempfile.TemporaryDirectory() as directory:
+        test_sqlite_backend_does_not_load_catalog(pathlib.Path(directory))
+    test_relevance_ranking_uses_fts5_bm25()
+    test_store_is_shared_across_threads()
+    print("🎉 SQLite 백엔드 테스트 완료!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+키워드 부분 문자열 검색 테스트: str.contains(regex=False) 스캔과 같은 결과, 특수 문자, 두 백엔드 일치
+(조회 시간은 python benchmarks.py substring)
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+
+from catalog_registry import SEARCH_FIELDS
+from movie_data_manager import MovieDataManager
+from substring_index import SubstringIndex, suffix_array
+
+manager = MovieDataManager(use_cache=False)
+sqlite_manager = MovieDataManager(backend='sqlite', use_cache=False)
+
+LITERAL_KEYWORDS = ['(500) Days', 'Nolan', 'dark kni', 'ospel', 'the ', '.', '?', '-', "'s", '"', '%', '_', 'a',
+                    'Ä', 'é', 'zzzznotaword']
+
+
+def _scan_ids(keyword):
+    """색인 없이 pandas str.contains (정규식 아님) 로 계산한 매칭 행 번호"""
+    matched = np.zeros(len(manager.df), dtype=bool)
+    pattern = keyword.casefold()
+    for field in SEARCH_FIELDS:
+        values = manager.df[field].astype(object)
+        matched |= values.map(lambda v: not pd.isna(v) and pattern in str(v).casefold()).to_numpy()
+    return np.flatnonzero(matched)
+
+
+def _random_fragments(count, seed=3):
+    """카탈로그 필드 값에서 잘라낸 임의 위치/길이의 조각"""
+    rng = random.Random(seed)
+    values = [str(v) for field in SEARCH_FIELDS for v in manager.df[field].dropna()]
+    fragments = []
+    for _ in range(count):
+        value = rng.choice(values)
+        start = rng.randrange(len(value))
+        fragments.append(value[start:start + rng.randint(1, 12)])
+    return fragments
+
+
+def test_suffix_array_is_sorted():
+    text = 'banana\x00bandana\x00'
+    codes = np.array([ord(c) for c in text])
+    suffixes = suffix_array(codes)
+    assert [text[i:] for i in suffixes] == sorted(text[i:] for i in range(len(text)))
+
+
+def test_matches_contains_scan():
+    index = manager.catalog.substring_index
+    for keyword in LITERAL_KEYWORDS + _random_fragments(200):
+        assert np.array_equal(index.match_keyword(keyword), _scan_ids(keyword)), keyword
+    assert len(index.match_keyword('')) == 0
+
+    results = manager.search_movies(keywords=['(500) Days'])
+    assert results['Series_Title'].tolist() == ['(500) Days of Summer']
+    nolan = manager.search_movies(keywords=['nolan'], top_n=50)
+    assert set(nolan.index) == set(_scan_ids('nolan'))
+    assert (nolan['Director'] == 'Christopher Nolan').any()
+
+
+def test_backends_agree():
+    for keyword in LITERAL_KEYWORDS + _random_fragments(50, seed=5):
+        query = {'keywords': [keyword, 'prison'], 'top_n': 1000}
+        expected = manager.search_movies(**query)
+        actual = sqlite_manager.search_movies(**query)
+        assert actual.index.tolist() == expected.index.tolist(), keyword
+        ranked = sqlite_manager.search_movies(rank_by='relevance', **query)
+        assert sorted(ranked.index) == sorted(expected.index), keyword
+
+
+def test_incremental_segments():
+    df = manager.df
+    half = len(df) // 2
+    first = SubstringIndex(df.iloc[:half].reset_index(drop=True), SEARCH_FIELDS)
+
+    class Diff:
+        num_rows = len(df)
+        id_map = np.arange(half)
+        added_ids = np.arange(half, len(df))
+
+    updated = first.updated(Diff, df.iloc[half:].reset_index(drop=True))
+    assert len(updated.segments) == 2
+    full = manager.catalog.substring_index
+    for keyword in LITERAL_KEYWORDS + _random_fragments(50, seed=9):
+        assert np.array_equal(updated.match_keyword(keyword), full.match_keyword(keyword)), keyword
+
+
+if __name__ == "__main__":
+    test_suffix_array_is_sorted()
+    test_matches_contains_scan()
+    test_backends_agree()
+    test_incremental_segments()
+    print("🎉 키워드 부분 문자열 검색 테스트 완료!")
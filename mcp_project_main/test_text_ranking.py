@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+BM25 줄거리 랭킹 테스트 (점수 계산 시간은 python benchmarks.py bm25)
+"""
+
+import numpy as np
+import pandas as pd
+
+from movie_data_manager import MovieDataManager
+from text_ranking import BM25Index
+
+manager = MovieDataManager()
+
+
+def test_relevance_prefers_documents_matching_more_keywords():
+    results = manager.search_movies(keywords=['prison', 'escape'], rank_by='relevance', top_n=10)
+    relevance = results['Relevance'].tolist()
+    assert relevance == sorted(relevance, reverse=True)
+    # 두 키워드를 모두 포함하는 영화가 한 키워드만 포함하는 영화보다 앞에 와야 함
+    top_text = (results.iloc[0]['Series_Title'] + ' ' + results.iloc[0]['Overview']).lower()
+    assert 'prison' in top_text and 'escape' in top_text
+    print(f"✅ 관련도 1위: {results.iloc[0]['Series_Title']}")
+
+
+def test_relevance_respects_filters():
+    results = manager.search_movies(keywords=['war'], genre='Drama', min_rating=8.0, rank_by='relevance', top_n=50)
+    assert len(results) > 0
+    assert (results['IMDB_Rating'] >= 8.0).all()
+    assert results['Genre_List'].apply(lambda g: 'Drama' in g).all()
+
+
+def test_rank_matches_scores_at_100k_documents():
+    base = manager.df[['Series_Title', 'Overview']]
+    repeats = 100
+    large = pd.DataFrame({
+        'Series_Title': np.tile(base['Series_Title'].to_numpy(), repeats),
+        'Overview': np.tile(base['Overview'].to_numpy(), repeats),
+    })
+    index = BM25Index(large)
+    keywords = ['young', 'man', 'war']
+    doc_ids, scores = index.score(keywords)
+    # 복제한 문서는 같은 점수, 상위 k 는 전체 점수의 상위 k
+    assert len(doc_ids) == repeats * np.count_nonzero(doc_ids < len(base))
+    row_ids, top = index.rank(keywords, np.arange(len(large)), 5)
+    assert np.allclose(top, np.sort(scores)[::-1][:5])
+
+
+if __name__ == "__main__":
+    test_relevance_prefers_documents_matching_more_keywords()
+    test_relevance_respects_filters()
+    test_rank_matches_scores_at_100k_documents()
+    print("🎉 BM25 랭킹 테스트 완료!")
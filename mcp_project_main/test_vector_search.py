@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+TF-IDF 벡터 공간 검색 테스트 (검색 시간은 python benchmarks.py tfidf)
+"""
+
+import numpy as np
+import pandas as pd
+
+from movie_data_manager import MovieDataManager
+from vector_search import TfidfIndex
+
+manager = MovieDataManager()
+
+
+def test_vague_description_finds_movie():
+    cases = {
+        'two men in prison become friends over many years': 'The Shawshank Redemption',
+        'mafia family patriarch hands over his empire to his son': 'The Godfather',
+    }
+    for description, expected in cases.items():
+        results = manager.search_by_description(description, top_n=5)
+        assert expected in results['Series_Title'].tolist(), (description, results['Series_Title'].tolist())
+        similarity = results['Similarity'].tolist()
+        assert similarity == sorted(similarity, reverse=True)
+        print(f"✅ '{description}' -> {results.iloc[0]['Series_Title']} (유사도 {results.iloc[0]['Similarity']})")
+    assert manager.search_by_description('xyzzy qwerty').empty
+
+
+def test_scores_match_dense_cosine():
+    index = manager.tfidf
+    dense = np.zeros((index.num_docs, index.vocabulary_size), dtype=np.float64)
+    term_ids = np.repeat(np.arange(index.vocabulary_size), np.diff(index.offsets))
+    dense[index.doc_ids, term_ids] = index.values
+    query_terms, weights = index.query_vector('space war young pilot')
+    query = np.zeros(index.vocabulary_size)
+    query[query_terms] = weights
+    assert np.allclose(index.scores('space war young pilot'), dense @ query, atol=1e-5)
+
+
+def test_vector_search_at_scale():
+    base = manager.df
+    repeats = 50
+    large = pd.DataFrame({field: np.tile(base[field].to_numpy(), repeats)
+                          for field in ['Overview', 'Genre', 'Director', 'Star1', 'Star2', 'Star3', 'Star4']})
+    index = TfidfIndex(large)
+    text = 'two men in prison become friends over many years'
+    row_ids, similarities = index.search(text, k=5)
+    assert len(row_ids) == 5
+    assert np.allclose(similarities, np.sort(index.scores(text))[::-1][:5])
+    # 복제한 문서는 같은 영화 (원본 행 번호가 같음)
+    assert len(set((row_ids % len(base)).tolist())) == 1
+
+
+if __name__ == "__main__":
+    test_vague_description_finds_movie()
+    test_scores_match_dense_cosine()
+    test_vector_search_at_scale()
+    print("🎉 벡터 공간 검색 테스트 완료!")
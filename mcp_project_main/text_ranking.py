@@ -0,0 +1,140 @@
+"""
+줄거리 검색용 BM25 랭킹 모듈
+제목/줄거리의 단어 빈도와 문서 길이를 로드 시 numpy 배열로 미리 계산해 두고,
+쿼리 시에는 쿼리 토큰의 포스팅만 모아 벡터 연산으로 점수를 계산
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from search_index import EMPTY_IDS, TOKEN_PATTERN, csr_codes, extend_vocabulary, remap_csr, sort_csr, tokenize
+
+
+class BM25Index:
+    """
+    Okapi BM25 (제목 토큰은 title_weight 배로 계산)
+    포스팅마다 BM25 가중치를 미리 계산해 두므로 쿼리는 gather + 합산만 수행
+    """
+
+    def __init__(self, df: pd.DataFrame, text_fields=('Overview',), title_field='Series_Title',
+                 title_weight: int = 2, k1: float = 1.2, b: float = 0.75):
+        self.num_docs = len(df)
+        self.k1 = k1
+        self.b = b
+        self.text_fields = tuple(text_fields)
+        self.title_field = title_field
+        self.title_weight = title_weight
+
+        # (토큰, 행 번호) 쌍을 벡터 연산으로 펼침 - 제목은 가중치만큼 반복
+        parts = []
+        for field, weight in [(f, 1) for f in text_fields] + [(title_field, title_weight)]:
+            text = pd.Series(df[field].to_numpy(), dtype=object).fillna('').astype(str).str.casefold()
+            exploded = text.str.findall(TOKEN_PATTERN).explode().dropna()
+            for _ in range(weight):
+                parts.append(exploded)
+        tokens = pd.concat(parts)
+        codes, vocab = pd.factorize(tokens.to_numpy(dtype=object))
+        rows = tokens.index.to_numpy(dtype=np.int64)
+
+        # 단어 빈도 (term, doc) -> tf, 문서 길이
+        stride = max(self.num_docs, 1)
+        pairs, tf = np.unique(codes.astype(np.int64) * stride + rows, return_counts=True)
+        term_ids = pairs // stride
+        self.doc_ids = (pairs % stride).astype(np.int32)
+        self.term_freqs = tf.astype(np.float32)
+        self.doc_lengths = np.bincount(rows, minlength=self.num_docs).astype(np.float32)
+
+        self.offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=self.offsets[1:])
+        self.term_ids = {term: i for i, term in enumerate(vocab)}
+        self._compute_weights()
+
+    def _compute_weights(self):
+        """단어 빈도/문서 길이에서 IDF 와 포스팅별 BM25 가중치 계산 (전체 통계에 의존하므로 재로드 시 다시 계산)"""
+        k1, b = self.k1, self.b
+        self.avg_doc_length = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+        doc_freqs = np.diff(self.offsets).astype(np.float32)
+        self.idf = np.log1p((self.num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+
+        # 포스팅별 BM25 가중치 미리 계산
+        norm = k1 * (1 - b + b * self.doc_lengths / max(self.avg_doc_length, 1e-9))
+        self.weights = (np.repeat(self.idf, np.diff(self.offsets)) * self.term_freqs * (k1 + 1)
+                        / (self.term_freqs + norm[self.doc_ids])).astype(np.float32)
+
+    def updated(self, diff, added_df: pd.DataFrame) -> 'BM25Index':
+        """
+        재로드된 카탈로그용 새 색인 (self 는 수정하지 않음)
+        바뀐/추가된 행만 토큰화하고, 기존 포스팅은 행 번호만 옮긴 뒤 IDF/가중치를 벡터 연산으로 다시 계산
+        """
+        added = BM25Index(added_df, self.text_fields, self.title_field, self.title_weight, self.k1, self.b)
+        codes, doc_ids, keep = remap_csr(self.offsets, self.doc_ids, diff.id_map)
+        term_ids = dict(self.term_ids)
+        codes = np.concatenate([codes, extend_vocabulary(term_ids, added.term_ids)[csr_codes(added.offsets)]])
+        doc_ids = np.concatenate([doc_ids, diff.added_ids[added.doc_ids]])
+        term_freqs = np.concatenate([self.term_freqs[keep], added.term_freqs])
+        order, offsets = sort_csr(codes, doc_ids, len(term_ids))
+
+        index = BM25Index.__new__(BM25Index)
+        index.__dict__.update(self.__dict__)
+        index.num_docs = diff.num_rows
+        index.term_ids = term_ids
+        index.offsets = offsets
+        index.doc_ids = doc_ids[order].astype(np.int32)
+        index.term_freqs = term_freqs[order]
+        index.doc_lengths = np.zeros(diff.num_rows, dtype=np.float32)
+        moved = diff.id_map >= 0
+        index.doc_lengths[diff.id_map[moved]] = self.doc_lengths[moved]
+        index.doc_lengths[diff.added_ids] = added.doc_lengths
+        index._compute_weights()
+        return index
+
+    def query_terms(self, keywords: Iterable[str]) -> List[str]:
+        """키워드 목록을 중복 없는 색인 토큰 목록으로 변환"""
+        terms = []
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                if term in self.term_ids and term not in terms:
+                    terms.append(term)
+        return terms
+
+    def score(self, keywords: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """점수가 0보다 큰 (행 번호 배열(정렬됨), BM25 점수 배열)"""
+        slices = [slice(self.offsets[t], self.offsets[t + 1])
+                  for t in (self.term_ids[term] for term in self.query_terms(keywords))]
+        if not slices:
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        docs = np.concatenate([self.doc_ids[s] for s in slices])
+        weights = np.concatenate([self.weights[s] for s in slices])
+        ids, inverse = np.unique(docs, return_inverse=True)
+        return ids.astype(np.int32), np.bincount(inverse, weights=weights).astype(np.float32)
+
+    def rank(self, keywords: Iterable[str], candidate_ids: np.ndarray, k: int,
+             tie_rank: Optional[np.ndarray] = None, after: Optional[Tuple[float, int]] = None
+             ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        후보 행 번호를 BM25 점수 내림차순으로 정렬해 상위 k개 반환 (행 번호, 점수)
+        동점이면 tie_rank (예: 평점 순위) 가 작은 행이 먼저
+        after=(점수, 동점 순위): 이 위치 다음 행부터 (다음 페이지)
+        """
+        candidate_ids = np.asarray(candidate_ids)
+        scored_ids, scored = self.score(keywords)
+        scores = np.zeros(len(candidate_ids), dtype=np.float32)
+        if len(scored_ids) and len(candidate_ids):
+            pos = np.searchsorted(scored_ids, candidate_ids)
+            pos[pos == len(scored_ids)] = 0
+            hit = scored_ids[pos] == candidate_ids
+            scores[hit] = scored[pos[hit]]
+        ties = tie_rank[candidate_ids] if tie_rank is not None else candidate_ids
+        if after is not None:
+            score, tie = np.float32(after[0]), after[1]
+            keep = (scores < score) | ((scores == score) & (ties > tie))
+            candidate_ids, scores, ties = candidate_ids[keep], scores[keep], ties[keep]
+        if len(candidate_ids) > k:
+            # 점수 상위 k 경계값 이상만 남긴 뒤 정렬 (부분 선택)
+            threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores >= threshold
+            candidate_ids, scores, ties = candidate_ids[keep], scores[keep], ties[keep]
+        order = np.lexsort((ties, -scores))[:k]
+        return candidate_ids[order], scores[order]
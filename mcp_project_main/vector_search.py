@@ -0,0 +1,158 @@
+"""
+로컬 벡터 공간 검색 (TF-IDF 희소 행렬)
+줄거리/장르/출연진으로 만든 TF-IDF 행렬을 로드 시 구축하고,
+쿼리 벡터와의 코사인 유사도를 희소 행렬-벡터 곱 한 번으로 계산 (네트워크 호출 없음)
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from search_index import EMPTY_IDS, TOKEN_PATTERN, csr_codes, extend_vocabulary, remap_csr, sort_csr, tokenize
+
+# 필드별 가중치 (단어 빈도에 곱해짐)
+DEFAULT_FIELD_WEIGHTS = {
+    'Overview': 1.0,
+    'Genre': 1.0,
+    'Director': 1.0,
+    'Star1': 1.0,
+    'Star2': 1.0,
+    'Star3': 1.0,
+    'Star4': 1.0,
+}
+
+
+class TfidfIndex:
+    """
+    문서 x 단어 TF-IDF 행렬을 단어 기준 CSR (= 문서 행렬의 CSC) 로 저장
+    각 문서 벡터는 L2 정규화되어 있어 내적이 곧 코사인 유사도
+    """
+
+    def __init__(self, df: pd.DataFrame, field_weights: Dict[str, float] = None):
+        field_weights = field_weights or DEFAULT_FIELD_WEIGHTS
+        self.field_weights = dict(field_weights)
+        self.num_docs = len(df)
+
+        codes_parts, rows_parts, weight_parts = [], [], []
+        for field, weight in field_weights.items():
+            text = pd.Series(df[field].to_numpy(), dtype=object).fillna('').astype(str).str.casefold()
+            exploded = text.str.findall(TOKEN_PATTERN).explode().dropna()
+            codes_parts.append(exploded.to_numpy(dtype=object))
+            rows_parts.append(exploded.index.to_numpy(dtype=np.int64))
+            weight_parts.append(np.full(len(exploded), weight, dtype=np.float32))
+        codes, vocab = pd.factorize(np.concatenate(codes_parts))
+        rows = np.concatenate(rows_parts)
+
+        # (단어, 문서) 별 가중 빈도 -> 로그 TF
+        stride = max(self.num_docs, 1)
+        pairs, inverse = np.unique(codes.astype(np.int64) * stride + rows, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate(weight_parts))
+        term_ids = pairs // stride
+        self.doc_ids = (pairs % stride).astype(np.int32)
+        self.offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=self.offsets[1:])
+        self.term_ids = {term: i for i, term in enumerate(vocab)}
+        self._compute_values()
+
+    def _compute_values(self):
+        """가중 빈도에서 IDF 와 L2 정규화된 TF-IDF 값 계산 (전체 통계에 의존하므로 재로드 시 다시 계산)"""
+        doc_freqs = np.diff(self.offsets)
+        self.idf = (np.log((1 + self.num_docs) / (1 + doc_freqs)) + 1).astype(np.float32)
+        values = (1 + np.log(self.counts)) * np.repeat(self.idf, doc_freqs)
+
+        # 문서 벡터 L2 정규화
+        norms = np.sqrt(np.bincount(self.doc_ids, weights=values ** 2, minlength=self.num_docs))
+        self.values = (values / np.maximum(norms[self.doc_ids], 1e-12)).astype(np.float32)
+
+    def updated(self, diff, added_df: pd.DataFrame) -> 'TfidfIndex':
+        """재로드된 카탈로그용 새 색인 (바뀐/추가된 행만 토큰화, IDF/정규화는 벡터 연산으로 다시 계산)"""
+        added = TfidfIndex(added_df, self.field_weights)
+        codes, doc_ids, keep = remap_csr(self.offsets, self.doc_ids, diff.id_map)
+        term_ids = dict(self.term_ids)
+        codes = np.concatenate([codes, extend_vocabulary(term_ids, added.term_ids)[csr_codes(added.offsets)]])
+        doc_ids = np.concatenate([doc_ids, diff.added_ids[added.doc_ids]])
+        counts = np.concatenate([self.counts[keep], added.counts])
+        order, offsets = sort_csr(codes, doc_ids, len(term_ids))
+
+        index = TfidfIndex.__new__(TfidfIndex)
+        index.field_weights = self.field_weights
+        index.num_docs = diff.num_rows
+        index.term_ids = term_ids
+        index.offsets = offsets
+        index.doc_ids = doc_ids[order].astype(np.int32)
+        index.counts = counts[order]
+        index._compute_values()
+        return index
+
+    @property
+    def vocabulary_size(self) -> int:
+        # 재로드로 모든 문서에서 사라진 단어는 제외
+        return int(np.count_nonzero(np.diff(self.offsets)))
+
+    def query_vector(self, text) -> Tuple[np.ndarray, np.ndarray]:
+        """쿼리 텍스트의 (단어 번호, L2 정규화된 TF-IDF 가중치)"""
+        _, term_ids, weights = self.query_terms(text)
+        return term_ids, weights
+
+    def query_terms(self, text) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """쿼리 텍스트의 (단어, 단어 번호, L2 정규화된 TF-IDF 가중치) - 색인에 있는 단어만"""
+        terms, counts = np.unique([t for t in tokenize(text) if t in self.term_ids], return_counts=True)
+        if not len(terms):
+            return terms, EMPTY_IDS, np.empty(0, dtype=np.float32)
+        term_ids = np.array([self.term_ids[t] for t in terms], dtype=np.int64)
+        live = self.offsets[term_ids + 1] > self.offsets[term_ids]
+        if not live.all():
+            terms, term_ids, counts = terms[live], term_ids[live], counts[live]
+            if not len(term_ids):
+                return terms, EMPTY_IDS, np.empty(0, dtype=np.float32)
+        weights = (1 + np.log(counts)) * self.idf[term_ids]
+        return terms, term_ids, (weights / np.linalg.norm(weights)).astype(np.float32)
+
+    def terms(self) -> np.ndarray:
+        """단어 번호 순서의 단어 배열"""
+        terms = np.empty(len(self.term_ids), dtype=object)
+        terms[list(self.term_ids.values())] = list(self.term_ids.keys())
+        return terms
+
+    def scores(self, text) -> np.ndarray:
+        """전체 문서에 대한 코사인 유사도 (희소 행렬 x 쿼리 벡터)"""
+        term_ids, weights = self.query_vector(text)
+        if not len(term_ids):
+            return np.zeros(self.num_docs, dtype=np.float32)
+        lengths = self.offsets[term_ids + 1] - self.offsets[term_ids]
+        positions = np.concatenate([np.arange(self.offsets[t], self.offsets[t + 1]) for t in term_ids])
+        products = self.values[positions] * np.repeat(weights, lengths)
+        return np.bincount(self.doc_ids[positions], weights=products, minlength=self.num_docs).astype(np.float32)
+
+    def scores_of(self, text, row_ids: np.ndarray) -> np.ndarray:
+        """
+        row_ids 문서만의 코사인 유사도 (scores(text)[row_ids] 와 같은 값)
+        쿼리 단어마다 포스팅에서 row_ids 를 이진 탐색하므로 전체 문서를 훑지 않음
+        """
+        row_ids = np.asarray(row_ids)
+        term_ids, weights = self.query_vector(text)
+        order = np.argsort(row_ids, kind='stable')
+        sorted_ids = row_ids[order]
+        # scores 와 같은 순서 (단어 순) 로 float64 에 더해 부동소수 결과까지 같게
+        totals = np.zeros(len(row_ids))
+        for term_id, weight in zip(term_ids.tolist(), weights):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            positions = np.searchsorted(self.doc_ids[start:end], sorted_ids)
+            found = positions < end - start
+            found[found] = self.doc_ids[start + positions[found]] == sorted_ids[found]
+            totals[found] += self.values[start + positions[found]] * weight
+        scores = np.empty(len(row_ids), dtype=np.float32)
+        scores[order] = totals
+        return scores
+
+    def search(self, text, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """코사인 유사도 상위 k개 (행 번호, 유사도), 유사도 0 인 문서는 제외"""
+        scores = self.scores(text)
+        k = min(k, len(scores))
+        if k <= 0:
+            return EMPTY_IDS, np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        top = top[scores[top] > 0]
+        return top.astype(np.int32), scores[top]